@@ -0,0 +1,34 @@
+"""add keyset pagination indexes
+
+Revision ID: 30642e355926
+Revises: 30642e355925
+Create Date: 2026-10-18 09:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic
+revision = '30642e355926'
+down_revision = '30642e355925'
+branch_labels = None
+depends_on = None
+
+# (index name, table, columns) matching the (created_at, id) keyset order
+# of every list endpoint, prefixed by the listing's filter column.
+INDEXES = [
+    ('ix_posts_created_at_id', 'posts', ['created_at', 'id']),
+    ('ix_posts_community_id_created_at_id', 'posts', ['community_id', 'created_at', 'id']),
+    ('ix_posts_author_id_created_at_id', 'posts', ['author_id', 'created_at', 'id']),
+    ('ix_comments_post_id_created_at_id', 'comments', ['post_id', 'created_at', 'id']),
+    ('ix_users_created_at_id', 'users', ['created_at', 'id']),
+    ('ix_communities_created_at_id', 'communities', ['created_at', 'id']),
+]
+
+def upgrade():
+    for name, table, columns in INDEXES:
+        op.create_index(name, table, columns, unique=False)
+
+def downgrade():
+    for name, table, columns in reversed(INDEXES):
+        op.drop_index(name, table_name=table)
@@ -0,0 +1,37 @@
+"""add counter columns
+
+Revision ID: 30642e355927
+Revises: 30642e355926
+Create Date: 2026-10-18 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic
+revision = '30642e355927'
+down_revision = '30642e355926'
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    op.add_column('posts', sa.Column('likes_count', sa.Integer(), nullable=False, server_default='0'))
+    op.add_column('posts', sa.Column('comments_count', sa.Integer(), nullable=False, server_default='0'))
+    op.add_column('communities', sa.Column('members_count', sa.Integer(), nullable=False, server_default='0'))
+
+    # Backfill from the existing rows
+    op.execute(
+        "UPDATE posts SET "
+        "likes_count = (SELECT count(*) FROM likes WHERE likes.post_id = posts.id), "
+        "comments_count = (SELECT count(*) FROM comments WHERE comments.post_id = posts.id)"
+    )
+    op.execute(
+        "UPDATE communities SET members_count = ("
+        "SELECT count(*) FROM community_members "
+        "WHERE community_members.community_id = communities.id)"
+    )
+
+def downgrade():
+    op.drop_column('communities', 'members_count')
+    op.drop_column('posts', 'comments_count')
+    op.drop_column('posts', 'likes_count')
@@ -0,0 +1,50 @@
+"""add timeline entries
+
+Revision ID: 30642e355928
+Revises: 30642e355927
+Create Date: 2026-10-18 11:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic
+revision = '30642e355928'
+down_revision = '30642e355927'
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    op.create_table(
+        'timeline_entries',
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('post_id', sa.Integer(), nullable=False),
+        sa.Column('community_id', sa.Integer(), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), nullable=False),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['post_id'], ['posts.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['community_id'], ['communities.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('user_id', 'post_id')
+    )
+    op.create_index(
+        'ix_timeline_entries_user_id_created_at_post_id',
+        'timeline_entries', ['user_id', 'created_at', 'post_id'], unique=False
+    )
+    op.create_index(
+        'ix_timeline_entries_community_id', 'timeline_entries', ['community_id'], unique=False
+    )
+
+    # Materialize existing community posts for current members. New posts
+    # are fanned out by CRUDPost.create_with_owner.
+    op.execute(
+        "INSERT INTO timeline_entries (user_id, post_id, community_id, created_at) "
+        "SELECT community_members.user_id, posts.id, posts.community_id, posts.created_at "
+        "FROM posts JOIN community_members "
+        "ON community_members.community_id = posts.community_id "
+        "WHERE posts.created_at IS NOT NULL"
+    )
+
+def downgrade():
+    op.drop_index('ix_timeline_entries_community_id', table_name='timeline_entries')
+    op.drop_index('ix_timeline_entries_user_id_created_at_post_id', table_name='timeline_entries')
+    op.drop_table('timeline_entries')
@@ -0,0 +1,46 @@
+"""add full-text search vectors
+
+Revision ID: 30642e355929
+Revises: 30642e355928
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic
+revision = '30642e355929'
+down_revision = '30642e355928'
+branch_labels = None
+depends_on = None
+
+# (table, weight A column, weight B column); must match app.crud.search.DOCUMENTS
+SEARCH_DOCUMENTS = [
+    ('communities', 'name', 'description'),
+    ('posts', 'title', 'content'),
+]
+
+def upgrade():
+    # Generated columns and GIN indexes are Postgres-only; other databases
+    # use the term-matching fallback in app.crud.search.
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    for table, primary, secondary in SEARCH_DOCUMENTS:
+        op.execute(
+            f"ALTER TABLE {table} ADD COLUMN search_vector tsvector "
+            f"GENERATED ALWAYS AS ("
+            f"setweight(to_tsvector('english', coalesce({primary}, '')), 'A') || "
+            f"setweight(to_tsvector('english', coalesce({secondary}, '')), 'B')"
+            f") STORED"
+        )
+        op.create_index(
+            f'ix_{table}_search_vector', table, ['search_vector'],
+            unique=False, postgresql_using='gin'
+        )
+
+def downgrade():
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    for table, primary, secondary in reversed(SEARCH_DOCUMENTS):
+        op.drop_index(f'ix_{table}_search_vector', table_name=table)
+        op.drop_column(table, 'search_vector')
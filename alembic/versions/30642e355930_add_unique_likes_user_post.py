@@ -0,0 +1,32 @@
+"""add unique likes (user_id, post_id)
+
+Revision ID: 30642e355930
+Revises: 30642e355929
+Create Date: 2026-10-18 13:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic
+revision = '30642e355930'
+down_revision = '30642e355929'
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    # Drop duplicate likes left by concurrent double taps, keeping the first
+    op.execute(
+        "DELETE FROM likes WHERE id NOT IN ("
+        "SELECT min(id) FROM likes GROUP BY user_id, post_id)"
+    )
+    op.execute(
+        "UPDATE posts SET likes_count = "
+        "(SELECT count(*) FROM likes WHERE likes.post_id = posts.id)"
+    )
+    op.create_index(
+        'uq_likes_user_id_post_id', 'likes', ['user_id', 'post_id'], unique=True
+    )
+
+def downgrade():
+    op.drop_index('uq_likes_user_id_post_id', table_name='likes')
@@ -0,0 +1,37 @@
+"""add foreign key indexes
+
+Revision ID: 30642e355931
+Revises: 30642e355930
+Create Date: 2026-10-18 14:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic
+revision = '30642e355931'
+down_revision = '30642e355930'
+branch_labels = None
+depends_on = None
+
+# (index name, table, columns) for the foreign keys the CRUD layer filters
+# on that no existing index leads with. posts.author_id, posts.community_id
+# and comments.post_id are covered by the keyset indexes of 30642e355926,
+# likes.user_id by uq_likes_user_id_post_id. B-tree indexes are scanned
+# backwards for the (created_at DESC, id DESC) listings, so the columns
+# keep ascending order.
+INDEXES = [
+    ('ix_comments_author_id_created_at_id', 'comments', ['author_id', 'created_at', 'id']),
+    ('ix_likes_post_id', 'likes', ['post_id']),
+    ('ix_community_members_user_id_community_id', 'community_members', ['user_id', 'community_id']),
+    ('ix_communities_created_by_id', 'communities', ['created_by_id']),
+    ('ix_timeline_entries_post_id', 'timeline_entries', ['post_id']),
+]
+
+def upgrade():
+    for name, table, columns in INDEXES:
+        op.create_index(name, table, columns, unique=False)
+
+def downgrade():
+    for name, table, columns in reversed(INDEXES):
+        op.drop_index(name, table_name=table)
@@ -0,0 +1,38 @@
+"""add community_members.created_at
+
+Revision ID: 30642e355932
+Revises: 30642e355931
+Create Date: 2026-10-18 15:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic
+revision = '30642e355932'
+down_revision = '30642e355931'
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    # Existing memberships get the migration time (UTC, like the model's
+    # datetime.utcnow) as their join date. The server default only fills
+    # them; new rows are stamped by the model default, as in create_all.
+    op.add_column(
+        'community_members',
+        sa.Column(
+            'created_at', sa.DateTime(), nullable=False,
+            server_default=sa.text("timezone('utc', now())")
+        )
+    )
+    op.alter_column('community_members', 'created_at', server_default=None)
+    op.create_index(
+        'ix_community_members_community_id_created_at_user_id',
+        'community_members',
+        ['community_id', 'created_at', 'user_id'],
+        unique=False
+    )
+
+def downgrade():
+    op.drop_index('ix_community_members_community_id_created_at_user_id', table_name='community_members')
+    op.drop_column('community_members', 'created_at')
@@ -1,38 +1,66 @@
-from typing import Generator, Optional
-from fastapi import Depends, HTTPException, status
+from typing import Optional
+from fastapi import Depends, HTTPException, Response, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import jwt, JWTError
 from pydantic import ValidationError
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from app import crud, schemas
 from app.core import security
 from app.core.config import settings
-from app.db.session import SessionLocal
+from app.crud.base import Cursor, decode_cursor
+from app.crud.search import SearchCursor, decode_search_cursor
+from app.db.session import get_async_db, get_db
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl=f"{settings.API_V1_STR}/auth/login")
+# Same scheme without the automatic 401, for endpoints open to anonymous users
+oauth2_scheme_optional = OAuth2PasswordBearer(
+    tokenUrl=f"{settings.API_V1_STR}/auth/login", auto_error=False
+)
 
-def get_db() -> Generator:
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+def get_cursor(cursor: Optional[str] = None) -> Optional[Cursor]:
+    if cursor is None:
+        return None
     try:
-        db = SessionLocal()
-        yield db
-    finally:
-        db.close()
+        return decode_cursor(cursor)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
 
-def get_current_user(
-    db: Session = Depends(get_db),
-    token: str = Depends(oauth2_scheme)
-) -> schemas.User:
+def get_search_cursor(cursor: Optional[str] = None) -> Optional[SearchCursor]:
+    if cursor is None:
+        return None
+    try:
+        return decode_search_cursor(cursor)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+def set_next_cursor(response: Response, next_cursor: Optional[str]) -> None:
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+
+def _token_subject(token: str) -> Optional[int]:
+    """The user id a valid access token was issued to, or None."""
     try:
         payload = jwt.decode(
             token, settings.JWT_SECRET_KEY, algorithms=[settings.JWT_ALGORITHM]
         )
-        token_data = schemas.TokenPayload(**payload)
+        return schemas.TokenPayload(**payload).sub
     except (JWTError, ValidationError):
+        return None
+
+def get_current_user(
+    db: Session = Depends(get_db),
+    token: str = Depends(oauth2_scheme)
+) -> schemas.User:
+    user_id = _token_subject(token)
+    if user_id is None:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Could not validate credentials",
         )
-    user = crud.user.get(db, id=token_data.sub)
+    user = crud.user.get_cached(db, id=user_id)
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
     return user
@@ -46,18 +74,36 @@ def get_current_active_user(
 
 def get_current_user_optional(
     db: Session = Depends(get_db),
-    token: Optional[str] = Depends(oauth2_scheme)
+    token: Optional[str] = Depends(oauth2_scheme_optional)
 ) -> Optional[schemas.User]:
-    if not token:
+    user_id = _token_subject(token) if token else None
+    if user_id is None:
         return None
-    try:
-        payload = jwt.decode(
-            token, settings.JWT_SECRET_KEY, algorithms=[settings.JWT_ALGORITHM]
+    return crud.user.get_cached(db, id=user_id)
+
+# Counterparts for `async def` endpoints on get_async_db; an endpoint uses
+# one family or the other, so a request holds a single session
+
+async def get_current_user_async(
+    db: AsyncSession = Depends(get_async_db),
+    token: str = Depends(oauth2_scheme)
+) -> schemas.User:
+    user_id = _token_subject(token)
+    if user_id is None:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Could not validate credentials",
         )
-        token_data = schemas.TokenPayload(**payload)
-    except (JWTError, ValidationError):
-        return None
-    user = crud.user.get(db, id=token_data.sub)
+    user = await crud.user_async.get_cached(db, id=user_id)
     if not user:
+        raise HTTPException(status_code=404, detail="User not found")
+    return user
+
+async def get_current_user_optional_async(
+    db: AsyncSession = Depends(get_async_db),
+    token: Optional[str] = Depends(oauth2_scheme_optional)
+) -> Optional[schemas.User]:
+    user_id = _token_subject(token) if token else None
+    if user_id is None:
         return None
-    return user 
\ No newline at end of file
+    return await crud.user_async.get_cached(db, id=user_id)
@@ -3,22 +3,23 @@ from typing import Any
 import logging
 from fastapi import APIRouter, Depends, HTTPException, status, Response
 from fastapi.security import OAuth2PasswordRequestForm
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+from app import crud
+from app.api.deps import get_async_db
+from app.api.routing import UnitOfWorkRoute
 from app.core import security
 from app.core.config import settings
-from app.db.session import get_db
-from app.models.user import User
 from app.schemas.token import Token
 from app.schemas.user import UserCreate, UserResponse
 
-router = APIRouter()
+router = APIRouter(route_class=UnitOfWorkRoute)
 logger = logging.getLogger(__name__)
 
 @router.post("/register", response_model=UserResponse)
 async def register(
     *,
     response: Response,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     user_in: UserCreate,
 ) -> Any:
     """
@@ -36,7 +37,7 @@ async def register(
         })
         
         # Check if user with this email exists
-        user = db.query(User).filter(User.email == user_in.email).first()
+        user = await crud.user_async.get_by_email(db, email=user_in.email)
         if user:
             logger.warning(f"User already exists: {user_in.email}")
             raise HTTPException(
@@ -47,15 +48,7 @@ async def register(
         logger.debug(f"Creating new user with email: {user_in.email}")
         
         # Create new user
-        user = User(
-            email=user_in.email,
-            hashed_password=security.get_password_hash(user_in.password),
-            name=user_in.name,
-            is_active=True,
-        )
-        db.add(user)
-        db.commit()
-        db.refresh(user)
+        user = await crud.user_async.create(db, obj_in=user_in)
         
         logger.debug(f"User created with ID: {user.id}")
         
@@ -79,9 +72,16 @@ async def register(
         }
     except HTTPException:
         raise
+    except security.PasswordHasherBusy:
+        logger.warning("Password hashing pool saturated")
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Server busy, please retry",
+            headers={"Retry-After": "1"},
+        )
     except Exception as e:
         logger.error(f"Registration error: {str(e)}")
-        db.rollback()
+        await db.rollback()
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=str(e)
@@ -90,7 +90,7 @@ async def register(
 @router.post("/login", response_model=UserResponse)
 async def login(
     response: Response,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     form_data: OAuth2PasswordRequestForm = Depends()
 ) -> Any:
     """
@@ -100,7 +100,7 @@ async def login(
         logger.info(f"Login attempt for username: {form_data.username}")
 
         # Check if user exists
-        user = db.query(User).filter(User.email == form_data.username).first()
+        user = await crud.user_async.get_by_email(db, email=form_data.username)
         if not user:
             logger.warning(f"User not found: {form_data.username}")
             raise HTTPException(
@@ -109,7 +109,10 @@ async def login(
             )
         
         # Verify password
-        if not security.verify_password(form_data.password, user.hashed_password):
+        verified, new_hash = await security.verify_password_async(
+            form_data.password, user.hashed_password
+        )
+        if not verified:
             logger.warning(f"Invalid password for user: {form_data.username}")
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
@@ -122,6 +125,13 @@ async def login(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Inactive user"
             )
+
+        # Stored hash uses an outdated bcrypt cost
+        if new_hash:
+            logger.info(f"Rehashing password for user: {form_data.username}")
+            user = await crud.user_async.update(
+                db, db_obj=user, obj_in={"hashed_password": new_hash}
+            )
         
         # Generate token
         access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
@@ -146,6 +156,13 @@ async def login(
         return user_response
     except HTTPException:
         raise
+    except security.PasswordHasherBusy:
+        logger.warning("Password hashing pool saturated")
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Server busy, please retry",
+            headers={"Retry-After": "1"},
+        )
     except Exception as e:
         logger.error(f"Login error: {str(e)}")
         raise HTTPException(
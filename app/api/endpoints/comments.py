@@ -1,23 +1,30 @@
-from typing import Any, List
-from fastapi import APIRouter, Depends, HTTPException, status
+from typing import Any, List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Response, status
 from sqlalchemy.orm import Session
 from app import crud, schemas
 from app.api import deps
+from app.api.routing import UnitOfWorkRoute
+from app.crud.base import Cursor
 
-router = APIRouter()
+router = APIRouter(route_class=UnitOfWorkRoute)
 
-@router.get("/post/{post_id}", response_model=List[schemas.Comment])
+@router.get("/post/{post_id}", response_model=List[schemas.CommentWithAuthor])
 def read_comments(
     *,
     db: Session = Depends(deps.get_db),
     post_id: int,
-    skip: int = 0,
+    cursor: Optional[Cursor] = Depends(deps.get_cursor),
     limit: int = 100,
+    response: Response,
 ) -> Any:
     """
-    Retrieve comments for a post.
+    Retrieve comments for a post with their authors, in the shape of the
+    first page embedded in GET /posts/{post_id}.
     """
-    comments = crud.comment.get_by_post(db, post_id=post_id, skip=skip, limit=limit)
+    comments, next_cursor = crud.comment.get_page_with_authors(
+        db, post_id=post_id, cursor=cursor, limit=limit
+    )
+    deps.set_next_cursor(response, next_cursor)
     return comments
 
 @router.post("/post/{post_id}", response_model=schemas.Comment)
@@ -1,34 +1,48 @@
 from typing import Any, List, Optional
 from fastapi import APIRouter, Body, Depends, HTTPException, Query, Response
-from sqlalchemy.orm import Session
-from app import crud, models, schemas
+from sqlalchemy.ext.asyncio import AsyncSession
+from app import crud, schemas
 from app.api import deps
+from app.api.routing import UnitOfWorkRoute
 from app.core.config import settings
+from app.crud.base import Cursor
+from app.crud.crud_community import SlugUnavailable
 
-router = APIRouter()
+router = APIRouter(route_class=UnitOfWorkRoute)
 
 @router.post("/", response_model=schemas.Community)
-def create_community(
+async def create_community(
     *,
-    db: Session = Depends(deps.get_db),
+    db: AsyncSession = Depends(deps.get_async_db),
     community_in: schemas.CommunityCreate,
-    current_user: models.User = Depends(deps.get_current_user),
+    current_user: schemas.User = Depends(deps.get_current_user_async),
 ) -> Any:
     """
     Create new community.
     """
-    community = crud.community.create_with_owner(
-        db=db, obj_in=community_in, owner_id=current_user.id
+    try:
+        community = await crud.community_async.create_with_owner(
+            db=db, obj_in=community_in, owner_id=current_user.id
+        )
+    except SlugUnavailable:
+        raise HTTPException(
+            status_code=409,
+            detail="A community with this name is being created, please retry",
+            headers={"Retry-After": "1"},
+        )
+    community = await crud.community_async.get(db, community.id, load="community")
+    await crud.community_async.annotate_memberships(
+        db=db, communities=[community], user_id=current_user.id
     )
     return community
 
 @router.get("/", response_model=List[schemas.Community])
-def list_communities(
+async def list_communities(
     *,
-    db: Session = Depends(deps.get_db),
-    skip: int = 0,
+    db: AsyncSession = Depends(deps.get_async_db),
+    cursor: Optional[str] = None,
     limit: int = 100,
-    current_user: models.User = Depends(deps.get_current_user),
+    current_user: schemas.User = Depends(deps.get_current_user_async),
     search: Optional[str] = Query(None, min_length=3, max_length=50),
     response: Response,
 ) -> Any:
@@ -43,24 +57,26 @@ def list_communities(
         "Access-Control-Allow-Headers": "Content-Type, Authorization, Accept"
     })
 
+    # Search results are ordered by relevance, so their cursors differ
     if search:
-        communities = crud.community.search_communities(
-            db=db, query=search, skip=skip, limit=limit
+        communities, next_cursor = await crud.community_async.search_communities(
+            db=db, query=search, cursor=deps.get_search_cursor(cursor), limit=limit
         )
     else:
-        communities = crud.community.get_multi(db, skip=skip, limit=limit)
+        communities, next_cursor = await crud.community_async.get_page(
+            db, cursor=deps.get_cursor(cursor), limit=limit
+        )
+    deps.set_next_cursor(response, next_cursor)
     
+    memberships = await crud.community_async.get_memberships(
+        db=db,
+        community_ids=[community.id for community in communities],
+        user_id=current_user.id,
+    )
+
     # Format response
     formatted_communities = []
     for community in communities:
-        is_member = crud.community.is_member(
-            db=db, community_id=community.id, user_id=current_user.id
-        )
-        is_admin = community.created_by_id == current_user.id
-        members_count = crud.community.get_member_count(
-            db=db, community_id=community.id
-        )
-        
         formatted_communities.append({
             "id": community.id,
             "name": community.name,
@@ -69,88 +85,110 @@ def list_communities(
             "slug": community.slug,
             "created_at": community.created_at,
             "created_by_id": community.created_by_id,
-            "is_member": is_member,
-            "is_admin": is_admin,
-            "members_count": members_count
+            "is_member": community.id in memberships,
+            "is_admin": community.created_by_id == current_user.id,
+            "members_count": community.members_count
         })
     
     return formatted_communities
 
 @router.get("/my", response_model=List[schemas.Community])
-def list_my_communities(
-    db: Session = Depends(deps.get_db),
-    skip: int = 0,
+async def list_my_communities(
+    response: Response,
+    db: AsyncSession = Depends(deps.get_async_db),
+    cursor: Optional[Cursor] = Depends(deps.get_cursor),
     limit: int = 100,
-    current_user: models.User = Depends(deps.get_current_user),
+    current_user: schemas.User = Depends(deps.get_current_user_async),
 ) -> Any:
     """
     Retrieve communities where user is member.
     """
-    communities = crud.community.get_user_communities(
-        db=db, user_id=current_user.id, skip=skip, limit=limit
+    communities, next_cursor = await crud.community_async.get_user_communities(
+        db=db, user_id=current_user.id, cursor=cursor, limit=limit
+    )
+    deps.set_next_cursor(response, next_cursor)
+    await crud.community_async.annotate_memberships(
+        db=db, communities=communities, user_id=current_user.id
     )
-    for community in communities:
-        community.is_member = True
-        community.is_admin = community.created_by_id == current_user.id
-        community.members_count = crud.community.get_member_count(
-            db=db, community_id=community.id
-        )
     return communities
 
 @router.get("/{slug}", response_model=schemas.CommunityWithMembers)
-def get_community(
+async def get_community(
     *,
-    db: Session = Depends(deps.get_db),
+    db: AsyncSession = Depends(deps.get_async_db),
     slug: str,
-    current_user: models.User = Depends(deps.get_current_user),
+    current_user: schemas.User = Depends(deps.get_current_user_async),
 ) -> Any:
     """
     Get community by slug.
     """
-    community = crud.community.get_by_slug(db=db, slug=slug)
+    community = await crud.community_async.get_by_slug(db=db, slug=slug, load="community")
     if not community:
         raise HTTPException(status_code=404, detail="Community not found")
     
-    community.is_member = crud.community.is_member(
-        db=db, community_id=community.id, user_id=current_user.id
+    community.recent_members, _ = await crud.community_async.get_members(
+        db, community_id=community.id, limit=settings.COMMUNITY_MEMBERS_PREVIEW
     )
-    community.is_admin = community.created_by_id == current_user.id
-    community.members_count = crud.community.get_member_count(
-        db=db, community_id=community.id
+    await crud.community_async.annotate_memberships(
+        db=db, communities=[community], user_id=current_user.id
     )
     return community
 
+@router.get("/{community_id}/members", response_model=List[schemas.CommunityMember])
+async def list_community_members(
+    *,
+    db: AsyncSession = Depends(deps.get_async_db),
+    community_id: int,
+    cursor: Optional[Cursor] = Depends(deps.get_cursor),
+    limit: int = Query(50, ge=1, le=100),
+    current_user: schemas.User = Depends(deps.get_current_user_async),
+    response: Response,
+) -> Any:
+    """
+    Retrieve community members, most recently joined first.
+    """
+    if not await crud.community_async.get(db=db, id=community_id):
+        raise HTTPException(status_code=404, detail="Community not found")
+    members, next_cursor = await crud.community_async.get_members(
+        db, community_id=community_id, cursor=cursor, limit=limit
+    )
+    deps.set_next_cursor(response, next_cursor)
+    return members
+
 @router.put("/{community_id}", response_model=schemas.Community)
-def update_community(
+async def update_community(
     *,
-    db: Session = Depends(deps.get_db),
+    db: AsyncSession = Depends(deps.get_async_db),
     community_id: int,
     community_in: schemas.CommunityUpdate,
-    current_user: models.User = Depends(deps.get_current_user),
+    current_user: schemas.User = Depends(deps.get_current_user_async),
 ) -> Any:
     """
     Update community.
     """
-    community = crud.community.get(db=db, id=community_id)
+    community = await crud.community_async.get(db=db, id=community_id, load="community")
     if not community:
         raise HTTPException(status_code=404, detail="Community not found")
     if community.created_by_id != current_user.id:
         raise HTTPException(status_code=403, detail="Not enough permissions")
     
-    community = crud.community.update(db=db, db_obj=community, obj_in=community_in)
+    community = await crud.community_async.update(db=db, db_obj=community, obj_in=community_in)
+    await crud.community_async.annotate_memberships(
+        db=db, communities=[community], user_id=current_user.id
+    )
     return community
 
 @router.post("/{community_id}/members", response_model=schemas.Community)
-def join_community(
+async def join_community(
     *,
-    db: Session = Depends(deps.get_db),
+    db: AsyncSession = Depends(deps.get_async_db),
     community_id: int,
-    current_user: models.User = Depends(deps.get_current_user),
+    current_user: schemas.User = Depends(deps.get_current_user_async),
 ) -> Any:
     """
     Join community.
     """
-    community = crud.community.get(db=db, id=community_id)
+    community = await crud.community_async.get(db=db, id=community_id, load="community")
     if not community:
         raise HTTPException(status_code=404, detail="Community not found")
     
@@ -160,22 +198,25 @@ def join_community(
             detail="This is a private community. Contact the administrator."
         )
     
-    community = crud.community.add_member(
+    community = await crud.community_async.add_member(
         db=db, community_id=community_id, user_id=current_user.id
     )
+    await crud.community_async.annotate_memberships(
+        db=db, communities=[community], user_id=current_user.id
+    )
     return community
 
 @router.delete("/{community_id}/members", response_model=schemas.Community)
-def leave_community(
+async def leave_community(
     *,
-    db: Session = Depends(deps.get_db),
+    db: AsyncSession = Depends(deps.get_async_db),
     community_id: int,
-    current_user: models.User = Depends(deps.get_current_user),
+    current_user: schemas.User = Depends(deps.get_current_user_async),
 ) -> Any:
     """
     Leave community.
     """
-    community = crud.community.get(db=db, id=community_id)
+    community = await crud.community_async.get(db=db, id=community_id, load="community")
     if not community:
         raise HTTPException(status_code=404, detail="Community not found")
     
@@ -185,26 +226,29 @@ def leave_community(
             detail="Community owner cannot leave the community"
         )
     
-    community = crud.community.remove_member(
+    community = await crud.community_async.remove_member(
         db=db, community_id=community_id, user_id=current_user.id
     )
+    await crud.community_async.annotate_memberships(
+        db=db, communities=[community], user_id=current_user.id
+    )
     return community
 
 @router.delete("/{community_id}", response_model=schemas.Community)
-def delete_community(
+async def delete_community(
     *,
-    db: Session = Depends(deps.get_db),
+    db: AsyncSession = Depends(deps.get_async_db),
     community_id: int,
-    current_user: models.User = Depends(deps.get_current_user),
+    current_user: schemas.User = Depends(deps.get_current_user_async),
 ) -> Any:
     """
     Delete community.
     """
-    community = crud.community.get(db=db, id=community_id)
+    community = await crud.community_async.get(db=db, id=community_id, load="community")
     if not community:
         raise HTTPException(status_code=404, detail="Community not found")
     if community.created_by_id != current_user.id:
         raise HTTPException(status_code=403, detail="Not enough permissions")
     
-    community = crud.community.remove(db=db, id=community_id)
+    community = await crud.community_async.remove(db=db, id=community_id)
     return community
@@ -1,44 +1,38 @@
 from typing import Any
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from app import crud, schemas
 from app.api import deps
+from app.api.routing import UnitOfWorkRoute
 
-router = APIRouter()
+router = APIRouter(route_class=UnitOfWorkRoute)
 
-@router.post("/post/{post_id}", response_model=schemas.Post)
-def like_post(
+@router.post("/post/{post_id}", response_model=schemas.LikeStatus)
+async def like_post(
     *,
-    db: Session = Depends(deps.get_db),
+    db: AsyncSession = Depends(deps.get_async_db),
     post_id: int,
-    current_user: schemas.User = Depends(deps.get_current_user),
+    current_user: schemas.User = Depends(deps.get_current_user_async),
 ) -> Any:
     """
-    Like a post.
+    Like a post. Liking an already liked post is a no-op.
     """
-    post = crud.post.get(db=db, id=post_id)
-    if not post:
+    likes_count = await crud.like_async.like_post(db, user_id=current_user.id, post_id=post_id)
+    if likes_count is None:
         raise HTTPException(status_code=404, detail="Post not found")
-    if crud.like.get_by_user_and_post(db, user_id=current_user.id, post_id=post_id):
-        raise HTTPException(status_code=400, detail="Post already liked")
-    crud.like.create_with_owner(db=db, owner_id=current_user.id, post_id=post_id)
-    return post
+    return schemas.LikeStatus(post_id=post_id, likes_count=likes_count, is_liked=True)
 
-@router.delete("/post/{post_id}", response_model=schemas.Post)
-def unlike_post(
+@router.delete("/post/{post_id}", response_model=schemas.LikeStatus)
+async def unlike_post(
     *,
-    db: Session = Depends(deps.get_db),
+    db: AsyncSession = Depends(deps.get_async_db),
     post_id: int,
-    current_user: schemas.User = Depends(deps.get_current_user),
+    current_user: schemas.User = Depends(deps.get_current_user_async),
 ) -> Any:
     """
-    Unlike a post.
+    Unlike a post. Unliking a post that isn't liked is a no-op.
     """
-    post = crud.post.get(db=db, id=post_id)
-    if not post:
+    likes_count = await crud.like_async.unlike_post(db, user_id=current_user.id, post_id=post_id)
+    if likes_count is None:
         raise HTTPException(status_code=404, detail="Post not found")
-    like = crud.like.get_by_user_and_post(db, user_id=current_user.id, post_id=post_id)
-    if not like:
-        raise HTTPException(status_code=400, detail="Post not liked")
-    crud.like.remove(db=db, id=like.id)
-    return post 
\ No newline at end of file
+    return schemas.LikeStatus(post_id=post_id, likes_count=likes_count, is_liked=False)
@@ -1,161 +1,205 @@
 from typing import Any, List, Optional
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from app import crud, schemas, models
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from sqlalchemy.ext.asyncio import AsyncSession
+from app import crud, schemas
 from app.api import deps
+from app.api.serialization import render
+from app.api.routing import CachedRoute, cache_response
+from app.crud.base import Cursor
+from app.crud.search import SearchCursor
 
-router = APIRouter()
+router = APIRouter(route_class=CachedRoute)
 
 @router.get("/", response_model=List[schemas.PostWithComments])
-def read_posts(
-    db: Session = Depends(deps.get_db),
-    skip: int = 0,
+@cache_response("posts", anonymous_only=True)
+async def read_posts(
+    response: Response,
+    db: AsyncSession = Depends(deps.get_async_db),
+    cursor: Optional[Cursor] = Depends(deps.get_cursor),
     limit: int = 100,
-    current_user: Optional[models.User] = Depends(deps.get_current_user_optional),
+    current_user: Optional[schemas.User] = Depends(deps.get_current_user_optional_async),
 ) -> Any:
     """
     Retrieve posts.
     """
-    posts = crud.post.get_multi(db, skip=skip, limit=limit)
-    for post in posts:
-        post.likes_count = len(post.likes)
-        if current_user:
-            post.is_liked = any(like.user_id == current_user.id for like in post.likes)
-        else:
-            post.is_liked = False
-    return posts
+    posts, next_cursor = await crud.post_async.get_feed(
+        db,
+        user_id=current_user.id if current_user else None,
+        cursor=cursor,
+        limit=limit,
+    )
+    deps.set_next_cursor(response, next_cursor)
+    return render(response, posts, schemas.PostWithComments)
 
 @router.post("/", response_model=schemas.Post)
-def create_post(
+async def create_post(
     *,
-    db: Session = Depends(deps.get_db),
+    db: AsyncSession = Depends(deps.get_async_db),
     post_in: schemas.PostCreate,
-    current_user: schemas.User = Depends(deps.get_current_user),
+    current_user: schemas.User = Depends(deps.get_current_user_async),
 ) -> Any:
     """
     Create new post.
     """
-    post = crud.post.create_with_owner(
+    post = await crud.post_async.create_with_owner(
         db=db, obj_in=post_in, owner_id=current_user.id
     )
-    return post
+    return await crud.post_async.get(db, post.id, load="post")
+
+@router.get("/feed", response_model=List[schemas.PostWithComments])
+async def read_home_feed(
+    response: Response,
+    db: AsyncSession = Depends(deps.get_async_db),
+    cursor: Optional[Cursor] = Depends(deps.get_cursor),
+    limit: int = 100,
+    current_user: schemas.User = Depends(deps.get_current_user_async),
+) -> Any:
+    """
+    Retrieve the current user's home timeline: posts from their communities.
+    """
+    posts, next_cursor = await crud.post_async.get_home_feed(
+        db, user_id=current_user.id, cursor=cursor, limit=limit
+    )
+    deps.set_next_cursor(response, next_cursor)
+    return render(response, posts, schemas.PostWithComments)
+
+@router.get("/search", response_model=List[schemas.PostWithComments])
+async def search_posts(
+    response: Response,
+    q: str = Query(..., min_length=3, max_length=100),
+    db: AsyncSession = Depends(deps.get_async_db),
+    cursor: Optional[SearchCursor] = Depends(deps.get_search_cursor),
+    limit: int = 100,
+    current_user: schemas.User = Depends(deps.get_current_user_async),
+) -> Any:
+    """
+    Search posts by title and content, most relevant first.
+    """
+    posts, next_cursor = await crud.post_async.search(
+        db, query=q, user_id=current_user.id, cursor=cursor, limit=limit
+    )
+    deps.set_next_cursor(response, next_cursor)
+    return render(response, posts, schemas.PostWithComments)
 
 @router.get("/announcements", response_model=List[schemas.Post])
-def read_announcements(
-    db: Session = Depends(deps.get_db),
-    skip: int = 0,
+@cache_response("posts")
+async def read_announcements(
+    response: Response,
+    db: AsyncSession = Depends(deps.get_async_db),
+    cursor: Optional[Cursor] = Depends(deps.get_cursor),
     limit: int = 100,
 ) -> Any:
     """
     Retrieve announcements.
     """
-    posts = crud.post.get_announcements(db, skip=skip, limit=limit)
-    return posts
+    posts, next_cursor = await crud.post_async.get_announcements(db, cursor=cursor, limit=limit)
+    deps.set_next_cursor(response, next_cursor)
+    return render(response, posts, schemas.Post)
 
-@router.get("/{post_id}", response_model=schemas.PostWithComments)
-def read_post(
+@router.get("/{post_id}", response_model=schemas.PostDetail)
+async def read_post(
     *,
-    db: Session = Depends(deps.get_db),
+    db: AsyncSession = Depends(deps.get_async_db),
     post_id: int,
-    current_user: schemas.User = Depends(deps.get_current_user),
+    comments_limit: int = Query(20, ge=1, le=100),
+    current_user: schemas.User = Depends(deps.get_current_user_async),
+    response: Response,
 ) -> Any:
     """
-    Get post by ID.
+    Get post by ID, with the first page of its comments.
     """
-    post = crud.post.get(db=db, id=post_id)
+    post = await crud.post_async.get_detail(db, id=post_id, user_id=current_user.id)
     if not post:
         raise HTTPException(status_code=404, detail="Post not found")
-    post.likes_count = len(post.likes)
-    post.is_liked = any(like.user_id == current_user.id for like in post.likes)
+    post.comments, next_cursor = await crud.comment_async.get_page_with_authors(
+        db, post_id=post_id, limit=comments_limit
+    )
+    deps.set_next_cursor(response, next_cursor)
     return post
 
 @router.put("/{post_id}", response_model=schemas.Post)
-def update_post(
+async def update_post(
     *,
-    db: Session = Depends(deps.get_db),
+    db: AsyncSession = Depends(deps.get_async_db),
     post_id: int,
     post_in: schemas.PostUpdate,
-    current_user: schemas.User = Depends(deps.get_current_user),
+    current_user: schemas.User = Depends(deps.get_current_user_async),
 ) -> Any:
     """
     Update a post.
     """
-    post = crud.post.get(db=db, id=post_id)
+    post = await crud.post_async.get(db=db, id=post_id, load="post")
     if not post:
         raise HTTPException(status_code=404, detail="Post not found")
     if post.author_id != current_user.id:
         raise HTTPException(status_code=403, detail="Not enough permissions")
-    post = crud.post.update(db=db, db_obj=post, obj_in=post_in)
+    post = await crud.post_async.update(db=db, db_obj=post, obj_in=post_in)
     return post
 
 @router.delete("/{post_id}", response_model=schemas.Post)
-def delete_post(
+async def delete_post(
     *,
-    db: Session = Depends(deps.get_db),
+    db: AsyncSession = Depends(deps.get_async_db),
     post_id: int,
-    current_user: schemas.User = Depends(deps.get_current_user),
+    current_user: schemas.User = Depends(deps.get_current_user_async),
 ) -> Any:
     """
     Delete a post.
     """
-    post = crud.post.get(db=db, id=post_id)
+    post = await crud.post_async.get(db=db, id=post_id, load="post")
     if not post:
         raise HTTPException(status_code=404, detail="Post not found")
     if post.author_id != current_user.id:
         raise HTTPException(status_code=403, detail="Not enough permissions")
-    post = crud.post.remove(db=db, id=post_id)
+    post = await crud.post_async.remove(db=db, id=post_id)
     return post
 
 @router.get("/community/{community_id}", response_model=List[schemas.PostWithComments])
-def read_community_posts(
+async def read_community_posts(
     *,
-    db: Session = Depends(deps.get_db),
+    db: AsyncSession = Depends(deps.get_async_db),
     community_id: int,
-    skip: int = 0,
+    cursor: Optional[Cursor] = Depends(deps.get_cursor),
     limit: int = 100,
-    current_user: models.User = Depends(deps.get_current_user),
+    current_user: schemas.User = Depends(deps.get_current_user_async),
+    response: Response,
 ) -> Any:
     """
     Get posts by community ID.
     """
-    posts = crud.post.get_by_community(
-        db=db, community_id=community_id, skip=skip, limit=limit
+    posts, next_cursor = await crud.post_async.get_feed(
+        db=db,
+        user_id=current_user.id,
+        community_id=community_id,
+        cursor=cursor,
+        limit=limit,
     )
-    for post in posts:
-        post.likes_count = len(post.likes)
-        post.is_liked = any(like.user_id == current_user.id for like in post.likes)
-    return posts
+    deps.set_next_cursor(response, next_cursor)
+    return render(response, posts, schemas.PostWithComments)
 
 @router.get("/user/{user_id}", response_model=List[schemas.PostWithComments])
-def read_user_posts(
+async def read_user_posts(
     *,
-    db: Session = Depends(deps.get_db),
+    db: AsyncSession = Depends(deps.get_async_db),
     user_id: int,
-    skip: int = 0,
+    cursor: Optional[Cursor] = Depends(deps.get_cursor),
     limit: int = 100,
-    current_user: models.User = Depends(deps.get_current_user),
+    current_user: schemas.User = Depends(deps.get_current_user_async),
+    response: Response,
 ) -> Any:
     """
     Get posts by user ID.
     """
     try:
-        posts = crud.post.get_by_author(
-            db=db, author_id=user_id, skip=skip, limit=limit
+        posts, next_cursor = await crud.post_async.get_feed(
+            db=db,
+            user_id=current_user.id,
+            author_id=user_id,
+            cursor=cursor,
+            limit=limit,
         )
-        for post in posts:
-            try:
-                post.likes_count = len(post.likes)
-                post.is_liked = any(like.user_id == current_user.id for like in post.likes)
-                if post.community:
-                    post.community = schemas.CommunityMinimal(
-                        id=post.community.id,
-                        name=post.community.name,
-                        slug=post.community.slug
-                    )
-            except Exception as e:
-                print(f"Error processing post {post.id}: {str(e)}")
-                continue
-        return posts
+        deps.set_next_cursor(response, next_cursor)
+        return render(response, posts, schemas.PostWithComments)
     except Exception as e:
         print(f"Error in read_user_posts: {str(e)}")
         raise HTTPException(
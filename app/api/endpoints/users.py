@@ -1,23 +1,27 @@
-from typing import Any, List
-from fastapi import APIRouter, Depends, HTTPException, status
+from typing import Any, List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Response, status
 from sqlalchemy.orm import Session
 from app import crud, schemas
 from app.api import deps
+from app.api.routing import UnitOfWorkRoute
+from app.crud.base import Cursor
 from app.core.security import get_password_hash
 
-router = APIRouter()
+router = APIRouter(route_class=UnitOfWorkRoute)
 
 @router.get("/", response_model=List[schemas.User])
 def read_users(
+    response: Response,
     db: Session = Depends(deps.get_db),
-    skip: int = 0,
+    cursor: Optional[Cursor] = Depends(deps.get_cursor),
     limit: int = 100,
     current_user: schemas.User = Depends(deps.get_current_user),
 ) -> Any:
     """
     Retrieve users.
     """
-    users = crud.user.get_multi(db, skip=skip, limit=limit)
+    users, next_cursor = crud.user.get_page(db, cursor=cursor, limit=limit)
+    deps.set_next_cursor(response, next_cursor)
     return users
 
 @router.post("/", response_model=schemas.User)
@@ -65,7 +69,8 @@ def update_user_me(
     """
     if user_in.password is not None:
         user_in.hashed_password = get_password_hash(user_in.password)
-    user = crud.user.update(db, db_obj=current_user, obj_in=user_in)
+    db_user = crud.user.get(db, id=current_user.id)
+    user = crud.user.update(db, db_obj=db_user, obj_in=user_in)
     return user
 
 @router.get("/{user_id}", response_model=schemas.User)
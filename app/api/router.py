@@ -1,5 +1,5 @@
 from fastapi import APIRouter
-from app.api.endpoints import auth, users, communities, posts, comments
+from app.api.endpoints import auth, users, communities, posts, comments, likes
 
 router = APIRouter()
 
@@ -8,4 +8,5 @@ router.include_router(auth.router, prefix="/auth", tags=["auth"])
 router.include_router(users.router, prefix="/users", tags=["users"])
 router.include_router(communities.router, prefix="/communities", tags=["communities"])
 router.include_router(posts.router, prefix="/posts", tags=["posts"])
-router.include_router(comments.router, prefix="/comments", tags=["comments"]) 
\ No newline at end of file
+router.include_router(comments.router, prefix="/comments", tags=["comments"])
+router.include_router(likes.router, prefix="/likes", tags=["likes"])
@@ -0,0 +1,111 @@
+from typing import Callable, Optional
+from fastapi import Request, Response
+from fastapi.concurrency import run_in_threadpool
+from fastapi.routing import APIRoute
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.response_cache import CachedResponse, make_etag, response_cache
+from app.db.unit_of_work import UNIT_OF_WORK_ROUTE, in_unit_of_work
+
+# Response headers that are replayed from the cache
+_CACHED_HEADERS = {"content-type", "x-next-cursor"}
+
+def cache_response(namespace: str, *, anonymous_only: bool = False) -> Callable:
+    """
+    Mark a GET endpoint as cacheable by CachedRoute. Entries are shared by
+    all callers, so endpoints whose output depends on the user must pass
+    anonymous_only=True; authenticated requests then bypass the cache.
+    """
+    def decorator(endpoint: Callable) -> Callable:
+        endpoint.response_cache_namespace = namespace
+        endpoint.response_cache_anonymous_only = anonymous_only
+        return endpoint
+    return decorator
+
+class UnitOfWorkRoute(APIRoute):
+    """
+    Commits the request's unit-of-work session (stored on request.state.db
+    by get_db or get_async_db) once the endpoint has returned and its
+    response has been rendered, before it is sent. FastAPI runs the teardown
+    of yield dependencies only after the response has gone out, which is too
+    late to report a failed commit to the client.
+    """
+
+    def get_route_handler(self) -> Callable:
+        route_handler = super().get_route_handler()
+
+        async def unit_of_work_handler(request: Request) -> Response:
+            request.scope[UNIT_OF_WORK_ROUTE] = True
+            try:
+                response = await route_handler(request)
+            except Exception:
+                await _finish(request, commit=False)
+                raise
+            await _finish(request, commit=response.status_code < 400)
+            return response
+
+        return unit_of_work_handler
+
+async def _finish(request: Request, *, commit: bool) -> None:
+    db = getattr(request.state, "db", None)
+    if isinstance(db, AsyncSession):
+        if in_unit_of_work(db.sync_session):
+            await (db.commit() if commit else db.rollback())
+        return
+    if db is None or not in_unit_of_work(db):
+        return
+    if commit:
+        await run_in_threadpool(db.commit)
+    else:
+        await run_in_threadpool(db.rollback)
+
+class CachedRoute(UnitOfWorkRoute):
+    """
+    Serves endpoints marked with @cache_response from the response cache,
+    with an ETag; requests whose If-None-Match matches get a 304 with no
+    body.
+    """
+
+    def get_route_handler(self) -> Callable:
+        route_handler = super().get_route_handler()
+        namespace: Optional[str] = getattr(self.endpoint, "response_cache_namespace", None)
+        if namespace is None:
+            return route_handler
+        anonymous_only = self.endpoint.response_cache_anonymous_only
+
+        async def cached_handler(request: Request) -> Response:
+            if (
+                not response_cache.enabled
+                or request.method != "GET"
+                or (anonymous_only and "authorization" in request.headers)
+            ):
+                return await route_handler(request)
+
+            key = await run_in_threadpool(
+                response_cache.key, namespace, request.url.path, request.url.query
+            )
+            if key is None:
+                return await route_handler(request)
+            entry = await run_in_threadpool(response_cache.get, key)
+            if entry is None:
+                response = await route_handler(request)
+                if response.status_code != 200:
+                    return response
+                entry = CachedResponse(
+                    body=response.body,
+                    headers=[
+                        (name, value) for name, value in response.headers.items()
+                        if name in _CACHED_HEADERS
+                    ],
+                    etag=make_etag(response.body),
+                )
+                await run_in_threadpool(response_cache.set, key, entry)
+
+            if request.headers.get("if-none-match") == entry.etag:
+                response_cache.not_modified += 1
+                return Response(status_code=304, headers={"ETag": entry.etag})
+            response = Response(content=entry.body, headers={"ETag": entry.etag})
+            for name, value in entry.headers:
+                response.headers[name] = value
+            return response
+
+        return cached_handler
@@ -15,11 +15,72 @@ class Settings(BaseSettings):
     DATABASE_URL: Optional[str] = os.getenv('DATABASE_URL')
     SQLALCHEMY_DATABASE_URI: Optional[str] = os.getenv('SQLALCHEMY_DATABASE_URI')
     
+    # Connection pool. Pre-ping is off by default: the background health
+    # check and pool_recycle cover stale connections without a per-checkout
+    # round trip.
+    DB_POOL_SIZE: int = int(os.getenv('DB_POOL_SIZE', '5'))
+    DB_MAX_OVERFLOW: int = int(os.getenv('DB_MAX_OVERFLOW', '10'))
+    DB_POOL_TIMEOUT: float = float(os.getenv('DB_POOL_TIMEOUT', '30'))
+    DB_POOL_RECYCLE: int = int(os.getenv('DB_POOL_RECYCLE', '1800'))
+    DB_POOL_PRE_PING: bool = os.getenv('DB_POOL_PRE_PING', 'false').lower() in ('1', 'true', 'yes')
+    DB_HEALTHCHECK_INTERVAL: float = float(os.getenv('DB_HEALTHCHECK_INTERVAL', '30'))
+    # Commit once per request instead of once per CRUD write
+    DB_UNIT_OF_WORK: bool = os.getenv('DB_UNIT_OF_WORK', 'true').lower() in ('1', 'true', 'yes')
+    # Relationship loading: "raise_on_sql" makes lazy loads an error, so every
+    # load must be planned; "select" restores lazy loading for debugging
+    DB_LAZY_LOAD: str = os.getenv('DB_LAZY_LOAD', 'raise_on_sql')
+    # Warn when a request runs more statements than this (0 disables), or
+    # repeats one statement shape QUERY_REPEAT_THRESHOLD times (likely N+1)
+    QUERY_BUDGET: int = int(os.getenv('QUERY_BUDGET', '25'))
+    QUERY_REPEAT_THRESHOLD: int = int(os.getenv('QUERY_REPEAT_THRESHOLD', '10'))
+    
     # JWT Configuration (keep these)
     JWT_SECRET_KEY: str = os.getenv('JWT_SECRET_KEY', 'your-secret-key')  # Default for development
     JWT_ALGORITHM: str = os.getenv('JWT_ALGORITHM', 'HS256')
     ACCESS_TOKEN_EXPIRE_MINUTES: int = int(os.getenv('ACCESS_TOKEN_EXPIRE_MINUTES', '30'))
 
+    # Password hashing: bcrypt cost and the worker pool that runs it off the event loop.
+    # Changing BCRYPT_ROUNDS rehashes stored passwords on the next successful login.
+    BCRYPT_ROUNDS: int = int(os.getenv('BCRYPT_ROUNDS', '12'))
+    PASSWORD_HASH_WORKERS: int = int(os.getenv('PASSWORD_HASH_WORKERS', str(os.cpu_count() or 2)))
+    PASSWORD_HASH_MAX_PENDING: int = int(os.getenv('PASSWORD_HASH_MAX_PENDING', '64'))
+    PASSWORD_HASH_QUEUE_TIMEOUT: float = float(os.getenv('PASSWORD_HASH_QUEUE_TIMEOUT', '5'))
+
+    # Per-process cache of authenticated users. Invalidation is local to the
+    # process, so the TTL bounds how long other workers may serve stale data.
+    USER_CACHE_TTL_SECONDS: float = float(os.getenv('USER_CACHE_TTL_SECONDS', '60'))
+    USER_CACHE_MAX_SIZE: int = int(os.getenv('USER_CACHE_MAX_SIZE', '10000'))
+
+    # Home timeline: posts in communities up to this size are fanned out to
+    # members on write; larger communities are merged in at read time.
+    TIMELINE_FANOUT_MAX_MEMBERS: int = int(os.getenv('TIMELINE_FANOUT_MAX_MEMBERS', '1000'))
+    # Recent posts copied into a member's timeline when they join a community
+    TIMELINE_BACKFILL_POSTS: int = int(os.getenv('TIMELINE_BACKFILL_POSTS', '50'))
+
+    # Latest comments embedded per post in feed responses; full threads are
+    # paged through GET /comments/post/{post_id}
+    FEED_COMMENT_PREVIEW: int = int(os.getenv('FEED_COMMENT_PREVIEW', '3'))
+    # Latest members embedded in a community's detail response; the full
+    # list is paged through GET /communities/{community_id}/members
+    COMMUNITY_MEMBERS_PREVIEW: int = int(os.getenv('COMMUNITY_MEMBERS_PREVIEW', '5'))
+
+    # Response cache for shared GET endpoints: "memory" (per process),
+    # "redis" (shared, needs the redis package and REDIS_URL) or "none"
+    RESPONSE_CACHE_BACKEND: str = os.getenv('RESPONSE_CACHE_BACKEND', 'memory')
+    RESPONSE_CACHE_TTL: float = float(os.getenv('RESPONSE_CACHE_TTL', '30'))
+    RESPONSE_CACHE_MAX_SIZE: int = int(os.getenv('RESPONSE_CACHE_MAX_SIZE', '1000'))
+    REDIS_URL: str = os.getenv('REDIS_URL', 'redis://localhost:6379/0')
+
+    # Write-behind like buffer (opt-in): likes are written in batches every
+    # LIKE_BUFFER_FLUSH_INTERVAL seconds or once LIKE_BUFFER_MAX_PENDING wait
+    LIKE_BUFFER_ENABLED: bool = os.getenv('LIKE_BUFFER_ENABLED', 'false').lower() in ('1', 'true', 'yes')
+    LIKE_BUFFER_FLUSH_INTERVAL: float = float(os.getenv('LIKE_BUFFER_FLUSH_INTERVAL', '1'))
+    LIKE_BUFFER_MAX_PENDING: int = int(os.getenv('LIKE_BUFFER_MAX_PENDING', '1000'))
+
+    # Opt-in fast path for post list endpoints: rows are projected straight
+    # to dicts and encoded with orjson, skipping response_model validation
+    FAST_JSON_RESPONSES: bool = os.getenv('FAST_JSON_RESPONSES', 'false').lower() in ('1', 'true', 'yes')
+
     @property
     def database_url(self) -> str:
         """Get the database URL with proper protocol handling"""
@@ -28,6 +89,16 @@ class Settings(BaseSettings):
             raise ValueError("No database URL configured")
         return url.replace('postgres://', 'postgresql://', 1)
 
+    @property
+    def async_database_url(self) -> str:
+        """Get the database URL for the asyncio driver (asyncpg / aiosqlite)"""
+        url = self.database_url
+        if url.startswith('postgresql://'):
+            return url.replace('postgresql://', 'postgresql+asyncpg://', 1)
+        if url.startswith('sqlite://'):
+            return url.replace('sqlite://', 'sqlite+aiosqlite://', 1)
+        return url
+
     class Config:
         case_sensitive = True
 
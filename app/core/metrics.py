@@ -0,0 +1,176 @@
+import time
+from collections import Counter as StatementCounter
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Iterable, Optional
+from prometheus_client import CONTENT_TYPE_LATEST, REGISTRY, Counter, Histogram, generate_latest
+from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from app.core.config import settings
+from app.db.query_budget import check_request, fingerprint
+
+REQUEST_LATENCY = Histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency by route template",
+    ["method", "route", "status"],
+)
+REQUEST_DB_QUERIES = Histogram(
+    "http_request_db_queries",
+    "SQL statements executed per HTTP request",
+    ["method", "route"],
+    buckets=(0, 1, 2, 3, 5, 10, 20, 50, 100, 250, 500),
+)
+REQUEST_DB_SECONDS = Histogram(
+    "http_request_db_duration_seconds",
+    "Time spent in SQL statements per HTTP request",
+    ["method", "route"],
+)
+DB_QUERIES = Counter(
+    "db_queries_total",
+    "SQL statements executed, by route template",
+    ["route"],
+)
+DB_QUERY_SECONDS = Counter(
+    "db_query_duration_seconds_total",
+    "Time spent in SQL statements, by route template",
+    ["route"],
+)
+LIKE_BUFFER_FLUSH_SECONDS = Histogram(
+    "like_buffer_flush_duration_seconds",
+    "Time to write one batch of buffered like events",
+)
+
+class RequestStats:
+    """Per-request DB counters, shared with threadpool workers via a contextvar."""
+
+    __slots__ = ("scope", "queries", "db_seconds", "statements")
+
+    def __init__(self, scope: Dict[str, Any]) -> None:
+        self.scope = scope
+        self.queries = 0
+        self.db_seconds = 0.0
+        # Raw statement text -> executions; fingerprinted once per request
+        self.statements: Dict[str, int] = {}
+
+    @property
+    def route(self) -> str:
+        # The router stores the matched route in the scope before the
+        # endpoint runs
+        return getattr(self.scope.get("route"), "path", "unmatched")
+
+    def fingerprints(self) -> StatementCounter:
+        counts: StatementCounter = StatementCounter()
+        for statement, n in self.statements.items():
+            counts[fingerprint(statement)] += n
+        return counts
+
+_request_stats: ContextVar[Optional[RequestStats]] = ContextVar("request_stats", default=None)
+
+def current_request_stats() -> Optional[RequestStats]:
+    return _request_stats.get()
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_start_time", []).append(time.perf_counter())
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - conn.info["query_start_time"].pop()
+    stats = _request_stats.get()
+    route = stats.route if stats is not None else "none"
+    if stats is not None:
+        stats.queries += 1
+        stats.db_seconds += elapsed
+        stats.statements[statement] = stats.statements.get(statement, 0) + 1
+    DB_QUERIES.labels(route).inc()
+    DB_QUERY_SECONDS.labels(route).inc(elapsed)
+
+def instrument_engine(engine: Engine) -> None:
+    """Count statements and DB time on engine (pass sync_engine for async engines)."""
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+class MetricsMiddleware:
+    """
+    ASGI middleware recording latency, status and DB usage per route
+    template (e.g. /api/v1/posts/{post_id}) rather than per raw path.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestStats(scope)
+        token = _request_stats.set(stats)
+        status_code = 500
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - start
+            method, route = scope["method"], stats.route
+            REQUEST_LATENCY.labels(method, route, str(status_code)).observe(elapsed)
+            REQUEST_DB_QUERIES.labels(method, route).observe(stats.queries)
+            REQUEST_DB_SECONDS.labels(method, route).observe(stats.db_seconds)
+            if settings.QUERY_BUDGET > 0 and stats.queries:
+                check_request(
+                    method=method,
+                    route=route,
+                    queries=stats.queries,
+                    fingerprints=stats.fingerprints(),
+                    budget=settings.QUERY_BUDGET,
+                    repeat_threshold=settings.QUERY_REPEAT_THRESHOLD,
+                )
+            _request_stats.reset(token)
+
+class StatsCollector:
+    """
+    Exposes dicts of numbers returned by a callable at scrape time, e.g.
+    pool_metrics() or TTLCache.stats(). Keys listed in `counters` are
+    exported as counters, the rest as gauges.
+    """
+
+    def __init__(
+        self,
+        prefix: str,
+        documentation: str,
+        collect: Callable[[], Dict[str, Dict[str, Any]]],
+        *,
+        label: str,
+        counters: Iterable[str] = ()
+    ):
+        self.prefix = prefix
+        self.documentation = documentation
+        self._collect = collect
+        self.label = label
+        self.counters = set(counters)
+
+    def collect(self):
+        families: Dict[str, Any] = {}
+        for label_value, values in self._collect().items():
+            for key, value in values.items():
+                if not isinstance(value, (int, float)) or isinstance(value, bool):
+                    continue
+                if key not in families:
+                    family_type = CounterMetricFamily if key in self.counters else GaugeMetricFamily
+                    families[key] = family_type(
+                        f"{self.prefix}_{key}", f"{self.documentation}: {key}", labels=[self.label]
+                    )
+                families[key].add_metric([label_value], value)
+        return list(families.values())
+
+def register_collector(collector: StatsCollector) -> None:
+    REGISTRY.register(collector)
+
+def render_latest() -> bytes:
+    return generate_latest(REGISTRY)
+
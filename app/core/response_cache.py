@@ -0,0 +1,191 @@
+import hashlib
+import json
+import logging
+import threading
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from app.core.cache import TTLCache
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Session.info key collecting namespaces to invalidate once the session commits
+_PENDING_INVALIDATIONS = "response_cache_invalidate"
+
+class CachedResponse(NamedTuple):
+    body: bytes
+    headers: List[Tuple[str, str]]
+    etag: str
+
+    def dumps(self) -> bytes:
+        meta = json.dumps({"headers": self.headers, "etag": self.etag}).encode()
+        return meta + b"\n" + self.body
+
+    @classmethod
+    def loads(cls, data: bytes) -> "CachedResponse":
+        meta, body = data.split(b"\n", 1)
+        fields = json.loads(meta)
+        return cls(body, [tuple(header) for header in fields["headers"]], fields["etag"])
+
+def make_etag(body: bytes) -> str:
+    return '"' + hashlib.blake2b(body, digest_size=16).hexdigest() + '"'
+
+class MemoryBackend:
+    """In-process LRU backend. Each worker process has its own copy."""
+
+    def __init__(self, *, maxsize: int, ttl: float):
+        self._entries: TTLCache[bytes] = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._generations: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[bytes]:
+        return self._entries.get(key)
+
+    def set(self, key: str, value: bytes, ttl: float) -> None:
+        self._entries.set(key, value)
+
+    def generation(self, namespace: str) -> int:
+        with self._lock:
+            return self._generations.get(namespace, 0)
+
+    def bump(self, namespace: str) -> None:
+        with self._lock:
+            self._generations[namespace] = self._generations.get(namespace, 0) + 1
+
+    def stats(self) -> Dict[str, Any]:
+        stats = self._entries.stats()
+        return {"size": stats["size"], "maxsize": stats["maxsize"], "evictions": stats["evictions"]}
+
+class RedisBackend:
+    """
+    Shared backend for any client with the redis-py get/set/incr API, so
+    all workers see the same entries and invalidations. Tests can pass a
+    local stub implementing those three methods.
+    """
+
+    def __init__(self, client: Any, *, prefix: str = "response-cache"):
+        self.client = client
+        self.prefix = prefix
+
+    @classmethod
+    def from_url(cls, url: str) -> "RedisBackend":
+        import redis
+        return cls(redis.Redis.from_url(url))
+
+    def get(self, key: str) -> Optional[bytes]:
+        return self.client.get(f"{self.prefix}:{key}")
+
+    def set(self, key: str, value: bytes, ttl: float) -> None:
+        self.client.set(f"{self.prefix}:{key}", value, ex=max(1, int(ttl)))
+
+    def generation(self, namespace: str) -> int:
+        return int(self.client.get(f"{self.prefix}:generation:{namespace}") or 0)
+
+    def bump(self, namespace: str) -> None:
+        self.client.incr(f"{self.prefix}:generation:{namespace}")
+
+    def stats(self) -> Dict[str, Any]:
+        return {}
+
+class ResponseCache:
+    """
+    Caches rendered response bodies by namespace, path and query string.
+
+    Invalidating a namespace bumps its generation number, which is part of
+    every key, so stale entries are never read again and age out of the
+    backend on their own.
+    """
+
+    def __init__(self, backend: Optional[Any], *, ttl: float):
+        self.backend = backend
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.not_modified = 0
+        self.errors = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.backend is not None
+
+    def key(self, namespace: str, path: str, query: str) -> Optional[str]:
+        """
+        Cache key for a request, or None if the namespace generation cannot
+        be read, in which case the request is served uncached.
+        """
+        try:
+            generation = self.backend.generation(namespace)
+        except Exception:
+            logger.exception("Response cache generation read failed")
+            self.errors += 1
+            return None
+        return f"{namespace}:{generation}:{path}?{query}"
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        try:
+            data = self.backend.get(key)
+        except Exception:
+            # A cache outage should degrade to uncached responses
+            logger.exception("Response cache read failed")
+            self.errors += 1
+            return None
+        if data is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return CachedResponse.loads(data)
+
+    def set(self, key: str, entry: CachedResponse) -> None:
+        try:
+            self.backend.set(key, entry.dumps(), self.ttl)
+        except Exception:
+            logger.exception("Response cache write failed")
+            self.errors += 1
+
+    def invalidate(self, namespace: str) -> None:
+        if not self.enabled:
+            return
+        try:
+            self.backend.bump(namespace)
+        except Exception:
+            # Runs after the write has committed; failing the request would
+            # not undo it. Entries of the namespace go stale until they
+            # expire, at most ttl seconds.
+            logger.exception(f"Response cache invalidation of {namespace!r} failed")
+            self.errors += 1
+
+    def invalidate_on_commit(self, db: Session, namespace: str) -> None:
+        """
+        Invalidate a namespace once db commits, so a concurrent request
+        cannot cache data from before the write.
+        """
+        if not self.enabled:
+            return
+        db.info.setdefault(_PENDING_INVALIDATIONS, set()).add(namespace)
+        if not event.contains(db, "after_commit", self._after_commit):
+            event.listen(db, "after_commit", self._after_commit)
+
+    def _after_commit(self, db: Session) -> None:
+        for namespace in db.info.pop(_PENDING_INVALIDATIONS, ()):
+            self.invalidate(namespace)
+
+    def stats(self) -> Dict[str, Any]:
+        stats = {
+            "hits": self.hits,
+            "misses": self.misses,
+            "not_modified": self.not_modified,
+            "errors": self.errors,
+        }
+        if self.enabled:
+            stats.update(self.backend.stats())
+        return stats
+
+def _create_backend() -> Optional[Any]:
+    if settings.RESPONSE_CACHE_BACKEND == "memory":
+        return MemoryBackend(maxsize=settings.RESPONSE_CACHE_MAX_SIZE, ttl=settings.RESPONSE_CACHE_TTL)
+    if settings.RESPONSE_CACHE_BACKEND == "redis":
+        return RedisBackend.from_url(settings.REDIS_URL)
+    return None
+
+response_cache = ResponseCache(_create_backend(), ttl=settings.RESPONSE_CACHE_TTL)
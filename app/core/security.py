@@ -1,10 +1,28 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Any, Union
+from typing import Any, Callable, Optional, Tuple, TypeVar, Union
 from jose import jwt
 from passlib.context import CryptContext
 from app.core.config import settings
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+T = TypeVar("T")
+
+pwd_context = CryptContext(
+    schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=settings.BCRYPT_ROUNDS
+)
+
+# bcrypt releases the GIL while hashing, so a thread pool is enough to keep
+# it off the event loop. The semaphore bounds work in flight (running plus
+# queued); callers that cannot get a slot within PASSWORD_HASH_QUEUE_TIMEOUT
+# get PasswordHasherBusy instead of piling up behind a login burst.
+_password_executor = ThreadPoolExecutor(
+    max_workers=settings.PASSWORD_HASH_WORKERS, thread_name_prefix="password-hash"
+)
+_password_slots = asyncio.Semaphore(settings.PASSWORD_HASH_MAX_PENDING)
+
+class PasswordHasherBusy(Exception):
+    """Too many password hash/verify operations are already pending."""
 
 def create_access_token(
     subject: Union[str, Any], expires_delta: timedelta = None
@@ -25,4 +43,35 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
 
 def get_password_hash(password: str) -> str:
-    return pwd_context.hash(password) 
\ No newline at end of file
+    return pwd_context.hash(password)
+
+async def _run_password_task(fn: Callable[..., T], *args: Any) -> T:
+    try:
+        await asyncio.wait_for(
+            _password_slots.acquire(), timeout=settings.PASSWORD_HASH_QUEUE_TIMEOUT
+        )
+    except asyncio.TimeoutError:
+        raise PasswordHasherBusy()
+    try:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(_password_executor, fn, *args)
+    finally:
+        _password_slots.release()
+
+async def verify_password_async(
+    plain_password: str, hashed_password: str
+) -> Tuple[bool, Optional[str]]:
+    """
+    Verify a password in the hashing pool. Returns (valid, new_hash) where
+    new_hash is set when the stored hash uses an outdated bcrypt cost and
+    should be replaced.
+    """
+    return await _run_password_task(
+        pwd_context.verify_and_update, plain_password, hashed_password
+    )
+
+async def get_password_hash_async(password: str) -> str:
+    return await _run_password_task(pwd_context.hash, password)
+
+def shutdown_password_executor() -> None:
+    _password_executor.shutdown(wait=False)
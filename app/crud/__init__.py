@@ -1,8 +1,13 @@
-from app.crud.crud_user import user
-from app.crud.crud_post import post
-from app.crud.crud_comment import comment
-from app.crud.crud_like import like
-from app.crud.crud_community import community
+from app.crud.crud_user import user, user_async
+from app.crud.crud_post import post, post_async
+from app.crud.crud_comment import comment, comment_async
+from app.crud.crud_like import like, like_async
+from app.crud.like_buffer import like_buffer
+from app.crud.crud_community import community, community_async
+from app.crud.crud_timeline import timeline
 
 # Export all crud operations
-__all__ = ["user", "post", "comment", "like", "community"] 
\ No newline at end of file
+__all__ = [
+    "user", "user_async", "post", "post_async", "comment", "comment_async",
+    "like", "like_async", "like_buffer", "community", "community_async", "timeline",
+]
@@ -0,0 +1,110 @@
+from typing import Any, Awaitable, Callable, Dict, Generic, List, Optional, Tuple, Type, TypeVar, Union
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy import inspect, select
+from sqlalchemy.exc import NoInspectionAvailable
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from app.crud.base import CreateSchemaType, Cursor, ModelType, UpdateSchemaType, encode_cursor, keyset
+
+CRUDType = TypeVar("CRUDType")
+
+class AsyncCRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
+    def __init__(self, model: Type[ModelType]):
+        """
+        AsyncSession counterpart of CRUDBase, for `async def` endpoints.
+        """
+        self.model = model
+
+    async def get(self, db: AsyncSession, id: Any) -> Optional[ModelType]:
+        return await db.get(self.model, id)
+
+    async def get_page(
+        self, db: AsyncSession, *, cursor: Optional[Cursor] = None, limit: int = 100
+    ) -> Tuple[List[ModelType], Optional[str]]:
+        """
+        One page of self.model, newest first, keyset-paginated by
+        (created_at, id) like CRUDBase.get_page.
+        """
+        statement = keyset(select(self.model), self.model, cursor=cursor, descending=True)
+        rows = (await db.execute(statement.limit(limit + 1))).scalars().all()
+        if len(rows) <= limit:
+            return rows, None
+        rows = rows[:limit]
+        return rows, encode_cursor(rows[-1].created_at, rows[-1].id)
+
+    async def create(self, db: AsyncSession, *, obj_in: CreateSchemaType) -> ModelType:
+        obj_in_data = jsonable_encoder(obj_in)
+        db_obj = self.model(**obj_in_data)
+        db.add(db_obj)
+        await db.commit()
+        return db_obj
+
+    async def update(
+        self,
+        db: AsyncSession,
+        *,
+        db_obj: ModelType,
+        obj_in: Union[UpdateSchemaType, Dict[str, Any]]
+    ) -> ModelType:
+        obj_data = jsonable_encoder(db_obj)
+        if isinstance(obj_in, dict):
+            update_data = obj_in
+        else:
+            update_data = obj_in.dict(exclude_unset=True)
+        for field in obj_data:
+            if field in update_data:
+                setattr(db_obj, field, update_data[field])
+        db.add(db_obj)
+        await db.commit()
+        return db_obj
+
+    async def remove(self, db: AsyncSession, *, id: int) -> ModelType:
+        obj = await db.get(self.model, id)
+        await db.delete(obj)
+        await db.commit()
+        return obj
+
+class AsyncCRUD(Generic[CRUDType]):
+    """
+    Async face of a sync CRUD module. Its methods take an AsyncSession in
+    place of the Session and run the sync method with
+    AsyncSession.run_sync: statements go through the async driver without
+    blocking the event loop, and the query, counter and pagination logic
+    exists once, in the sync module. Unit-of-work flushes, after_commit
+    invalidations and loader presets behave as they do there. Attributes a
+    flush expired on returned objects (SQL onupdate values) are loaded
+    before returning, as the endpoint reads them outside run_sync, where
+    lazy IO is not possible.
+
+        posts, next_cursor = await crud.post_async.get_feed(db, user_id=1)
+    """
+
+    def __init__(self, crud: CRUDType):
+        self.crud = crud
+
+    def __getattr__(self, name: str) -> Callable[..., Awaitable[Any]]:
+        method = getattr(self.crud, name)
+        if not callable(method):
+            raise AttributeError(name)
+
+        def call(session: Session, *args: Any, **kwargs: Any) -> Any:
+            result = method(session, *args, **kwargs)
+            _load_expired(session, result)
+            return result
+
+        async def run(db: AsyncSession, *args: Any, **kwargs: Any) -> Any:
+            return await db.run_sync(call, *args, **kwargs)
+
+        run.__name__ = run.__qualname__ = name
+        run.__doc__ = method.__doc__
+        setattr(self, name, run)
+        return run
+
+def _load_expired(session: Session, result: Any) -> None:
+    """Refresh the expired attributes of an ORM object returned as is."""
+    try:
+        state = inspect(result)
+    except NoInspectionAvailable:
+        return
+    if state.expired_attributes and state.persistent:
+        session.refresh(result, attribute_names=list(state.expired_attributes))
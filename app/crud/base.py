@@ -1,34 +1,121 @@
-from typing import Any, Dict, Generic, List, Optional, Type, TypeVar, Union
+import base64
+import binascii
+import json
+from datetime import datetime
+from typing import Any, Dict, Generic, List, NamedTuple, Optional, Tuple, Type, TypeVar, Union
 from fastapi.encoders import jsonable_encoder
 from pydantic import BaseModel
-from sqlalchemy.orm import Session
+from sqlalchemy import tuple_
+from sqlalchemy.orm import Query, Session
 from app.db.base_class import Base
+from app.db.unit_of_work import save
 
 ModelType = TypeVar("ModelType", bound=Base)
 CreateSchemaType = TypeVar("CreateSchemaType", bound=BaseModel)
 UpdateSchemaType = TypeVar("UpdateSchemaType", bound=BaseModel)
 
+class Cursor(NamedTuple):
+    """Position of the last row of a page in (created_at, id) order."""
+    created_at: datetime
+    id: int
+
+def encode_cursor(created_at: datetime, id: int) -> str:
+    payload = json.dumps([created_at.isoformat(), id]).encode()
+    return base64.urlsafe_b64encode(payload).decode().rstrip("=")
+
+def decode_cursor(cursor: str) -> Cursor:
+    """
+    Parse an opaque cursor produced by encode_cursor. Raises ValueError
+    when the cursor is malformed.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, id = json.loads(base64.urlsafe_b64decode(padded))
+        return Cursor(datetime.fromisoformat(created_at), int(id))
+    except (binascii.Error, TypeError, ValueError) as e:
+        raise ValueError("Invalid cursor") from e
+
+def keyset(query: Any, model: Type[Base], *, cursor: Optional[Cursor], descending: bool) -> Any:
+    """
+    Filter a Query or select() over model to the rows after cursor and order
+    it by (created_at, id), for keyset pagination.
+    """
+    key = tuple_(model.created_at, model.id)
+    if cursor is not None:
+        if descending:
+            query = query.filter(key < tuple_(cursor.created_at, cursor.id))
+        else:
+            query = query.filter(key > tuple_(cursor.created_at, cursor.id))
+    if descending:
+        return query.order_by(model.created_at.desc(), model.id.desc())
+    return query.order_by(model.created_at.asc(), model.id.asc())
+
 class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
+    # Named loader-option presets, one per response shape. Relationships
+    # raise on lazy load (see app.db.base_class.LAZY_LOAD), so every
+    # relationship a response reads must be loaded by its preset.
+    loaders: Dict[str, Tuple[Any, ...]] = {}
+
     def __init__(self, model: Type[ModelType]):
         """
         CRUD object with default methods to Create, Read, Update, Delete (CRUD).
         """
         self.model = model
 
-    def get(self, db: Session, id: Any) -> Optional[ModelType]:
-        return db.query(self.model).filter(self.model.id == id).first()
+    def query(self, db: Session, *, load: Optional[str] = None) -> Query:
+        """
+        Query over self.model with the loader preset named by load.
+        Raises KeyError for an unknown preset.
+        """
+        query = db.query(self.model)
+        if load is not None:
+            query = query.options(*self.loaders[load])
+        return query
+
+    def get(self, db: Session, id: Any, *, load: Optional[str] = None) -> Optional[ModelType]:
+        return self.query(db, load=load).filter(self.model.id == id).first()
 
     def get_multi(
-        self, db: Session, *, skip: int = 0, limit: int = 100
+        self, db: Session, *, skip: int = 0, limit: int = 100, load: Optional[str] = None
     ) -> List[ModelType]:
-        return db.query(self.model).offset(skip).limit(limit).all()
+        return self.query(db, load=load).offset(skip).limit(limit).all()
+
+    def paginate(
+        self,
+        query: Query,
+        *,
+        cursor: Optional[Cursor] = None,
+        limit: int = 100,
+        descending: bool = True
+    ) -> Tuple[List[Any], Optional[str]]:
+        """
+        Keyset-paginate a query over self.model by (created_at, id).
+
+        Returns the page rows and the cursor of the next page, or None when
+        this is the last page. Rows may be model instances, tuples whose
+        first element is the model instance, or column rows that include
+        the model's created_at and id.
+        """
+        query = keyset(query, self.model, cursor=cursor, descending=descending)
+        rows = query.limit(limit + 1).all()
+        if len(rows) <= limit:
+            return rows, None
+        rows = rows[:limit]
+        last = rows[-1]
+        if not isinstance(last, self.model) and isinstance(last[0], self.model):
+            last = last[0]
+        return rows, encode_cursor(last.created_at, last.id)
+
+    def get_page(
+        self, db: Session, *, cursor: Optional[Cursor] = None, limit: int = 100
+    ) -> Tuple[List[ModelType], Optional[str]]:
+        return self.paginate(db.query(self.model), cursor=cursor, limit=limit)
 
     def create(self, db: Session, *, obj_in: CreateSchemaType) -> ModelType:
         obj_in_data = jsonable_encoder(obj_in)
         db_obj = self.model(**obj_in_data)
         db.add(db_obj)
-        db.commit()
-        db.refresh(db_obj)
+        save(db)
         return db_obj
 
     def update(
@@ -47,12 +134,11 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
             if field in update_data:
                 setattr(db_obj, field, update_data[field])
         db.add(db_obj)
-        db.commit()
-        db.refresh(db_obj)
+        save(db)
         return db_obj
 
     def remove(self, db: Session, *, id: int) -> ModelType:
         obj = db.query(self.model).get(id)
         db.delete(obj)
-        db.commit()
+        save(db)
         return obj 
\ No newline at end of file
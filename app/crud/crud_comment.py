@@ -1,7 +1,13 @@
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, Dict, List, Optional, Tuple, Union
 from sqlalchemy.orm import Session
-from app.crud.base import CRUDBase
+from app.core.response_cache import response_cache
+from app.crud.async_base import AsyncCRUD
+from app.crud.base import CRUDBase, Cursor
+from app.crud.rows import CommentRow, UserSummary
+from app.db.unit_of_work import save
 from app.models.comment import Comment
+from app.models.post import Post
+from app.models.user import User
 from app.schemas.comment import CommentCreate, CommentUpdate
 
 class CRUDComment(CRUDBase[Comment, CommentCreate, CommentUpdate]):
@@ -11,20 +17,82 @@ class CRUDComment(CRUDBase[Comment, CommentCreate, CommentUpdate]):
         obj_in_data = obj_in.dict()
         db_obj = self.model(**obj_in_data, author_id=owner_id, post_id=post_id)
         db.add(db_obj)
-        db.commit()
-        db.refresh(db_obj)
+        self._adjust_comments_count(db, post_id=post_id, delta=1)
+        # Cached post listings embed a comment preview
+        response_cache.invalidate_on_commit(db, "posts")
+        save(db)
         return db_obj
 
+    def update(
+        self, db: Session, *, db_obj: Comment, obj_in: Union[CommentUpdate, Dict[str, Any]]
+    ) -> Comment:
+        response_cache.invalidate_on_commit(db, "posts")
+        return super().update(db, db_obj=db_obj, obj_in=obj_in)
+
+    def remove(self, db: Session, *, id: int) -> Comment:
+        obj = db.query(self.model).get(id)
+        db.delete(obj)
+        self._adjust_comments_count(db, post_id=obj.post_id, delta=-1)
+        response_cache.invalidate_on_commit(db, "posts")
+        save(db)
+        return obj
+
+    def _adjust_comments_count(self, db: Session, *, post_id: int, delta: int) -> None:
+        # Commenting does not edit the post: keep updated_at as it is
+        db.query(Post).filter(Post.id == post_id).update(
+            {Post.comments_count: Post.comments_count + delta, Post.updated_at: Post.updated_at},
+            synchronize_session="evaluate"
+        )
+
     def get_by_post(
-        self, db: Session, *, post_id: int, skip: int = 0, limit: int = 100
-    ) -> List[Comment]:
-        return (
-            db.query(self.model)
-            .filter(Comment.post_id == post_id)
-            .offset(skip)
-            .limit(limit)
-            .all()
+        self, db: Session, *, post_id: int, cursor: Optional[Cursor] = None, limit: int = 100
+    ) -> Tuple[List[Comment], Optional[str]]:
+        # Threads read oldest first
+        return self.paginate(
+            db.query(self.model).filter(Comment.post_id == post_id),
+            cursor=cursor,
+            limit=limit,
+            descending=False,
+        )
+
+    def get_page_with_authors(
+        self, db: Session, *, post_id: int, cursor: Optional[Cursor] = None, limit: int = 100
+    ) -> Tuple[List[CommentRow], Optional[str]]:
+        """
+        One page of a thread, oldest first, with each comment's author read
+        in the same statement.
+        """
+        rows, next_cursor = self.paginate(
+            db.query(
+                Comment.id,
+                Comment.content,
+                Comment.author_id,
+                Comment.post_id,
+                Comment.created_at,
+                Comment.updated_at,
+                User.email.label("author_email"),
+                User.name.label("author_name"),
+                User.is_active.label("author_is_active"),
+            )
+            .select_from(Comment)
+            .outerjoin(User, User.id == Comment.author_id)
+            .filter(Comment.post_id == post_id),
+            cursor=cursor,
+            limit=limit,
+            descending=False,
         )
+        comments = []
+        for row in rows:
+            comment = CommentRow(**row._asdict())
+            if row.author_email is not None:
+                comment.author = UserSummary(
+                    id=row.author_id,
+                    email=row.author_email,
+                    name=row.author_name,
+                    is_active=row.author_is_active,
+                )
+            comments.append(comment)
+        return comments, next_cursor
 
     def get_by_author(
         self, db: Session, *, author_id: int, skip: int = 0, limit: int = 100
@@ -37,4 +105,5 @@ class CRUDComment(CRUDBase[Comment, CommentCreate, CommentUpdate]):
             .all()
         )
 
-comment = CRUDComment(Comment) 
\ No newline at end of file
+comment = CRUDComment(Comment)
+comment_async = AsyncCRUD(comment)
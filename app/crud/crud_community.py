@@ -1,39 +1,137 @@
-from typing import List, Optional, Dict, Any
-from sqlalchemy.orm import Session
-from sqlalchemy import func
+from typing import List, Optional, Dict, Any, Set, Tuple
+from sqlalchemy.orm import Session, joinedload
+from sqlalchemy import func, or_, select, tuple_, update
+from sqlalchemy.exc import IntegrityError
 from fastapi.encoders import jsonable_encoder
-from app.crud.base import CRUDBase
+from app.core.response_cache import response_cache
+from app.crud.async_base import AsyncCRUD
+from app.crud.base import CRUDBase, Cursor, encode_cursor
+from app.crud import search
+from app.crud.crud_timeline import timeline
+from app.crud.rows import CommunityRow, MemberRow, UserSummary
+from app.crud.search import SearchCursor
+from app.db.unit_of_work import save
+from app.models.comment import Comment
 from app.models.community import Community, community_members
+from app.models.like import Like
+from app.models.post import Post
 from app.models.user import User
 from app.schemas.community import CommunityCreate, CommunityUpdate
 from app.core.security import get_password_hash
 from slugify import slugify
 
+class SlugUnavailable(Exception):
+    """Concurrent creates kept taking every slug we tried."""
+
 class CRUDCommunity(CRUDBase[Community, CommunityCreate, CommunityUpdate]):
+    # Attempts before giving up when concurrent creates keep taking the slug
+    SLUG_RETRIES = 5
+
+    loaders = {
+        # schemas.Community and schemas.CommunityWithMembers, whose
+        # recent_members come from get_members
+        "community": (joinedload(Community.created_by),),
+    }
+
     def create_with_owner(
         self, db: Session, *, obj_in: CommunityCreate, owner_id: int
     ) -> Community:
+        """
+        Create a community with a unique slug and its owner as first member,
+        in one transaction.
+        """
         obj_in_data = jsonable_encoder(obj_in)
-        # Create slug from name
-        slug = slugify(obj_in_data["name"])
-        # Ensure unique slug
-        base_slug = slug
-        counter = 1
-        while db.query(Community).filter(Community.slug == slug).first():
-            slug = f"{base_slug}-{counter}"
-            counter += 1
-            
-        db_obj = Community(**obj_in_data, slug=slug, created_by_id=owner_id)
-        db.add(db_obj)
-        db.commit()
-        db.refresh(db_obj)
-        
-        # Add owner as member
-        self.add_member(db=db, community_id=db_obj.id, user_id=owner_id)
+        base_slug = slugify(obj_in_data["name"])
+        for _ in range(self.SLUG_RETRIES):
+            db_obj = Community(
+                **obj_in_data,
+                slug=self._next_free_slug(db, base_slug=base_slug),
+                created_by_id=owner_id,
+                members_count=1,
+            )
+            try:
+                # A concurrent create may take the slug between the lookup
+                # and the insert; the unique index catches it and we retry
+                # from a savepoint
+                with db.begin_nested():
+                    db.add(db_obj)
+                    db.flush()
+            except IntegrityError:
+                continue
+            break
+        else:
+            raise SlugUnavailable(f"Could not allocate a unique slug for {base_slug!r}")
+
+        db.execute(
+            community_members.insert().values(community_id=db_obj.id, user_id=owner_id)
+        )
+        save(db)
         return db_obj
 
-    def get_by_slug(self, db: Session, *, slug: str) -> Optional[Community]:
-        return db.query(Community).filter(Community.slug == slug).first()
+    def _next_free_slug(self, db: Session, *, base_slug: str) -> str:
+        """
+        Return base_slug, or base_slug-N with N one past the highest suffix
+        in use, from a single prefix query.
+        """
+        taken = db.query(Community.slug).filter(
+            or_(
+                Community.slug == base_slug,
+                Community.slug.startswith(f"{base_slug}-", autoescape=True),
+            )
+        ).all()
+        if (base_slug,) not in taken:
+            return base_slug
+        suffixes = [0]
+        for (slug,) in taken:
+            suffix = slug[len(base_slug) + 1:]
+            if suffix.isdigit():
+                suffixes.append(int(suffix))
+        return f"{base_slug}-{max(suffixes) + 1}"
+
+    def _select_rows(self, db: Session):
+        """
+        Query selecting only the community and creator columns the list
+        schemas read.
+        """
+        return (
+            db.query(
+                Community.id,
+                Community.name,
+                Community.slug,
+                Community.description,
+                Community.is_private,
+                Community.created_at,
+                Community.created_by_id,
+                Community.members_count,
+                User.email.label("created_by_email"),
+                User.name.label("created_by_name"),
+            )
+            .select_from(Community)
+            .outerjoin(User, User.id == Community.created_by_id)
+        )
+
+    @staticmethod
+    def _to_rows(rows: List[Any]) -> List[CommunityRow]:
+        communities = []
+        for row in rows:
+            community = CommunityRow(**row._asdict(), is_member=False, is_admin=False)
+            if row.created_by_email is not None:
+                community.created_by = UserSummary(
+                    id=row.created_by_id, email=row.created_by_email, name=row.created_by_name
+                )
+            communities.append(community)
+        return communities
+
+    def get_page(
+        self, db: Session, *, cursor: Optional[Cursor] = None, limit: int = 100
+    ) -> Tuple[List[CommunityRow], Optional[str]]:
+        rows, next_cursor = self.paginate(self._select_rows(db), cursor=cursor, limit=limit)
+        return self._to_rows(rows), next_cursor
+
+    def get_by_slug(
+        self, db: Session, *, slug: str, load: Optional[str] = None
+    ) -> Optional[Community]:
+        return self.query(db, load=load).filter(Community.slug == slug).first()
 
     def get_multi_by_owner(
         self, db: Session, *, owner_id: int, skip: int = 0, limit: int = 100
@@ -60,11 +158,14 @@ class CRUDCommunity(CRUDBase[Community, CommunityCreate, CommunityUpdate]):
         ).first()
         
         if not is_member:
-            user = db.query(User).filter(User.id == user_id).first()
+            user = db.query(User.id).filter(User.id == user_id).first()
             if user:
-                community.members.append(user)
-                db.commit()
-                db.refresh(community)
+                db.execute(
+                    community_members.insert().values(community_id=community_id, user_id=user_id)
+                )
+                self._adjust_members_count(db, community_id=community_id, delta=1)
+                timeline.backfill(db, user_id=user_id, community_id=community_id)
+                save(db)
         
         return community
 
@@ -75,20 +176,75 @@ class CRUDCommunity(CRUDBase[Community, CommunityCreate, CommunityUpdate]):
         if not community:
             return None
         
-        user = db.query(User).filter(User.id == user_id).first()
-        if user and user in community.members:
-            community.members.remove(user)
-            db.commit()
-            db.refresh(community)
+        if self.is_member(db, community_id=community_id, user_id=user_id):
+            db.execute(
+                community_members.delete().where(
+                    community_members.c.community_id == community_id,
+                    community_members.c.user_id == user_id
+                )
+            )
+            self._adjust_members_count(db, community_id=community_id, delta=-1)
+            timeline.remove_community(db, user_id=user_id, community_id=community_id)
+            if community.members_count == timeline.max_fanout_members:
+                # Reads stop merging the community in from now on
+                timeline.backfill_community(db, community_id=community_id)
+            save(db)
         
         return community
 
+    def remove(self, db: Session, *, id: int) -> Community:
+        """
+        Delete a community with its posts, their comments, likes and
+        timeline entries, and its memberships, in bulk rather than by
+        loading each collection to cascade.
+        """
+        post_ids = select(Post.id).where(Post.community_id == id)
+        timeline.remove_community_posts(db, community_id=id)
+        db.query(Comment).filter(Comment.post_id.in_(post_ids)).delete(synchronize_session=False)
+        db.query(Like).filter(Like.post_id.in_(post_ids)).delete(synchronize_session=False)
+        db.query(Post).filter(Post.community_id == id).delete(synchronize_session=False)
+        db.execute(community_members.delete().where(community_members.c.community_id == id))
+        response_cache.invalidate_on_commit(db, "posts")
+        return super().remove(db, id=id)
+
+    def _adjust_members_count(
+        self, db: Session, *, community_id: int, delta: int
+    ) -> None:
+        db.query(Community).filter(Community.id == community_id).update(
+            {Community.members_count: Community.members_count + delta},
+            synchronize_session="evaluate"
+        )
+
+    def get_members(
+        self, db: Session, *, community_id: int, cursor: Optional[Cursor] = None, limit: int = 100
+    ) -> Tuple[List[MemberRow], Optional[str]]:
+        """
+        Members of a community, most recently joined first, keyset-paginated
+        by (joined_at, user id) over the community_members index.
+        """
+        joined_at = community_members.c.created_at
+        user_id = community_members.c.user_id
+        query = (
+            db.query(User.id, User.email, User.name, joined_at.label("joined_at"))
+            .join(community_members, user_id == User.id)
+            .filter(community_members.c.community_id == community_id)
+        )
+        if cursor is not None:
+            query = query.filter(tuple_(joined_at, user_id) < tuple_(cursor.created_at, cursor.id))
+        rows = query.order_by(joined_at.desc(), user_id.desc()).limit(limit + 1).all()
+
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = encode_cursor(rows[-1].joined_at, rows[-1].id)
+        return [MemberRow(**row._asdict()) for row in rows], next_cursor
+
     def get_member_count(
         self, db: Session, *, community_id: int
     ) -> int:
-        return db.query(func.count(community_members.c.user_id))\
-            .filter(community_members.c.community_id == community_id)\
-            .scalar()
+        return db.query(Community.members_count)\
+            .filter(Community.id == community_id)\
+            .scalar() or 0
 
     def is_member(
         self, db: Session, *, community_id: int, user_id: int
@@ -99,27 +255,80 @@ class CRUDCommunity(CRUDBase[Community, CommunityCreate, CommunityUpdate]):
                 community_members.c.user_id == user_id
             ).first() is not None
 
-    def get_user_communities(
-        self, db: Session, *, user_id: int, skip: int = 0, limit: int = 100
-    ) -> List[Community]:
-        return (
-            db.query(Community)
-            .join(community_members)
-            .filter(community_members.c.user_id == user_id)
-            .offset(skip)
-            .limit(limit)
+    def get_memberships(
+        self, db: Session, *, community_ids: List[int], user_id: int
+    ) -> Set[int]:
+        """
+        Ids of the communities in community_ids that the user belongs to,
+        resolved with one query over community_members.
+        """
+        if not community_ids:
+            return set()
+        rows = (
+            db.query(community_members.c.community_id)
+            .filter(
+                community_members.c.community_id.in_(community_ids),
+                community_members.c.user_id == user_id
+            )
             .all()
         )
+        return {community_id for community_id, in rows}
 
-    def search_communities(
-        self, db: Session, *, query: str, skip: int = 0, limit: int = 100
+    def annotate_memberships(
+        self, db: Session, *, communities: List[Community], user_id: int
     ) -> List[Community]:
-        return (
-            db.query(Community)
-            .filter(Community.name.ilike(f"%{query}%"))
-            .offset(skip)
-            .limit(limit)
-            .all()
+        """
+        Set is_member and is_admin on each community for the given user.
+        """
+        memberships = self.get_memberships(
+            db, community_ids=[c.id for c in communities], user_id=user_id
+        )
+        for community in communities:
+            community.is_member = community.id in memberships
+            community.is_admin = community.created_by_id == user_id
+        return communities
+
+    def reconcile_members_count(self, db: Session) -> int:
+        """
+        Recompute members_count from community_members. Returns the number
+        of communities whose counter had drifted.
+        """
+        members_count = (
+            select(func.count(community_members.c.user_id))
+            .where(community_members.c.community_id == Community.id)
+            .scalar_subquery()
+        )
+        result = db.execute(
+            update(Community)
+            .where(Community.members_count != members_count)
+            .values(members_count=members_count)
+            .execution_options(synchronize_session=False)
+        )
+        db.commit()
+        return result.rowcount
+
+    def get_user_communities(
+        self, db: Session, *, user_id: int, cursor: Optional[Cursor] = None, limit: int = 100
+    ) -> Tuple[List[CommunityRow], Optional[str]]:
+        rows, next_cursor = self.paginate(
+            self._select_rows(db)
+            .join(community_members, community_members.c.community_id == Community.id)
+            .filter(community_members.c.user_id == user_id),
+            cursor=cursor,
+            limit=limit,
+        )
+        return self._to_rows(rows), next_cursor
+
+    def search_communities(
+        self, db: Session, *, query: str, cursor: Optional[SearchCursor] = None, limit: int = 100
+    ) -> Tuple[List[CommunityRow], Optional[str]]:
+        """
+        Full-text search over name and description, most relevant first.
+        """
+        rows, next_cursor = search.ranked(
+            db, self._select_rows(db), model=Community, text=query, cursor=cursor, limit=limit
         )
+        return self._to_rows(rows), next_cursor
 
 community = CRUDCommunity(Community)
+community_async = AsyncCRUD(community)
@@ -1,20 +1,126 @@
 from typing import Any, Dict, List, Optional, Union
+from sqlalchemy import delete, exists, func, insert, literal, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.orm import Session
+from app.core.response_cache import response_cache
+from app.crud.async_base import AsyncCRUD
 from app.crud.base import CRUDBase
+from app.crud.like_buffer import like_buffer
+from app.db.unit_of_work import save
 from app.models.like import Like
+from app.models.post import Post
 from app.schemas.like import LikeCreate, LikeUpdate
 
 class CRUDLike(CRUDBase[Like, LikeCreate, LikeUpdate]):
     def create_with_owner(
-        self, db: Session, *, obj_in: LikeCreate, owner_id: int, post_id: int
+        self, db: Session, *, obj_in: Optional[LikeCreate] = None, owner_id: int, post_id: int
     ) -> Like:
-        obj_in_data = obj_in.dict()
+        obj_in_data = obj_in.dict() if obj_in else {}
         db_obj = self.model(**obj_in_data, user_id=owner_id, post_id=post_id)
         db.add(db_obj)
-        db.commit()
-        db.refresh(db_obj)
+        self._adjust_likes_count(db, post_id=post_id, delta=1)
+        save(db)
         return db_obj
 
+    def remove(self, db: Session, *, id: int) -> Like:
+        obj = db.query(self.model).get(id)
+        db.delete(obj)
+        self._adjust_likes_count(db, post_id=obj.post_id, delta=-1)
+        save(db)
+        return obj
+
+    def _adjust_likes_count(self, db: Session, *, post_id: int, delta: int) -> None:
+        # Increment in SQL so concurrent likes on one post don't lose updates;
+        # "evaluate" applies the same delta to a Post already in the session.
+        # A like is not an edit: keep updated_at as it is.
+        db.query(Post).filter(Post.id == post_id).update(
+            {Post.likes_count: Post.likes_count + delta, Post.updated_at: Post.updated_at},
+            synchronize_session="evaluate"
+        )
+        # Cached post listings embed likes_count
+        response_cache.invalidate_on_commit(db, "posts")
+
+    def like_post(self, db: Session, *, user_id: int, post_id: int) -> Optional[int]:
+        """
+        Idempotently like a post. Returns the post's new likes_count, or None
+        if the post does not exist. Liking twice leaves the count unchanged.
+        """
+        if like_buffer.enabled:
+            return like_buffer.like(db, user_id=user_id, post_id=post_id)
+        new_like = select(literal(user_id), Post.id).where(Post.id == post_id)
+        if db.get_bind().dialect.name == "postgresql":
+            # One statement: the insert runs in a CTE and the counter update
+            # adds the number of rows it actually inserted
+            inserted = (
+                pg_insert(Like)
+                .from_select(["user_id", "post_id"], new_like)
+                .on_conflict_do_nothing(index_elements=["user_id", "post_id"])
+                .returning(Like.post_id)
+                .cte("inserted")
+            )
+            return self._update_likes_count(
+                db, post_id=post_id, likes_count=Post.likes_count + self._count(inserted)
+            )
+
+        inserted = db.execute(
+            insert(Like).from_select(
+                ["user_id", "post_id"],
+                new_like.where(~exists().where(Like.user_id == user_id, Like.post_id == post_id)),
+            )
+        ).rowcount
+        return self._update_likes_count(
+            db, post_id=post_id, likes_count=Post.likes_count + inserted, returning=False
+        )
+
+    def unlike_post(self, db: Session, *, user_id: int, post_id: int) -> Optional[int]:
+        """
+        Idempotently remove a like. Returns the post's new likes_count, or
+        None if the post does not exist.
+        """
+        if like_buffer.enabled:
+            return like_buffer.unlike(db, user_id=user_id, post_id=post_id)
+        removed = delete(Like).where(Like.user_id == user_id, Like.post_id == post_id)
+        if db.get_bind().dialect.name == "postgresql":
+            deleted = removed.returning(Like.post_id).cte("deleted")
+            return self._update_likes_count(
+                db, post_id=post_id, likes_count=Post.likes_count - self._count(deleted)
+            )
+
+        deleted = db.execute(removed).rowcount
+        return self._update_likes_count(
+            db, post_id=post_id, likes_count=Post.likes_count - deleted, returning=False
+        )
+
+    @staticmethod
+    def _count(cte):
+        return select(func.count()).select_from(cte).scalar_subquery()
+
+    def _update_likes_count(
+        self, db: Session, *, post_id: int, likes_count, returning: bool = True
+    ) -> Optional[int]:
+        """
+        Set likes_count and return the new value, with UPDATE ... RETURNING
+        where available (Postgres) and a follow-up SELECT elsewhere.
+        """
+        statement = (
+            update(Post)
+            .where(Post.id == post_id)
+            # A like is not an edit: keep updated_at as it is
+            .values(likes_count=likes_count, updated_at=Post.updated_at)
+            .execution_options(synchronize_session=False)
+        )
+        # Cached post listings embed likes_count
+        response_cache.invalidate_on_commit(db, "posts")
+        if returning:
+            new_count = db.execute(statement.returning(Post.likes_count)).scalar()
+        else:
+            db.execute(statement)
+            new_count = db.execute(
+                select(Post.likes_count).where(Post.id == post_id)
+            ).scalar()
+        save(db)
+        return new_count
+
     def get_by_user_and_post(
         self, db: Session, *, user_id: int, post_id: int
     ) -> Optional[Like]:
@@ -46,4 +152,5 @@ class CRUDLike(CRUDBase[Like, LikeCreate, LikeUpdate]):
             .all()
         )
 
-like = CRUDLike(Like) 
\ No newline at end of file
+like = CRUDLike(Like)
+like_async = AsyncCRUD(like)
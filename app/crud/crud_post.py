@@ -1,43 +1,85 @@
-from typing import Any, Dict, List, Optional, Union
-from sqlalchemy.orm import Session, joinedload
-from app.crud.base import CRUDBase
+from typing import Any, Dict, List, Optional, Tuple, Type, Union
+from sqlalchemy import exists, false, func, or_, select, update
+from sqlalchemy.orm import Session, joinedload, selectinload
+from app.core.config import settings
+from app.core.response_cache import response_cache
+from app.crud.async_base import AsyncCRUD
+from app.crud.base import CRUDBase, Cursor
+from app.crud import search
+from app.crud.crud_timeline import timeline
+from app.crud.like_buffer import like_buffer
+from app.crud.rows import CommentRow, CommunitySummary, PostRow, UserSummary
+from app.crud.search import SearchCursor
+from app.db.unit_of_work import save
+from app.models.comment import Comment
+from app.models.community import Community
+from app.models.like import Like
 from app.models.post import Post
+from app.models.user import User
 from app.schemas.post import PostCreate, PostUpdate
 
 class CRUDPost(CRUDBase[Post, PostCreate, PostUpdate]):
+    loaders = {
+        # schemas.Post
+        "post": (joinedload(Post.author), joinedload(Post.community)),
+        # schemas.PostWithComments; comments come from a second SELECT so
+        # they don't multiply the post rows
+        "post_with_comments": (
+            joinedload(Post.author),
+            joinedload(Post.community),
+            selectinload(Post.comments),
+        ),
+    }
+
+    def __init__(self, model: Type[Post], *, comment_preview: int):
+        super().__init__(model)
+        # Latest comments embedded per post in list responses
+        self.comment_preview = comment_preview
+
     def create_with_owner(
         self, db: Session, *, obj_in: PostCreate, owner_id: int
     ) -> Post:
         obj_in_data = obj_in.dict()
         db_obj = self.model(**obj_in_data, author_id=owner_id)
         db.add(db_obj)
-        db.commit()
-        db.refresh(db_obj)
+        db.flush()
+        if db_obj.community_id is not None:
+            timeline.fan_out(db, post_id=db_obj.id)
+        response_cache.invalidate_on_commit(db, "posts")
+        save(db)
         return db_obj
 
+    def update(
+        self, db: Session, *, db_obj: Post, obj_in: Union[PostUpdate, Dict[str, Any]]
+    ) -> Post:
+        response_cache.invalidate_on_commit(db, "posts")
+        return super().update(db, db_obj=db_obj, obj_in=obj_in)
+
+    def remove(self, db: Session, *, id: int) -> Post:
+        # Post.comments and Post.likes are passive; delete them in bulk
+        # instead of loading them to cascade
+        timeline.remove_post(db, post_id=id)
+        db.query(Comment).filter(Comment.post_id == id).delete(synchronize_session=False)
+        db.query(Like).filter(Like.post_id == id).delete(synchronize_session=False)
+        response_cache.invalidate_on_commit(db, "posts")
+        return super().remove(db, id=id)
+
     def get_announcements(
-        self, db: Session, *, skip: int = 0, limit: int = 100
-    ) -> List[Post]:
-        return (
-            db.query(self.model)
-            .filter(Post.is_announcement == True)
-            .offset(skip)
-            .limit(limit)
-            .all()
+        self, db: Session, *, cursor: Optional[Cursor] = None, limit: int = 100
+    ) -> Tuple[List[PostRow], Optional[str]]:
+        rows, next_cursor = self.paginate(
+            self._select_rows(db, user_id=None).filter(Post.is_announcement == True),
+            cursor=cursor,
+            limit=limit,
         )
+        return self._to_rows(db, rows, user_id=None, with_comments=False), next_cursor
 
     def get_by_author(
         self, db: Session, *, author_id: int, skip: int = 0, limit: int = 100
     ) -> List[Post]:
         return (
-            db.query(self.model)
+            self.query(db, load="post_with_comments")
             .filter(Post.author_id == author_id)
-            .options(
-                joinedload(Post.community),
-                joinedload(Post.author),
-                joinedload(Post.likes),
-                joinedload(Post.comments)
-            )
             .offset(skip)
             .limit(limit)
             .all()
@@ -47,11 +89,211 @@ class CRUDPost(CRUDBase[Post, PostCreate, PostUpdate]):
         self, db: Session, *, community_id: int, skip: int = 0, limit: int = 100
     ) -> List[Post]:
         return (
-            db.query(self.model)
+            self.query(db, load="post")
             .filter(Post.community_id == community_id)
             .offset(skip)
             .limit(limit)
             .all()
         )
 
-post = CRUDPost(Post) 
\ No newline at end of file
+    def _select_rows(self, db: Session, *, user_id: Optional[int]):
+        """
+        Query selecting only the post, author and community columns the
+        list schemas read, with is_liked resolved in the same statement.
+        Counts come from the counter columns.
+        """
+        if user_id is not None:
+            is_liked = exists().where(Like.post_id == Post.id, Like.user_id == user_id)
+        else:
+            is_liked = false()
+        return (
+            db.query(
+                Post.id,
+                Post.title,
+                Post.content,
+                Post.is_announcement,
+                Post.author_id,
+                Post.community_id,
+                Post.created_at,
+                Post.updated_at,
+                Post.likes_count,
+                Post.comments_count,
+                User.email.label("author_email"),
+                User.name.label("author_name"),
+                User.is_active.label("author_is_active"),
+                Community.name.label("community_name"),
+                Community.slug.label("community_slug"),
+                is_liked.label("is_liked"),
+            )
+            .select_from(Post)
+            .outerjoin(User, User.id == Post.author_id)
+            .outerjoin(Community, Community.id == Post.community_id)
+        )
+
+    def _to_rows(
+        self, db: Session, rows: List[Any], *, user_id: Optional[int], with_comments: bool = True
+    ) -> List[PostRow]:
+        posts = []
+        for row in rows:
+            post = PostRow(**row._asdict())
+            post.is_liked = bool(row.is_liked)
+            if row.author_email is not None:
+                post.author = UserSummary(
+                    id=row.author_id,
+                    email=row.author_email,
+                    name=row.author_name,
+                    is_active=row.author_is_active,
+                )
+            if row.community_slug is not None:
+                post.community = CommunitySummary(
+                    id=row.community_id, name=row.community_name, slug=row.community_slug
+                )
+            posts.append(post)
+        if with_comments:
+            self._attach_comments(db, posts)
+        # Likes still in the write-behind buffer
+        like_buffer.overlay(posts, user_id=user_id)
+        return posts
+
+    def _attach_comments(self, db: Session, posts: List[PostRow]) -> None:
+        """
+        Attach the latest comment_preview comments of each post on a page,
+        oldest first, from one ROW_NUMBER() query. Full threads are paged
+        through CRUDComment.get_page_with_authors; comments_count gives the total.
+        """
+        by_id = {}
+        for post in posts:
+            post.comments = []
+            by_id[post.id] = post
+        if not by_id or self.comment_preview <= 0:
+            return
+        position = func.row_number().over(
+            partition_by=Comment.post_id,
+            order_by=(Comment.created_at.desc(), Comment.id.desc()),
+        )
+        numbered = (
+            select(
+                Comment.id,
+                Comment.content,
+                Comment.author_id,
+                Comment.post_id,
+                Comment.created_at,
+                Comment.updated_at,
+                position.label("position"),
+            )
+            .where(Comment.post_id.in_(by_id))
+            .subquery()
+        )
+        rows = db.execute(
+            select(
+                numbered.c.id,
+                numbered.c.content,
+                numbered.c.author_id,
+                numbered.c.post_id,
+                numbered.c.created_at,
+                numbered.c.updated_at,
+            )
+            .where(numbered.c.position <= self.comment_preview)
+            .order_by(numbered.c.post_id, numbered.c.created_at, numbered.c.id)
+        )
+        for row in rows:
+            by_id[row.post_id].comments.append(CommentRow(**row._asdict()))
+
+    def get_detail(
+        self, db: Session, *, id: int, user_id: Optional[int] = None
+    ) -> Optional[PostRow]:
+        """
+        One post with its author, community, counters and is_liked from a
+        single statement. Comments are left to the caller, which pages them
+        with CRUDComment.get_page_with_authors.
+        """
+        row = self._select_rows(db, user_id=user_id).filter(Post.id == id).first()
+        if row is None:
+            return None
+        return self._to_rows(db, [row], user_id=user_id, with_comments=False)[0]
+
+    def get_feed(
+        self,
+        db: Session,
+        *,
+        user_id: Optional[int] = None,
+        community_id: Optional[int] = None,
+        author_id: Optional[int] = None,
+        cursor: Optional[Cursor] = None,
+        limit: int = 100
+    ) -> Tuple[List[PostRow], Optional[str]]:
+        query = self._select_rows(db, user_id=user_id)
+        if community_id is not None:
+            query = query.filter(Post.community_id == community_id)
+        if author_id is not None:
+            query = query.filter(Post.author_id == author_id)
+        rows, next_cursor = self.paginate(query, cursor=cursor, limit=limit)
+        return self._to_rows(db, rows, user_id=user_id), next_cursor
+
+    def get_home_feed(
+        self, db: Session, *, user_id: int, cursor: Optional[Cursor] = None, limit: int = 100
+    ) -> Tuple[List[PostRow], Optional[str]]:
+        """
+        Posts from the communities the user belongs to, newest first. Page
+        membership comes from the materialized timeline; the posts are then
+        loaded by primary key.
+        """
+        post_ids, next_cursor = timeline.get_page(
+            db, user_id=user_id, cursor=cursor, limit=limit
+        )
+        if not post_ids:
+            return [], next_cursor
+        rows = self._select_rows(db, user_id=user_id).filter(Post.id.in_(post_ids)).all()
+        position = {post_id: i for i, post_id in enumerate(post_ids)}
+        rows.sort(key=lambda row: position[row.id])
+        return self._to_rows(db, rows, user_id=user_id), next_cursor
+
+    def search(
+        self,
+        db: Session,
+        *,
+        query: str,
+        user_id: Optional[int] = None,
+        cursor: Optional[SearchCursor] = None,
+        limit: int = 100
+    ) -> Tuple[List[PostRow], Optional[str]]:
+        """
+        Full-text search over title and content, most relevant first.
+        """
+        rows, next_cursor = search.ranked(
+            db,
+            self._select_rows(db, user_id=user_id),
+            model=Post,
+            text=query,
+            cursor=cursor,
+            limit=limit,
+        )
+        return self._to_rows(db, rows, user_id=user_id), next_cursor
+
+    def reconcile_counters(self, db: Session) -> int:
+        """
+        Recompute likes_count and comments_count from the likes and comments
+        tables. Returns the number of posts whose counters had drifted.
+        """
+        likes_count = (
+            select(func.count(Like.id))
+            .where(Like.post_id == Post.id)
+            .scalar_subquery()
+        )
+        comments_count = (
+            select(func.count(Comment.id))
+            .where(Comment.post_id == Post.id)
+            .scalar_subquery()
+        )
+        result = db.execute(
+            update(Post)
+            .where(or_(Post.likes_count != likes_count, Post.comments_count != comments_count))
+            # Counter repairs are not edits: keep updated_at as it is
+            .values(likes_count=likes_count, comments_count=comments_count, updated_at=Post.updated_at)
+            .execution_options(synchronize_session=False)
+        )
+        db.commit()
+        return result.rowcount
+
+post = CRUDPost(Post, comment_preview=settings.FEED_COMMENT_PREVIEW)
+post_async = AsyncCRUD(post)
@@ -0,0 +1,187 @@
+from typing import List, Optional, Tuple
+from sqlalchemy import insert, literal, select, tuple_
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.crud.base import Cursor, encode_cursor
+from app.models.community import Community, community_members
+from app.models.post import Post
+from app.models.timeline import TimelineEntry
+
+class CRUDTimeline:
+    """
+    Per-user home timeline. Posts in communities with at most
+    TIMELINE_FANOUT_MAX_MEMBERS members are copied into every member's
+    timeline when created (fan-out on write). Posts in larger communities
+    are read from the posts table at request time (fan-out on read) and
+    merged in. When a community shrinks back to the threshold its members
+    get its recent posts backfilled, since reads stop merging it.
+    """
+
+    def __init__(self, max_fanout_members: int, backfill_posts: int):
+        self.max_fanout_members = max_fanout_members
+        self.backfill_posts = backfill_posts
+
+    def fan_out(self, db: Session, *, post_id: int) -> None:
+        """
+        Copy a post into its community members' timelines with a single
+        INSERT ... SELECT. Does nothing for posts outside a community or in
+        communities above the fan-out threshold. Does not commit.
+        """
+        entries = (
+            select(
+                community_members.c.user_id,
+                Post.id,
+                Post.community_id,
+                Post.created_at,
+            )
+            .join(community_members, community_members.c.community_id == Post.community_id)
+            .join(Community, Community.id == Post.community_id)
+            .where(
+                Post.id == post_id,
+                Community.members_count <= self.max_fanout_members,
+            )
+        )
+        db.execute(
+            insert(TimelineEntry).from_select(
+                ["user_id", "post_id", "community_id", "created_at"], entries
+            )
+        )
+
+    def backfill(self, db: Session, *, user_id: int, community_id: int) -> None:
+        """
+        Copy a community's most recent posts into a new member's timeline.
+        Does not commit.
+        """
+        recent = (
+            select(literal(user_id), Post.id, Post.community_id, Post.created_at)
+            .join(Community, Community.id == Post.community_id)
+            .where(
+                Post.community_id == community_id,
+                Community.members_count <= self.max_fanout_members,
+                ~select(TimelineEntry.post_id)
+                .where(TimelineEntry.user_id == user_id, TimelineEntry.post_id == Post.id)
+                .exists(),
+            )
+            .order_by(Post.created_at.desc(), Post.id.desc())
+            .limit(self.backfill_posts)
+        )
+        db.execute(
+            insert(TimelineEntry).from_select(
+                ["user_id", "post_id", "community_id", "created_at"], recent
+            )
+        )
+
+    def backfill_community(self, db: Session, *, community_id: int) -> None:
+        """
+        Copy a community's most recent posts into every member's timeline
+        with a single INSERT ... SELECT, for a community that has just
+        shrunk to the fan-out threshold. Does not commit.
+        """
+        recent = (
+            select(Post.id, Post.community_id, Post.created_at)
+            .where(Post.community_id == community_id)
+            .order_by(Post.created_at.desc(), Post.id.desc())
+            .limit(self.backfill_posts)
+            .subquery()
+        )
+        entries = (
+            select(community_members.c.user_id, recent.c.id, recent.c.community_id, recent.c.created_at)
+            .join(recent, recent.c.community_id == community_members.c.community_id)
+            .where(
+                ~select(TimelineEntry.post_id)
+                .where(
+                    TimelineEntry.user_id == community_members.c.user_id,
+                    TimelineEntry.post_id == recent.c.id,
+                )
+                .exists(),
+            )
+        )
+        db.execute(
+            insert(TimelineEntry).from_select(
+                ["user_id", "post_id", "community_id", "created_at"], entries
+            )
+        )
+
+    def remove_community(self, db: Session, *, user_id: int, community_id: int) -> None:
+        """Drop a community's posts from a user's timeline. Does not commit."""
+        db.query(TimelineEntry).filter(
+            TimelineEntry.user_id == user_id,
+            TimelineEntry.community_id == community_id,
+        ).delete(synchronize_session=False)
+
+    def remove_community_posts(self, db: Session, *, community_id: int) -> None:
+        """Drop a community's posts from every timeline. Does not commit."""
+        db.query(TimelineEntry).filter(
+            TimelineEntry.community_id == community_id
+        ).delete(synchronize_session=False)
+
+    def remove_post(self, db: Session, *, post_id: int) -> None:
+        """Drop a post from every timeline. Does not commit."""
+        db.query(TimelineEntry).filter(
+            TimelineEntry.post_id == post_id
+        ).delete(synchronize_session=False)
+
+    def get_page(
+        self, db: Session, *, user_id: int, cursor: Optional[Cursor] = None, limit: int = 100
+    ) -> Tuple[List[int], Optional[str]]:
+        """
+        Post ids of one page of the user's home timeline, newest first,
+        and the cursor of the next page.
+
+        Materialized entries come from one range scan over
+        (user_id, created_at, post_id). Posts from the user's communities
+        above the fan-out threshold are read from the posts table and
+        merged in (created_at, id) order.
+        """
+        materialized = (
+            db.query(TimelineEntry.created_at, TimelineEntry.post_id)
+            .filter(TimelineEntry.user_id == user_id)
+        )
+        if cursor is not None:
+            materialized = materialized.filter(
+                tuple_(TimelineEntry.created_at, TimelineEntry.post_id)
+                < tuple_(cursor.created_at, cursor.id)
+            )
+        rows = set(
+            materialized
+            .order_by(TimelineEntry.created_at.desc(), TimelineEntry.post_id.desc())
+            .limit(limit + 1)
+            .all()
+        )
+
+        large_communities = (
+            select(community_members.c.community_id)
+            .join(Community, Community.id == community_members.c.community_id)
+            .where(
+                community_members.c.user_id == user_id,
+                Community.members_count > self.max_fanout_members,
+            )
+        )
+        unmaterialized = (
+            db.query(Post.created_at, Post.id)
+            .filter(Post.community_id.in_(large_communities))
+        )
+        if cursor is not None:
+            unmaterialized = unmaterialized.filter(
+                tuple_(Post.created_at, Post.id) < tuple_(cursor.created_at, cursor.id)
+            )
+        rows.update(
+            unmaterialized
+            .order_by(Post.created_at.desc(), Post.id.desc())
+            .limit(limit + 1)
+            .all()
+        )
+
+        # Entries are copies of posts.created_at, so a post that is both
+        # materialized and read on demand collapses to one tuple here.
+        page = sorted(((created_at, post_id) for created_at, post_id in rows), reverse=True)
+        next_cursor = None
+        if len(page) > limit:
+            page = page[:limit]
+            next_cursor = encode_cursor(*page[-1])
+        return [post_id for _, post_id in page], next_cursor
+
+timeline = CRUDTimeline(
+    max_fanout_members=settings.TIMELINE_FANOUT_MAX_MEMBERS,
+    backfill_posts=settings.TIMELINE_BACKFILL_POSTS,
+)
@@ -1,11 +1,70 @@
 from typing import Any, Dict, Optional, Union
+from sqlalchemy import event, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from app.core.security import get_password_hash, verify_password
+from app import schemas
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.core.response_cache import response_cache
+from app.core.security import get_password_hash, get_password_hash_async, verify_password
+from app.crud.async_base import AsyncCRUDBase
 from app.crud.base import CRUDBase
+from app.crud.crud_timeline import timeline
+from app.db.unit_of_work import save
+from app.models.comment import Comment
+from app.models.community import Community, community_members
+from app.models.like import Like
+from app.models.post import Post
 from app.models.user import User
 from app.schemas.user import UserCreate, UserUpdate
 
+# Snapshots of authenticated users keyed by id, so get_current_user does not
+# hit the database on every request
+user_cache: TTLCache[schemas.User] = TTLCache(
+    maxsize=settings.USER_CACHE_MAX_SIZE, ttl=settings.USER_CACHE_TTL_SECONDS
+)
+
+# Session.info key collecting user ids to drop from user_cache once the
+# session commits
+_PENDING_INVALIDATIONS = "user_cache_invalidate"
+
+def invalidate_on_commit(db: Session, user_id: int) -> None:
+    """
+    Drop a user's cached snapshot once db commits, so a concurrent request
+    cannot cache the row from before the write.
+    """
+    db.info.setdefault(_PENDING_INVALIDATIONS, set()).add(user_id)
+    if not event.contains(db, "after_commit", _after_commit):
+        event.listen(db, "after_commit", _after_commit)
+
+def _after_commit(db: Session) -> None:
+    for user_id in db.info.pop(_PENDING_INVALIDATIONS, ()):
+        user_cache.invalidate(user_id)
+
 class CRUDUser(CRUDBase[User, UserCreate, UserUpdate]):
+    def get_cached(self, db: Session, *, id: int) -> Optional[schemas.User]:
+        """
+        Read-only snapshot of a user, served from user_cache when possible.
+        Use get() when an ORM instance is needed for writes.
+        """
+        cached = user_cache.get(id)
+        if cached is not None:
+            return cached
+        return self._load_snapshot(db, id=id)
+
+    def _load_snapshot(self, db: Session, *, id: int) -> Optional[schemas.User]:
+        db_obj = self.get(db, id=id)
+        if db_obj is None:
+            return None
+        snapshot = schemas.User(
+            id=db_obj.id,
+            email=db_obj.email,
+            name=db_obj.name,
+            is_active=db_obj.is_active,
+        )
+        user_cache.set(id, snapshot)
+        return snapshot
+
     def get_by_email(self, db: Session, *, email: str) -> Optional[User]:
         return db.query(User).filter(User.email == email).first()
 
@@ -22,8 +81,7 @@ class CRUDUser(CRUDBase[User, UserCreate, UserUpdate]):
             is_superuser=False,
         )
         db.add(db_obj)
-        db.commit()
-        db.refresh(db_obj)
+        save(db)
         return db_obj
 
     def update(
@@ -37,8 +95,53 @@ class CRUDUser(CRUDBase[User, UserCreate, UserUpdate]):
             hashed_password = get_password_hash(update_data["password"])
             del update_data["password"]
             update_data["hashed_password"] = hashed_password
+        invalidate_on_commit(db, db_obj.id)
         return super().update(db, db_obj=db_obj, obj_in=update_data)
 
+    def deactivate(self, db: Session, *, db_obj: User) -> User:
+        return self.update(db, db_obj=db_obj, obj_in={"is_active": False})
+
+    def remove(self, db: Session, *, id: int) -> User:
+        """
+        Delete a user, leaving their posts, comments, likes and communities
+        without an author and dropping their memberships, in bulk rather
+        than by loading each collection to cascade. Timeline entries go with
+        the user through their ON DELETE CASCADE; communities that shrink to
+        the fan-out threshold get their members' timelines backfilled.
+        """
+        db.query(Post).filter(Post.author_id == id).update(
+            {Post.author_id: None, Post.updated_at: Post.updated_at}, synchronize_session=False
+        )
+        db.query(Comment).filter(Comment.author_id == id).update(
+            {Comment.author_id: None, Comment.updated_at: Comment.updated_at},
+            synchronize_session=False,
+        )
+        db.query(Like).filter(Like.user_id == id).update(
+            {Like.user_id: None}, synchronize_session=False
+        )
+        db.query(Community).filter(Community.created_by_id == id).update(
+            {Community.created_by_id: None}, synchronize_session=False
+        )
+        memberships = select(community_members.c.community_id).where(
+            community_members.c.user_id == id
+        )
+        shrinking = [
+            community_id for (community_id,) in db.query(Community.id).filter(
+                Community.id.in_(memberships),
+                Community.members_count == timeline.max_fanout_members + 1,
+            )
+        ]
+        db.query(Community).filter(Community.id.in_(memberships)).update(
+            {Community.members_count: Community.members_count - 1}, synchronize_session=False
+        )
+        db.execute(community_members.delete().where(community_members.c.user_id == id))
+        for community_id in shrinking:
+            timeline.backfill_community(db, community_id=community_id)
+        # Cached post listings embed the author
+        response_cache.invalidate_on_commit(db, "posts")
+        invalidate_on_commit(db, id)
+        return super().remove(db, id=id)
+
     def authenticate(self, db: Session, *, email: str, password: str) -> Optional[User]:
         user = self.get_by_email(db, email=email)
         if not user:
@@ -47,4 +150,36 @@ class CRUDUser(CRUDBase[User, UserCreate, UserUpdate]):
             return None
         return user
 
-user = CRUDUser(User) 
\ No newline at end of file
+class AsyncCRUDUser(AsyncCRUDBase[User, UserCreate, UserUpdate]):
+    async def get_cached(self, db: AsyncSession, *, id: int) -> Optional[schemas.User]:
+        """CRUDUser.get_cached; only a cache miss touches the database."""
+        cached = user_cache.get(id)
+        if cached is not None:
+            return cached
+        return await db.run_sync(user._load_snapshot, id=id)
+
+    async def get_by_email(self, db: AsyncSession, *, email: str) -> Optional[User]:
+        result = await db.execute(select(User).filter(User.email == email))
+        return result.scalars().first()
+
+    async def create(self, db: AsyncSession, *, obj_in: UserCreate) -> User:
+        db_obj = User(
+            email=obj_in.email,
+            name=obj_in.name,
+            hashed_password=await get_password_hash_async(obj_in.password),
+            is_active=True,
+        )
+        db.add(db_obj)
+        await db.commit()
+        return db_obj
+
+    async def update(
+        self, db: AsyncSession, *, db_obj: User, obj_in: Union[UserUpdate, Dict[str, Any]]
+    ) -> User:
+        db_obj = await super().update(db, db_obj=db_obj, obj_in=obj_in)
+        # super().update has committed
+        user_cache.invalidate(db_obj.id)
+        return db_obj
+
+user = CRUDUser(User)
+user_async = AsyncCRUDUser(User) 
\ No newline at end of file
@@ -0,0 +1,348 @@
+import asyncio
+import logging
+import threading
+import time
+from collections import Counter
+from typing import Any, Callable, Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+from sqlalchemy import Integer, bindparam, delete, exists, func, insert, literal, select, tuple_
+from sqlalchemy.dialects.postgresql import ARRAY, insert as pg_insert
+from sqlalchemy.orm import Session
+from sqlalchemy.orm.attributes import set_committed_value
+from app.core.config import settings
+from app.core.metrics import LIKE_BUFFER_FLUSH_SECONDS
+from app.core.response_cache import response_cache
+from app.db.session import SessionLocal
+from app.models.like import Like
+from app.models.post import Post
+from app.models.user import User
+
+logger = logging.getLogger(__name__)
+
+LikeKey = Tuple[int, int]  # (user_id, post_id)
+
+class _Pending(NamedTuple):
+    stored: bool   # whether the like exists in the database
+    desired: bool  # whether it should exist after the next flush
+
+class LikeBuffer:
+    """
+    Write-behind buffer for like/unlike events.
+
+    Events are coalesced per (user, post), so a like followed by an unlike
+    writes nothing, and flushed in bulk on a timer or once max_pending
+    entries are waiting. Until then reads see the buffered state through
+    overlay(), so users read their own writes. Counts seen by other workers
+    lag by up to one flush interval.
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session],
+        *,
+        enabled: bool,
+        flush_interval: float,
+        max_pending: int
+    ):
+        self.session_factory = session_factory
+        self.enabled = enabled
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self._pending: Dict[LikeKey, _Pending] = {}
+        self._inflight: Dict[LikeKey, _Pending] = {}
+        # Buffered likes_count change per post, pending and in flight
+        self._deltas: Dict[int, int] = {}
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wakeup: Optional[asyncio.Event] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._task: Optional[asyncio.Task] = None
+        self.events = 0
+        self.flushes = 0
+        self.flush_failures = 0
+        self.rows_written = 0
+        self.last_flush_seconds = 0.0
+
+    def like(self, db: Session, *, user_id: int, post_id: int) -> Optional[int]:
+        return self._record(db, user_id=user_id, post_id=post_id, liked=True)
+
+    def unlike(self, db: Session, *, user_id: int, post_id: int) -> Optional[int]:
+        return self._record(db, user_id=user_id, post_id=post_id, liked=False)
+
+    def _buffered_state(self, key: LikeKey) -> Optional[bool]:
+        entry = self._pending.get(key) or self._inflight.get(key)
+        return entry.desired if entry is not None else None
+
+    def _record(
+        self, db: Session, *, user_id: int, post_id: int, liked: bool
+    ) -> Optional[int]:
+        """
+        Buffer an event and return the post's likes_count including buffered
+        changes, or None if the post does not exist. Only reads the
+        database.
+        """
+        key = (user_id, post_id)
+        with self._lock:
+            known = self._buffered_state(key)
+        # One read: the current count, plus the stored like state unless the
+        # buffer already knows it
+        columns = [Post.likes_count]
+        if known is None:
+            columns.append(exists().where(Like.user_id == user_id, Like.post_id == post_id))
+        row = db.execute(select(*columns).where(Post.id == post_id)).first()
+        if row is None:
+            return None
+        likes_count = row[0]
+        stored = bool(row[1]) if known is None else known
+
+        with self._lock:
+            entry = self._pending.get(key)
+            if entry is not None:
+                base, current = entry.stored, entry.desired
+            else:
+                # A flush may have finished since the first check; in that
+                # case its state is what the database now holds
+                in_flight = self._inflight.get(key)
+                if in_flight is not None:
+                    base = in_flight.desired
+                else:
+                    base = stored
+                current = base
+            if liked == base:
+                self._pending.pop(key, None)
+            else:
+                self._pending[key] = _Pending(stored=base, desired=liked)
+            self._add_delta(post_id, int(liked) - int(current))
+            self.events += 1
+            depth = len(self._pending)
+            delta = self._deltas.get(post_id, 0)
+
+        if depth >= self.max_pending:
+            self._wake()
+        return likes_count + delta
+
+    def _add_delta(self, post_id: int, delta: int) -> None:
+        value = self._deltas.get(post_id, 0) + delta
+        if value:
+            self._deltas[post_id] = value
+        else:
+            self._deltas.pop(post_id, None)
+
+    def overlay(self, posts: Iterable[Any], *, user_id: Optional[int] = None) -> None:
+        """
+        Apply buffered changes to loaded posts or post rows: likes_count (on
+        ORM posts set as a loaded value, so the session never writes it
+        back) and is_liked for user_id.
+        """
+        with self._lock:
+            if not (self._pending or self._inflight):
+                return
+            for post in posts:
+                delta = self._deltas.get(post.id)
+                if delta and isinstance(post, Post):
+                    set_committed_value(post, "likes_count", post.likes_count + delta)
+                elif delta:
+                    post.likes_count += delta
+                if user_id is not None:
+                    state = self._buffered_state((user_id, post.id))
+                    if state is not None:
+                        post.is_liked = state
+
+    def flush(self) -> int:
+        """
+        Write buffered events in one transaction. Returns the number of like
+        rows written. On failure the events go back into the buffer, except
+        those whose post or user has since been deleted.
+        """
+        with self._flush_lock:
+            with self._lock:
+                batch, self._pending = self._pending, {}
+                self._inflight = batch
+            if not batch:
+                return 0
+
+            start = time.perf_counter()
+            additions = [key for key, entry in batch.items() if entry.desired]
+            removals = [key for key, entry in batch.items() if not entry.desired]
+            db = self.session_factory()
+            try:
+                written = self._write(db, additions=additions, removals=removals)
+                if written:
+                    # Cached post listings embed likes_count
+                    response_cache.invalidate_on_commit(db, "posts")
+                db.commit()
+            except Exception:
+                db.rollback()
+                logger.exception(f"Like buffer flush of {len(batch)} events failed")
+                try:
+                    orphaned = self._orphaned(db, batch)
+                except Exception:
+                    logger.exception("Like buffer could not check for deleted posts and users")
+                    orphaned = set()
+                with self._lock:
+                    for key in orphaned:
+                        # Requeued, they would fail every later flush
+                        entry = batch.pop(key)
+                        self._pending.pop(key, None)
+                        self._add_delta(key[1], int(entry.stored) - int(entry.desired))
+                    if orphaned:
+                        logger.warning(f"Like buffer dropped {len(orphaned)} events for deleted posts or users")
+                    for key, entry in batch.items():
+                        newer = self._pending.get(key)
+                        desired = newer.desired if newer is not None else entry.desired
+                        if desired == entry.stored:
+                            self._pending.pop(key, None)
+                        else:
+                            self._pending[key] = _Pending(stored=entry.stored, desired=desired)
+                    self._inflight = {}
+                    self.flush_failures += 1
+                return 0
+            finally:
+                db.close()
+
+            elapsed = time.perf_counter() - start
+            with self._lock:
+                self._inflight = {}
+                for key, entry in batch.items():
+                    self._add_delta(key[1], int(entry.stored) - int(entry.desired))
+                self.flushes += 1
+                self.rows_written += written
+                self.last_flush_seconds = elapsed
+            LIKE_BUFFER_FLUSH_SECONDS.observe(elapsed)
+            return written
+
+    @staticmethod
+    def _orphaned(db: Session, keys: Iterable[LikeKey]) -> Set[LikeKey]:
+        """Keys whose post or user no longer exists."""
+        keys = list(keys)
+        users = set(db.execute(select(User.id).where(User.id.in_({u for u, _ in keys}))).scalars())
+        posts = set(db.execute(select(Post.id).where(Post.id.in_({p for _, p in keys}))).scalars())
+        return {key for key in keys if key[0] not in users or key[1] not in posts}
+
+    def _write(
+        self, db: Session, *, additions: List[LikeKey], removals: List[LikeKey]
+    ) -> int:
+        """
+        INSERT ... SELECT of new likes joined to their post and user, so
+        likes on posts or by users deleted since they were buffered are
+        skipped, and one DELETE of removed ones. Then one counter UPDATE per
+        affected post with the rows actually changed.
+        """
+        changed: Counter = Counter()
+        if db.get_bind().dialect.name == "postgresql":
+            if additions:
+                keys = func.unnest(
+                    literal([u for u, _ in additions], ARRAY(Integer)),
+                    literal([p for _, p in additions], ARRAY(Integer)),
+                ).table_valued("user_id", "post_id")
+                targets = (
+                    select(User.id, Post.id)
+                    .select_from(keys)
+                    .join(User, User.id == keys.c.user_id)
+                    .join(Post, Post.id == keys.c.post_id)
+                )
+                inserted = db.execute(
+                    pg_insert(Like)
+                    .from_select(["user_id", "post_id"], targets)
+                    .on_conflict_do_nothing(index_elements=["user_id", "post_id"])
+                    .returning(Like.post_id)
+                ).scalars()
+                changed.update(inserted)
+            if removals:
+                deleted = db.execute(
+                    delete(Like)
+                    .where(tuple_(Like.user_id, Like.post_id).in_(removals))
+                    .returning(Like.post_id)
+                ).scalars()
+                changed.subtract(deleted)
+        else:
+            existing = set(
+                db.execute(
+                    select(Like.user_id, Like.post_id)
+                    .where(tuple_(Like.user_id, Like.post_id).in_(additions + removals))
+                ).all()
+            )
+            new_likes = [key for key in additions if key not in existing]
+            old_likes = [key for key in removals if key in existing]
+            if new_likes:
+                # SQLite serializes writers, so the targets found here are
+                # still there for the insert
+                orphaned = self._orphaned(db, new_likes)
+                new_likes = [key for key in new_likes if key not in orphaned]
+            if new_likes:
+                db.execute(
+                    insert(Like),
+                    [{"user_id": u, "post_id": p} for u, p in new_likes],
+                )
+                changed.update(p for _, p in new_likes)
+            if old_likes:
+                db.execute(
+                    delete(Like).where(tuple_(Like.user_id, Like.post_id).in_(old_likes))
+                )
+                changed.subtract(p for _, p in old_likes)
+
+        deltas = [{"post": post_id, "delta": delta} for post_id, delta in changed.items() if delta]
+        if deltas:
+            posts = Post.__table__
+            db.execute(
+                posts.update()
+                .where(posts.c.id == bindparam("post"))
+                # A like is not an edit: keep updated_at as it is
+                .values(
+                    likes_count=posts.c.likes_count + bindparam("delta"),
+                    updated_at=posts.c.updated_at,
+                ),
+                deltas,
+            )
+        return sum(abs(delta) for delta in changed.values())
+
+    def _wake(self) -> None:
+        if self._loop is not None and self._wakeup is not None:
+            self._loop.call_soon_threadsafe(self._wakeup.set)
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            await loop.run_in_executor(None, self.flush)
+
+    def start(self) -> None:
+        if self.enabled and self._task is None:
+            self._loop = asyncio.get_running_loop()
+            self._wakeup = asyncio.Event()
+            self._task = self._loop.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop the flush task and write whatever is still buffered."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await asyncio.get_running_loop().run_in_executor(None, self.flush)
+        if self._pending:
+            logger.error(f"Like buffer shut down with {len(self._pending)} unwritten events")
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "pending": len(self._pending),
+                "inflight": len(self._inflight),
+                "events": self.events,
+                "flushes": self.flushes,
+                "flush_failures": self.flush_failures,
+                "rows_written": self.rows_written,
+                "last_flush_seconds": self.last_flush_seconds,
+            }
+
+like_buffer = LikeBuffer(
+    SessionLocal,
+    enabled=settings.LIKE_BUFFER_ENABLED,
+    flush_interval=settings.LIKE_BUFFER_FLUSH_INTERVAL,
+    max_pending=settings.LIKE_BUFFER_MAX_PENDING,
+)
@@ -0,0 +1,63 @@
+from typing import Any
+
+class Row:
+    """
+    Read-only result row for list queries that select only the columns a
+    response needs. Rows are plain slotted objects, not ORM instances: they
+    are never added to the session's identity map and have no lazy loaders,
+    and the response schemas read them by attribute like any ORM object.
+    """
+    __slots__ = ()
+
+    def __init__(self, **values: Any):
+        for name in self.__slots__:
+            setattr(self, name, values.get(name))
+
+    def __repr__(self) -> str:
+        fields = ", ".join(f"{name}={getattr(self, name)!r}" for name in self.__slots__)
+        return f"{type(self).__name__}({fields})"
+
+class UserSummary(Row):
+    __slots__ = ("id", "email", "name", "is_active")
+
+class CommunitySummary(Row):
+    __slots__ = ("id", "name", "slug")
+
+class MemberRow(Row):
+    __slots__ = ("id", "email", "name", "joined_at")
+
+class CommentRow(Row):
+    __slots__ = ("id", "content", "author_id", "post_id", "created_at", "updated_at", "author")
+
+class PostRow(Row):
+    __slots__ = (
+        "id",
+        "title",
+        "content",
+        "is_announcement",
+        "author_id",
+        "community_id",
+        "created_at",
+        "updated_at",
+        "likes_count",
+        "comments_count",
+        "is_liked",
+        "author",
+        "community",
+        "comments",
+    )
+
+class CommunityRow(Row):
+    __slots__ = (
+        "id",
+        "name",
+        "slug",
+        "description",
+        "is_private",
+        "created_at",
+        "created_by_id",
+        "members_count",
+        "created_by",
+        "is_member",
+        "is_admin",
+    )
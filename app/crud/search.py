@@ -0,0 +1,104 @@
+import base64
+import binascii
+import json
+import re
+from decimal import Decimal, InvalidOperation
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple, Type
+from sqlalchemy import Integer, Numeric, case, cast, func, literal, literal_column, or_, tuple_
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from sqlalchemy.orm import Query, Session
+from app.db.base_class import Base
+from app.db.search_vector import TS_CONFIG
+from app.models.community import Community
+from app.models.post import Post
+
+# Weighted columns of each searchable model, highest weight first. The
+# Postgres migration and add_search_vector build posts/communities.
+# search_vector from the same columns with setweight('A'), setweight('B').
+DOCUMENTS: Dict[Type[Base], Tuple[Tuple[str, int], ...]] = {
+    Community: (("name", 2), ("description", 1)),
+    Post: (("title", 2), ("content", 1)),
+}
+
+_TERM = re.compile(r"\w+", re.UNICODE)
+
+class SearchCursor(NamedTuple):
+    """Position of the last row of a page in (rank, id) order."""
+    rank: Decimal
+    id: int
+
+def encode_search_cursor(rank: Decimal, id: int) -> str:
+    payload = json.dumps([str(rank), id]).encode()
+    return base64.urlsafe_b64encode(payload).decode().rstrip("=")
+
+def decode_search_cursor(cursor: str) -> SearchCursor:
+    """
+    Parse an opaque cursor produced by encode_search_cursor. Raises
+    ValueError when the cursor is malformed.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        rank, id = json.loads(base64.urlsafe_b64decode(padded))
+        return SearchCursor(Decimal(rank), int(id))
+    except (binascii.Error, InvalidOperation, TypeError, ValueError) as e:
+        raise ValueError("Invalid cursor") from e
+
+def _postgres_rank(model: Type[Base], text: str):
+    vector = literal_column(f"{model.__tablename__}.search_vector", type_=TSVECTOR)
+    tsquery = func.websearch_to_tsquery(literal_column(f"'{TS_CONFIG}'::regconfig"), text)
+    # Rounded to a fixed-scale numeric so the value in the cursor compares
+    # exactly against the recomputed rank on the next page
+    rank = func.round(cast(func.ts_rank_cd(vector, tsquery), Numeric), 6, type_=Numeric)
+    return vector.op("@@")(tsquery), rank
+
+def _fallback_rank(model: Type[Base], text: str):
+    """
+    Term-matching rank for databases without full-text search (SQLite in
+    tests): every query term found in a column adds that column's weight.
+    """
+    terms = [term.lower() for term in _TERM.findall(text)] or [text.lower()]
+    matches = []
+    for name, weight in DOCUMENTS[model]:
+        column = func.lower(func.coalesce(getattr(model, name), ""))
+        for term in terms:
+            matches.append((column.contains(term, autoescape=True), weight))
+    rank = sum(case((match, weight), else_=0) for match, weight in matches)
+    return or_(*[match for match, _ in matches]), cast(rank, Integer)
+
+def ranked(
+    db: Session,
+    query: Query,
+    *,
+    model: Type[Base],
+    text: str,
+    cursor: Optional[SearchCursor] = None,
+    limit: int = 100
+) -> Tuple[List[Any], Optional[str]]:
+    """
+    Filter a column query over `model` to rows matching `text`, ordered
+    by relevance, keyset-paginated by (rank, id). The query must select
+    the model's id as "id".
+
+    Uses the tsvector columns and GIN indexes on Postgres, and term
+    matching elsewhere. Returns the rows, which gain a "rank" column, and
+    the cursor of the next page.
+    """
+    if db.get_bind().dialect.name == "postgresql":
+        matches, rank = _postgres_rank(model, text)
+    else:
+        matches, rank = _fallback_rank(model, text)
+
+    query = query.filter(matches).add_columns(rank.label("rank"))
+    if cursor is not None:
+        query = query.filter(
+            tuple_(rank, model.id) < tuple_(
+                literal(rank.type.python_type(cursor.rank), rank.type), literal(cursor.id)
+            )
+        )
+    rows = query.order_by(rank.desc(), model.id.desc()).limit(limit + 1).all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_search_cursor(Decimal(rows[-1].rank), rows[-1].id)
+    return rows, next_cursor
@@ -2,4 +2,6 @@ from app.db.base_class import Base
 from app.models.user import User
 from app.models.post import Post
 from app.models.comment import Comment
-from app.models.like import Like 
\ No newline at end of file
+from app.models.like import Like 
+from app.models.community import Community
+from app.models.timeline import TimelineEntry
@@ -1,5 +1,20 @@
+from datetime import datetime, timezone
 from typing import Any
 from sqlalchemy.ext.declarative import as_declarative, declared_attr
+from app.core.config import settings
+
+# Loader strategy of every relationship. "raise_on_sql" turns an unplanned
+# lazy load into an error; queries opt in to what they need through the
+# loader presets of the CRUD classes.
+LAZY_LOAD = settings.DB_LAZY_LOAD
+
+def utcnow() -> datetime:
+    """
+    Python-side default for keyset-paginated created_at columns. SQLite
+    stores now() as 'YYYY-MM-DD HH:MM:SS' but binds datetimes with
+    microseconds, so server-set values would not compare with cursors.
+    """
+    return datetime.now(timezone.utc)
 
 @as_declarative()
 class Base:
@@ -9,4 +24,11 @@ class Base:
     # Generate __tablename__ automatically
     @declared_attr
     def __tablename__(cls) -> str:
-        return cls.__name__.lower() 
\ No newline at end of file
+        return cls.__name__.lower()
+
+    # Fetch server-generated columns (ids, created_at, onupdate timestamps)
+    # during the flush, with RETURNING where the dialect supports it,
+    # rather than by refreshing after commit
+    @declared_attr
+    def __mapper_args__(cls) -> dict:
+        return {"eager_defaults": True}
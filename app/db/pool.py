@@ -0,0 +1,185 @@
+import asyncio
+import logging
+import threading
+import time
+from typing import Any, Dict, List, Optional
+from sqlalchemy import exc, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, Pool, QueuePool
+
+logger = logging.getLogger(__name__)
+
+class PoolStats:
+    """Checkout counters for one connection pool class."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+
+    def record_checkout(self, waited: float) -> None:
+        with self._lock:
+            self.checkouts += 1
+            self.wait_seconds_total += waited
+            self.wait_seconds_max = max(self.wait_seconds_max, waited)
+
+    def record_timeout(self) -> None:
+        with self._lock:
+            self.timeouts += 1
+
+    def snapshot(self, pool: Optional[Pool] = None) -> Dict[str, Any]:
+        with self._lock:
+            data = {
+                "checkouts": self.checkouts,
+                "timeouts": self.timeouts,
+                "wait_seconds_total": round(self.wait_seconds_total, 6),
+                "wait_seconds_max": round(self.wait_seconds_max, 6),
+            }
+        if isinstance(pool, _CheckoutTimingMixin):
+            capacity = pool.size() + max(pool.max_overflow, 0)
+            data.update({
+                "size": pool.size(),
+                "checked_out": pool.checkedout(),
+                "overflow": pool.overflow(),
+                "capacity": capacity,
+                "saturation": round(pool.checkedout() / capacity, 4) if capacity else 0.0,
+            })
+        return data
+
+class _CheckoutTimingMixin:
+    # Class-level so the counters survive Pool.recreate() on engine dispose
+    stats: PoolStats
+
+    def __init__(self, *args: Any, max_overflow: int = 10, **kwargs: Any):
+        super().__init__(*args, max_overflow=max_overflow, **kwargs)
+        # QueuePool keeps its own copy private; capacity needs it
+        self.max_overflow = max_overflow
+
+    def connect(self):
+        start = time.perf_counter()
+        try:
+            connection = super().connect()
+        except exc.TimeoutError:
+            self.stats.record_timeout()
+            raise
+        self.stats.record_checkout(time.perf_counter() - start)
+        return connection
+
+class InstrumentedQueuePool(_CheckoutTimingMixin, QueuePool):
+    stats = PoolStats()
+
+class InstrumentedAsyncAdaptedQueuePool(_CheckoutTimingMixin, AsyncAdaptedQueuePool):
+    stats = PoolStats()
+
+class EngineHealth:
+    """Outcome of the latest health check of one engine."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.healthy: Optional[bool] = None
+        self.last_error: Optional[str] = None
+        self.last_checked: Optional[float] = None
+
+    def record(self, error: Optional[Exception]) -> bool:
+        if error is not None:
+            if self.healthy is not False:
+                logger.error(f"Database health check failed ({self.name}): {str(error)}")
+        elif self.healthy is False:
+            logger.info(f"Database connection restored ({self.name})")
+        self.healthy = error is None
+        self.last_error = None if error is None else str(error)
+        self.last_checked = time.time()
+        return self.healthy
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            "healthy": self.healthy,
+            "last_checked": self.last_checked,
+            "last_error": self.last_error,
+        }
+
+class PoolHealthChecker:
+    """
+    Periodically runs SELECT 1 on a pooled connection of the sync engine,
+    and of the async engine when given, in the background instead of
+    probing the database at the start of every request. A failed check
+    disposes of that engine's pool, so requests open fresh connections
+    instead of checking out ones that went stale with the outage.
+    """
+
+    def __init__(self, engine: Engine, *, async_engine: Optional[AsyncEngine] = None, interval: float):
+        self.engine = engine
+        self.async_engine = async_engine
+        self.interval = interval
+        self.sync_health = EngineHealth("sync")
+        self.async_health = EngineHealth("async") if async_engine is not None else None
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def healthy(self) -> Optional[bool]:
+        states = [health.healthy for health in self._healths()]
+        if None in states:
+            return None
+        return all(states)
+
+    @property
+    def last_error(self) -> Optional[str]:
+        errors = [health.last_error for health in self._healths() if health.last_error]
+        return "; ".join(errors) or None
+
+    def _healths(self) -> List[EngineHealth]:
+        return [health for health in (self.sync_health, self.async_health) if health is not None]
+
+    def check(self) -> bool:
+        """Check the sync engine. Blocks; run it off the event loop."""
+        try:
+            with self.engine.connect() as connection:
+                connection.execute(text("SELECT 1"))
+        except exc.SQLAlchemyError as e:
+            self.engine.dispose()
+            return self.sync_health.record(e)
+        return self.sync_health.record(None)
+
+    async def check_async(self) -> bool:
+        """Check the async engine, on the event loop its connections use."""
+        try:
+            async with self.async_engine.connect() as connection:
+                await connection.execute(text("SELECT 1"))
+        except (exc.SQLAlchemyError, OSError) as e:
+            await self.async_engine.dispose()
+            return self.async_health.record(e)
+        return self.async_health.record(None)
+
+    async def check_all(self) -> bool:
+        healthy = await asyncio.get_running_loop().run_in_executor(None, self.check)
+        if self.async_engine is not None:
+            healthy = await self.check_async() and healthy
+        return healthy
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            await self.check_all()
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            "healthy": self.healthy,
+            "last_error": self.last_error,
+            "engines": {health.name: health.status() for health in self._healths()},
+        }
@@ -0,0 +1,105 @@
+import logging
+import re
+from collections import Counter
+from contextlib import contextmanager
+from functools import lru_cache
+from typing import Iterator, List, Sequence, Tuple
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+logger = logging.getLogger(__name__)
+
+_IN_LIST = re.compile(r"\bIN\s*\((?:[^()]|\([^()]*\))*\)", re.IGNORECASE)
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_NUMBER = re.compile(r"\b\d+(?:\.\d+)?\b")
+_PARAM = re.compile(r"%\([^)]+\)s|:\w+|\$\d+|\?")
+_SPACE = re.compile(r"\s+")
+
+class QueryBudgetExceeded(AssertionError):
+    pass
+
+@lru_cache(maxsize=2048)
+def fingerprint(statement: str) -> str:
+    """
+    Normalize a SQL statement so executions that differ only in literals,
+    bound parameters or IN-list length group together.
+    """
+    normalized = _IN_LIST.sub("IN (?)", statement)
+    normalized = _STRING.sub("?", normalized)
+    normalized = _PARAM.sub("?", normalized)
+    normalized = _NUMBER.sub("?", normalized)
+    return _SPACE.sub(" ", normalized).strip()
+
+def repeated_statements(
+    fingerprints: Counter, *, threshold: int
+) -> List[Tuple[str, int]]:
+    """Fingerprints executed at least `threshold` times, most frequent first."""
+    return [(fp, n) for fp, n in fingerprints.most_common() if n >= threshold]
+
+def report(fingerprints: Counter, *, limit: int = 5) -> str:
+    lines = [f"{n} x {fp[:200]}" for fp, n in fingerprints.most_common(limit)]
+    return "\n".join(lines)
+
+def check_request(
+    *, method: str, route: str, queries: int, fingerprints: Counter,
+    budget: int, repeat_threshold: int
+) -> None:
+    """
+    Log a warning when a request exceeds its query budget or repeats the
+    same statement shape often enough to look like an N+1.
+    """
+    repeated = repeated_statements(fingerprints, threshold=repeat_threshold)
+    if queries > budget:
+        logger.warning(
+            f"{method} {route} executed {queries} queries (budget {budget}):\n"
+            f"{report(fingerprints)}"
+        )
+    elif repeated:
+        fp, n = repeated[0]
+        logger.warning(f"Possible N+1 in {method} {route}: {n} x {fp[:200]}")
+
+class QueryRecorder:
+    """
+    Records every statement executed on the given engines while active.
+    Pass an AsyncEngine's sync_engine to include async endpoints.
+    """
+
+    def __init__(self, *engines: Engine):
+        self.engines = engines
+        self.statements: List[str] = []
+
+    def _record(self, conn, cursor, statement, parameters, context, executemany):
+        self.statements.append(statement)
+
+    def __enter__(self) -> "QueryRecorder":
+        for engine in self.engines:
+            event.listen(engine, "before_cursor_execute", self._record)
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        for engine in self.engines:
+            event.remove(engine, "before_cursor_execute", self._record)
+
+    @property
+    def count(self) -> int:
+        return len(self.statements)
+
+    @property
+    def fingerprints(self) -> Counter:
+        return Counter(fingerprint(s) for s in self.statements)
+
+@contextmanager
+def assert_max_queries(
+    engines: Sequence[Engine], max_queries: int, *, label: str = ""
+) -> Iterator[QueryRecorder]:
+    """
+    Fail with QueryBudgetExceeded if the block runs more than max_queries
+    statements on engines. The error lists the most repeated statements.
+    """
+    with QueryRecorder(*engines) as recorder:
+        yield recorder
+    if recorder.count > max_queries:
+        raise QueryBudgetExceeded(
+            f"{label or 'block'} executed {recorder.count} queries, "
+            f"budget is {max_queries}:\n{report(recorder.fingerprints)}"
+        )
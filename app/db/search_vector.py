@@ -0,0 +1,23 @@
+from sqlalchemy import DDL, Table, event
+
+# Text search configuration of the generated search_vector columns
+TS_CONFIG = "english"
+
+def add_search_vector(table: Table, primary: str, secondary: str) -> None:
+    """
+    Give a table the generated, GIN-indexed search_vector column of
+    migration 30642e355929 when metadata.create_all builds it on Postgres,
+    so create_all and Alembic schemas match. The column is not mapped:
+    app.crud.search reads it by name and rows never load it. Other
+    databases use the term-matching fallback and get no column.
+    """
+    name = table.name
+    for statement in (
+        f"ALTER TABLE {name} ADD COLUMN search_vector tsvector "
+        f"GENERATED ALWAYS AS ("
+        f"setweight(to_tsvector('{TS_CONFIG}', coalesce({primary}, '')), 'A') || "
+        f"setweight(to_tsvector('{TS_CONFIG}', coalesce({secondary}, '')), 'B')"
+        f") STORED",
+        f"CREATE INDEX ix_{name}_search_vector ON {name} USING gin (search_vector)",
+    ):
+        event.listen(table, "after_create", DDL(statement).execute_if(dialect="postgresql"))
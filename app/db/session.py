@@ -1,31 +1,102 @@
-from sqlalchemy import create_engine, text
-from sqlalchemy.orm import sessionmaker
-from sqlalchemy.exc import SQLAlchemyError
+from typing import Any, AsyncGenerator, Dict, Generator
+from fastapi import Request
+from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import Session, sessionmaker
 import logging
 from app.core.config import settings
+from app.core.metrics import instrument_engine
+from app.db.pool import (
+    InstrumentedAsyncAdaptedQueuePool,
+    InstrumentedQueuePool,
+    PoolHealthChecker,
+)
+from app.db.unit_of_work import UNIT_OF_WORK_ROUTE, begin_unit_of_work
 
 logger = logging.getLogger(__name__)
 
-# Add connection pool settings
-engine = create_engine(
-    settings.database_url,
-    pool_pre_ping=True,
-    pool_size=5,
-    max_overflow=10,
-    pool_timeout=30,  # 30 seconds
-    pool_recycle=1800  # 30 minutes
+def _pool_options(url: str) -> Dict[str, Any]:
+    # SQLite (local runs, benchmarks) uses SQLAlchemy's default pool
+    if make_url(url).get_backend_name() == "sqlite":
+        return {}
+    return {
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+    }
+
+_sync_pool_options = _pool_options(settings.database_url)
+if _sync_pool_options:
+    _sync_pool_options["poolclass"] = InstrumentedQueuePool
+engine = create_engine(settings.database_url, **_sync_pool_options)
+
+# Objects stay loaded after commit; CRUD writes fetch server defaults at
+# flush time instead of refreshing (see app.db.unit_of_work.save)
+SessionLocal = sessionmaker(
+    autocommit=False, autoflush=False, expire_on_commit=False, bind=engine
+)
+
+# Asyncio engine for `async def` endpoints, so their DB calls don't block
+# the event loop
+_async_pool_options = _pool_options(settings.async_database_url)
+if _async_pool_options:
+    _async_pool_options["poolclass"] = InstrumentedAsyncAdaptedQueuePool
+async_engine = create_async_engine(settings.async_database_url, **_async_pool_options)
+
+AsyncSessionLocal = sessionmaker(
+    bind=async_engine,
+    class_=AsyncSession,
+    autoflush=False,
+    expire_on_commit=False
 )
 
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+instrument_engine(engine)
+instrument_engine(async_engine.sync_engine)
 
-def get_db():
+pool_health = PoolHealthChecker(
+    engine, async_engine=async_engine, interval=settings.DB_HEALTHCHECK_INTERVAL
+)
+
+def _check_unit_of_work_route(request: Request) -> None:
+    # CRUD writes only flush; on any other route they would be dropped
+    # silently when the session closes
+    if not request.scope.get(UNIT_OF_WORK_ROUTE):
+        route = request.scope.get("route")
+        raise RuntimeError(
+            f"{request.method} {getattr(route, 'path', request.url.path)} uses a "
+            "unit-of-work session but its route does not commit it; create its "
+            "router with route_class=UnitOfWorkRoute (app.api.routing)"
+        )
+
+def get_db(request: Request) -> Generator[Session, None, None]:
+    if settings.DB_UNIT_OF_WORK:
+        _check_unit_of_work_route(request)
     db = SessionLocal()
+    if settings.DB_UNIT_OF_WORK:
+        # CRUD writes only flush; UnitOfWorkRoute commits once per request
+        begin_unit_of_work(db)
+        request.state.db = db
     try:
-        # Test the connection
-        db.execute(text("SELECT 1"))
         yield db
-    except SQLAlchemyError as e:
-        logger.error(f"Database connection error: {str(e)}")
-        raise
     finally:
-        db.close() 
\ No newline at end of file
+        db.close()
+
+async def get_async_db(request: Request) -> AsyncGenerator[AsyncSession, None]:
+    if settings.DB_UNIT_OF_WORK:
+        _check_unit_of_work_route(request)
+    async with AsyncSessionLocal() as db:
+        if settings.DB_UNIT_OF_WORK:
+            # As in get_db; CRUD writes run on db.sync_session through
+            # AsyncCRUD, so that is where the unit of work is marked
+            begin_unit_of_work(db.sync_session)
+            request.state.db = db
+        yield db
+
+def pool_metrics() -> Dict[str, Any]:
+    return {
+        "sync": InstrumentedQueuePool.stats.snapshot(engine.pool),
+        "async": InstrumentedAsyncAdaptedQueuePool.stats.snapshot(async_engine.sync_engine.pool),
+    }
@@ -0,0 +1,28 @@
+from sqlalchemy.orm import Session
+
+# Session.info key marking a request-scoped session that commits once, at
+# the end of the request (see app.api.routing.UnitOfWorkRoute)
+UNIT_OF_WORK = "unit_of_work"
+
+# Request scope key set by UnitOfWorkRoute. Without it nothing would commit
+# a unit-of-work session, so get_db refuses to open one
+UNIT_OF_WORK_ROUTE = "unit_of_work_route"
+
+def begin_unit_of_work(db: Session) -> None:
+    db.info[UNIT_OF_WORK] = True
+
+def in_unit_of_work(db: Session) -> bool:
+    return db.info.get(UNIT_OF_WORK, False)
+
+def save(db: Session) -> None:
+    """
+    Finish a CRUD write: flush inside a unit of work, commit otherwise.
+
+    Server-generated columns come back with the INSERT/UPDATE (mappers use
+    eager_defaults, i.e. RETURNING on Postgres) and sessions don't expire
+    on commit, so written objects need no refresh.
+    """
+    if in_unit_of_work(db):
+        db.flush()
+    else:
+        db.commit()
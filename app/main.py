@@ -1,14 +1,24 @@
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response
 from app.core.config import settings
+from app.core.metrics import (
+    CONTENT_TYPE_LATEST,
+    MetricsMiddleware,
+    StatsCollector,
+    register_collector,
+    render_latest,
+)
+from app.core.response_cache import response_cache
+from app.core.security import shutdown_password_executor
+from app.crud.crud_user import user_cache
+from app.crud.like_buffer import like_buffer
 from app.api.router import router as api_router
+from app.api.deps import NEXT_CURSOR_HEADER
+from app.db.session import pool_health, pool_metrics
 import os
 import logging
 import sys
-from sqlalchemy import create_engine
-from sqlalchemy.exc import SQLAlchemyError
-from sqlalchemy.sql import text
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -21,6 +31,26 @@ app = FastAPI(
     openapi_url=f"{settings.API_V1_STR}/openapi.json"
 )
 
+# Per-route latency and DB query metrics
+app.add_middleware(MetricsMiddleware)
+
+register_collector(StatsCollector(
+    "db_pool", "Database connection pool", pool_metrics,
+    label="engine", counters=("checkouts", "timeouts", "wait_seconds_total"),
+))
+register_collector(StatsCollector(
+    "user_cache", "Authenticated user cache", lambda: {"users": user_cache.stats()},
+    label="cache", counters=("hits", "misses", "evictions"),
+))
+register_collector(StatsCollector(
+    "response_cache", "Cached GET responses", lambda: {"responses": response_cache.stats()},
+    label="cache", counters=("hits", "misses", "not_modified", "errors", "evictions"),
+))
+register_collector(StatsCollector(
+    "like_buffer", "Write-behind like buffer", lambda: {"likes": like_buffer.stats()},
+    label="buffer", counters=("events", "flushes", "flush_failures", "rows_written"),
+))
+
 # Add CORS middleware
 app.add_middleware(
     CORSMiddleware,
@@ -28,6 +58,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER],
 )
 
 # Include API router
@@ -40,15 +71,19 @@ async def startup_event():
     logger.info(f"Files in current directory: {os.listdir('.')}")
     
     # Try to connect to the database
-    try:
-        # engine = create_engine(settings.get_database_url())
-        engine = create_engine(settings.database_url)
-        with engine.connect() as connection:
-            result = connection.execute(text("SELECT 1"))
-            logger.info("Database connection successful!")
-    except SQLAlchemyError as e:
-        logger.error(f"Database connection failed: {e}")
-        raise  # Re-raise the exception to prevent the application from starting
+    if not await pool_health.check_all():
+        # Prevent the application from starting
+        raise RuntimeError(f"Database connection failed: {pool_health.last_error}")
+    logger.info("Database connection successful!")
+    pool_health.start()
+    like_buffer.start()
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    await pool_health.stop()
+    # Write buffered likes before the process exits
+    await like_buffer.stop()
+    shutdown_password_executor()
 
 @app.get("/")
 async def root():
@@ -56,15 +91,15 @@ async def root():
 
 @app.get("/health")
 async def health_check():
-    return {"status": "healthy"}
+    status = "unhealthy" if pool_health.healthy is False else "healthy"
+    return {"status": status, "database": pool_health.status()}
 
 @app.get("/metrics")
 async def metrics():
-    return {
-        "status": "ok",
-        "uptime": "running",
-        "version": settings.VERSION
-    }
+    """
+    Prometheus text exposition of request, DB and pool metrics.
+    """
+    return Response(content=render_latest(), media_type=CONTENT_TYPE_LATEST)
 
 @app.exception_handler(Exception)
 async def global_exception_handler(request: Request, exc: Exception):
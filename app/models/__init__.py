@@ -3,6 +3,7 @@ from .post import Post
 from .comment import Comment
 from .like import Like
 from .community import Community  # Add this line
+from .timeline import TimelineEntry
 
 __all__ = [
     "User",
@@ -10,4 +11,5 @@ __all__ = [
     "Comment",
     "Like",
     "Community",  # Add this line
+    "TimelineEntry",
 ]
\ No newline at end of file
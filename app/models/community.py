@@ -1,27 +1,43 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, Boolean, DateTime, Table
+from sqlalchemy import Column, Integer, String, ForeignKey, Boolean, DateTime, Table, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
-from app.db.base_class import Base
+from app.db.base_class import Base, LAZY_LOAD
+from app.db.search_vector import add_search_vector
 
 class Community(Base):
     __tablename__ = "communities"
+    __table_args__ = (
+        Index("ix_communities_created_at_id", "created_at", "id"),
+        Index("ix_communities_created_by_id", "created_by_id"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String, index=True)
     slug = Column(String, unique=True, index=True)
     description = Column(String)
     is_private = Column(Boolean, default=False)
+    # Denormalized counter, maintained by CRUDCommunity.add_member/remove_member
+    members_count = Column(Integer, nullable=False, default=0, server_default="0")
     created_at = Column(DateTime, default=datetime.utcnow)
     created_by_id = Column(Integer, ForeignKey("users.id"))
     
-    # Relationships
-    created_by = relationship("User", back_populates="owned_communities")
+    # Relationships. Collections are never loaded to delete a community;
+    # CRUDCommunity.remove deletes posts and memberships in bulk first.
+    created_by = relationship("User", back_populates="owned_communities", lazy=LAZY_LOAD)
     members = relationship(
         "User",
         secondary="community_members",
-        back_populates="communities"
+        back_populates="communities",
+        passive_deletes=True,
+        lazy=LAZY_LOAD
+    )
+    posts = relationship(
+        "Post", back_populates="community", cascade="all, delete-orphan",
+        passive_deletes=True, lazy=LAZY_LOAD
     )
-    posts = relationship("Post", back_populates="community", cascade="all, delete-orphan")
+
+# Weights must match app.crud.search.DOCUMENTS
+add_search_vector(Community.__table__, "name", "description")
 
 # Association table for community members
 community_members = Table(
@@ -29,4 +45,13 @@ community_members = Table(
     Base.metadata,
     Column("community_id", Integer, ForeignKey("communities.id"), primary_key=True),
     Column("user_id", Integer, ForeignKey("users.id"), primary_key=True),
+    # When the user joined; members are listed newest first
+    Column("created_at", DateTime, nullable=False, default=datetime.utcnow),
+    # A user's communities; the primary key leads with community_id
+    Index("ix_community_members_user_id_community_id", "user_id", "community_id"),
+    # A community's members by join date, for CRUDCommunity.get_members
+    Index(
+        "ix_community_members_community_id_created_at_user_id",
+        "community_id", "created_at", "user_id"
+    ),
 )
\ No newline at end of file
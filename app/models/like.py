@@ -1,16 +1,22 @@
-from sqlalchemy import Column, Integer, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, DateTime, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
-from app.db.base_class import Base
+from app.db.base_class import Base, LAZY_LOAD, utcnow
 
 class Like(Base):
     __tablename__ = "likes"
+    __table_args__ = (
+        # One like per user and post; CRUDLike.like_post upserts against it.
+        # Also serves lookups by user_id alone.
+        Index("uq_likes_user_id_post_id", "user_id", "post_id", unique=True),
+        Index("ix_likes_post_id", "post_id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"))
     post_id = Column(Integer, ForeignKey("posts.id"))
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    created_at = Column(DateTime(timezone=True), default=utcnow, server_default=func.now())
 
     # Relationships
-    user = relationship("User", back_populates="likes")
-    post = relationship("Post", back_populates="likes") 
\ No newline at end of file
+    user = relationship("User", back_populates="likes", lazy=LAZY_LOAD)
+    post = relationship("Post", back_populates="likes", lazy=LAZY_LOAD) 
\ No newline at end of file
@@ -1,10 +1,17 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Boolean
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Boolean, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
-from app.db.base_class import Base
+from app.db.base_class import Base, LAZY_LOAD, utcnow
+from app.db.search_vector import add_search_vector
 
 class Post(Base):
     __tablename__ = "posts"
+    __table_args__ = (
+        # Keyset pagination: (created_at, id) within each listing filter
+        Index("ix_posts_created_at_id", "created_at", "id"),
+        Index("ix_posts_community_id_created_at_id", "community_id", "created_at", "id"),
+        Index("ix_posts_author_id_created_at_id", "author_id", "created_at", "id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String, index=True)
@@ -12,11 +19,24 @@ class Post(Base):
     author_id = Column(Integer, ForeignKey("users.id"))
     community_id = Column(Integer, ForeignKey("communities.id"))
     is_announcement = Column(Boolean, default=False)
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    # Denormalized counters, maintained by CRUDLike and CRUDComment
+    likes_count = Column(Integer, nullable=False, default=0, server_default="0")
+    comments_count = Column(Integer, nullable=False, default=0, server_default="0")
+    created_at = Column(DateTime(timezone=True), default=utcnow, server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
-    # Relationships
-    author = relationship("User", back_populates="posts")
-    community = relationship("Community", back_populates="posts")
-    comments = relationship("Comment", back_populates="post", cascade="all, delete-orphan")
-    likes = relationship("Like", back_populates="post", cascade="all, delete-orphan") 
\ No newline at end of file
+    # Relationships. Collections are never loaded to delete a post;
+    # CRUDPost.remove deletes the child rows in bulk first.
+    author = relationship("User", back_populates="posts", lazy=LAZY_LOAD)
+    community = relationship("Community", back_populates="posts", lazy=LAZY_LOAD)
+    comments = relationship(
+        "Comment", back_populates="post", cascade="all, delete-orphan",
+        passive_deletes=True, lazy=LAZY_LOAD
+    )
+    likes = relationship(
+        "Like", back_populates="post", cascade="all, delete-orphan",
+        passive_deletes=True, lazy=LAZY_LOAD
+    )
+
+# Weights must match app.crud.search.DOCUMENTS
+add_search_vector(Post.__table__, "title", "content")
@@ -0,0 +1,22 @@
+from sqlalchemy import Column, Integer, DateTime, ForeignKey, Index
+from app.db.base_class import Base
+
+class TimelineEntry(Base):
+    """
+    Materialized home timeline: one row per (member, post) for posts in the
+    communities a user belongs to, written when the post is created.
+    """
+    __tablename__ = "timeline_entries"
+    __table_args__ = (
+        # Home feed keyset scan: (user_id, created_at, post_id)
+        Index("ix_timeline_entries_user_id_created_at_post_id", "user_id", "created_at", "post_id"),
+        Index("ix_timeline_entries_community_id", "community_id"),
+        # CRUDTimeline.remove_post; the primary key leads with user_id
+        Index("ix_timeline_entries_post_id", "post_id"),
+    )
+
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    post_id = Column(Integer, ForeignKey("posts.id", ondelete="CASCADE"), primary_key=True)
+    community_id = Column(Integer, ForeignKey("communities.id", ondelete="CASCADE"), nullable=False)
+    # Copied from posts.created_at so the feed is ordered without a join
+    created_at = Column(DateTime(timezone=True), nullable=False)
@@ -1,26 +1,34 @@
-from sqlalchemy import Boolean, Column, Integer, String, DateTime
+from sqlalchemy import Boolean, Column, Integer, String, DateTime, Index
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
-from app.db.base_class import Base
+from app.db.base_class import Base, LAZY_LOAD, utcnow
 
 class User(Base):
     __tablename__ = "users"
+    __table_args__ = (
+        Index("ix_users_created_at_id", "created_at", "id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     email = Column(String, unique=True, index=True, nullable=False)
     name = Column(String, nullable=False)
     hashed_password = Column(String, nullable=False)
     is_active = Column(Boolean, default=True)
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    created_at = Column(DateTime(timezone=True), default=utcnow, server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
-    # Relationships
-    posts = relationship("Post", back_populates="author")
-    comments = relationship("Comment", back_populates="author")
-    likes = relationship("Like", back_populates="user")
-    owned_communities = relationship("Community", back_populates="created_by")
+    # Relationships. Collections are never loaded to delete a user;
+    # CRUDUser.remove detaches content and drops memberships in bulk first.
+    posts = relationship("Post", back_populates="author", passive_deletes=True, lazy=LAZY_LOAD)
+    comments = relationship("Comment", back_populates="author", passive_deletes=True, lazy=LAZY_LOAD)
+    likes = relationship("Like", back_populates="user", passive_deletes=True, lazy=LAZY_LOAD)
+    owned_communities = relationship(
+        "Community", back_populates="created_by", passive_deletes=True, lazy=LAZY_LOAD
+    )
     communities = relationship(
         "Community",
         secondary="community_members",
-        back_populates="members"
+        back_populates="members",
+        passive_deletes=True,
+        lazy=LAZY_LOAD
     )
\ No newline at end of file
@@ -1,14 +1,15 @@
 from .user import User, UserCreate, UserUpdate, UserInDB, UserBase
 from .token import Token, TokenPayload
-from .post import Post, PostCreate, PostUpdate, PostInDB, PostWithComments
-from .comment import Comment, CommentCreate, CommentUpdate
-from .like import Like, LikeCreate
+from .post import Post, PostCreate, PostUpdate, PostInDB, PostWithComments, PostDetail
+from .comment import Comment, CommentCreate, CommentUpdate, CommentWithAuthor
+from .like import Like, LikeCreate, LikeStatus
 from .community import (
     Community,
     CommunityCreate,
     CommunityUpdate,
     CommunityInDB,
     CommunityWithMembers,
+    CommunityMember,
     CommunityMemberAdd,
     CommunityMemberRemove,
     CommunityMinimal
@@ -28,17 +29,21 @@ __all__ = [
     "PostUpdate",
     "PostInDB",
     "PostWithComments",
+    "PostDetail",
     "Comment",
     "CommentCreate",
     "CommentUpdate",
+    "CommentWithAuthor",
     "Like",
     "LikeCreate",
+    "LikeStatus",
     # Add Community schemas
     "Community",
     "CommunityCreate",
     "CommunityUpdate",
     "CommunityInDB",
     "CommunityWithMembers",
+    "CommunityMember",
     "CommunityMemberAdd",
     "CommunityMemberRemove",
     "CommunityMinimal"
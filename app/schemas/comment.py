@@ -1,6 +1,7 @@
 from typing import Optional
 from datetime import datetime
 from pydantic import BaseModel
+from .user import User
 
 class CommentBase(BaseModel):
     content: Optional[str] = None
@@ -20,6 +21,10 @@ class CommentInDBBase(CommentBase):
 
     class Config:
         from_attributes = True
+        orm_mode = True
 
 class Comment(CommentInDBBase):
-    pass 
\ No newline at end of file
+    pass
+
+class CommentWithAuthor(Comment):
+    author: Optional[User] = None 
\ No newline at end of file
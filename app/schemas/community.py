@@ -24,6 +24,7 @@ class CommunityInDB(CommunityBase):
 
     class Config:
         from_attributes = True
+        orm_mode = True
 
 class Community(CommunityInDB):
     members_count: int = 0
@@ -33,12 +34,24 @@ class Community(CommunityInDB):
 
     class Config:
         from_attributes = True
+        orm_mode = True
+
+class CommunityMember(UserBase):
+    id: int
+    joined_at: datetime
+
+    class Config:
+        from_attributes = True
+        orm_mode = True
 
 class CommunityWithMembers(Community):
-    members: List["UserBase"] = []
+    # Only the latest COMMUNITY_MEMBERS_PREVIEW members; the full list is
+    # paged through GET /communities/{community_id}/members
+    recent_members: List[CommunityMember] = []
 
     class Config:
         from_attributes = True
+        orm_mode = True
 
 # For handling member operations
 class CommunityMemberAdd(BaseModel):
@@ -55,3 +68,4 @@ class CommunityMinimal(BaseModel):
 
     class Config:
         from_attributes = True
+        orm_mode = True
@@ -19,6 +19,12 @@ class LikeInDBBase(LikeBase):
 
     class Config:
         from_attributes = True
+        orm_mode = True
 
 class Like(LikeInDBBase):
-    pass 
\ No newline at end of file
+    pass
+
+class LikeStatus(BaseModel):
+    post_id: int
+    likes_count: int
+    is_liked: bool
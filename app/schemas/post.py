@@ -2,7 +2,7 @@ from typing import Optional, List
 from datetime import datetime
 from pydantic import BaseModel
 from .user import User
-from .comment import Comment
+from .comment import Comment, CommentWithAuthor
 from .community import CommunityMinimal
 
 class PostBase(BaseModel):
@@ -27,6 +27,7 @@ class PostInDBBase(PostBase):
 
     class Config:
         from_attributes = True
+        orm_mode = True
 
 class Post(PostInDBBase):
     author: Optional[User] = None
@@ -36,7 +37,14 @@ class Post(PostInDBBase):
     is_liked: Optional[bool] = False
 
 class PostWithComments(Post):
+    # List endpoints embed only the latest FEED_COMMENT_PREVIEW comments;
+    # comments_count is the total
     comments: List[Comment] = []
 
+class PostDetail(Post):
+    # First page of the thread, oldest first; the X-Next-Cursor header
+    # continues it at GET /comments/post/{post_id}
+    comments: List[CommentWithAuthor] = []
+
 class PostInDB(PostInDBBase):
     pass 
\ No newline at end of file
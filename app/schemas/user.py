@@ -7,6 +7,10 @@ class UserBase(BaseModel):
     email: str = Field(..., pattern=r"^[a-zA-Z0-9_.+-]+@[a-zA-Z0-9-]+\.[a-zA-Z0-9-.]+$")
     name: Optional[str] = None
 
+    class Config:
+        from_attributes = True
+        orm_mode = True
+
 class UserCreate(UserBase):
     password: str
     name: str
@@ -20,10 +24,12 @@ class UserInDBBase(UserBase):
 
     class Config:
         from_attributes = True
+        orm_mode = True
 
 class User(UserInDBBase):
     class Config:
         from_attributes = True
+        orm_mode = True
         json_encoders = {
             datetime: lambda v: v.isoformat() if v else None
         }
@@ -33,6 +39,7 @@ class UserInDB(UserInDBBase):
 
     class Config:
         from_attributes = True
+        orm_mode = True
 
 class UserResponse(BaseModel):
     user: User
@@ -40,4 +47,5 @@ class UserResponse(BaseModel):
     token_type: str
 
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+        orm_mode = True
\ No newline at end of file
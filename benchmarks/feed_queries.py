@@ -0,0 +1,149 @@
+"""
+Feed query benchmark: per-post likes hydration vs CRUDPost.get_feed.
+
+Seeds an in-memory SQLite database (or the scratch database given with
+--database-url) with a page of posts and a growing number of likes per post,
+then reports statements per request and p50/p95 latency for both strategies.
+The schema is dropped after each run, so a --database-url that already has
+the app's tables is refused unless --drop is passed.
+
+    python benchmarks/feed_queries.py --posts 100 --likes 0 10 100 1000
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+
+from sqlalchemy import create_engine, event, inspect
+from sqlalchemy.orm import lazyload, sessionmaker
+from sqlalchemy.pool import StaticPool
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import crud, models
+from app.db.base_class import Base
+
+
+def make_engine(url):
+    if url is None:
+        return create_engine(
+            "sqlite://",
+            connect_args={"check_same_thread": False},
+            poolclass=StaticPool,
+        )
+    return create_engine(url)
+
+
+def seed(db, *, posts, likes_per_post):
+    users = [
+        models.User(email=f"bench{i}@example.com", name=f"bench{i}", hashed_password="x")
+        for i in range(max(likes_per_post, 1))
+    ]
+    db.add_all(users)
+    db.flush()
+    community = models.Community(name="bench", slug="bench", created_by_id=users[0].id)
+    db.add(community)
+    db.flush()
+    for n in range(posts):
+        post = models.Post(
+            title=f"post {n}",
+            content="lorem ipsum",
+            author_id=users[0].id,
+            community_id=community.id,
+            likes_count=likes_per_post,
+            comments_count=3,
+        )
+        db.add(post)
+        db.flush()
+        db.add_all(models.Like(user_id=u.id, post_id=post.id) for u in users[:likes_per_post])
+        db.add_all(
+            models.Comment(content="comment", author_id=users[0].id, post_id=post.id)
+            for _ in range(3)
+        )
+    db.commit()
+    return users[0].id
+
+
+def legacy_feed(db, user_id, limit):
+    # Relationships raise on lazy load by default; opt back in to show the N+1
+    posts = db.query(models.Post).options(lazyload("*")).limit(limit).all()
+    for post in posts:
+        post.likes_count = len(post.likes)
+        post.is_liked = any(like.user_id == user_id for like in post.likes)
+        # PostWithComments serialization touches these as well
+        post.author, post.community, list(post.comments)
+    return posts
+
+
+def aggregate_feed(db, user_id, limit):
+    posts, _ = crud.post.get_feed(db, user_id=user_id, limit=limit)
+    return posts
+
+
+def measure(SessionLocal, engine, fn, user_id, limit, repeat):
+    counter = {"n": 0}
+
+    def count(*args):
+        counter["n"] += 1
+
+    event.listen(engine, "before_cursor_execute", count)
+    timings = []
+    queries = 0
+    try:
+        for _ in range(repeat):
+            db = SessionLocal()
+            counter["n"] = 0
+            start = time.perf_counter()
+            fn(db, user_id, limit)
+            timings.append((time.perf_counter() - start) * 1000)
+            queries = counter["n"]
+            db.close()
+    finally:
+        event.remove(engine, "before_cursor_execute", count)
+    timings.sort()
+    p95 = timings[min(len(timings) - 1, int(len(timings) * 0.95))]
+    return queries, statistics.median(timings), p95
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--database-url", default=None)
+    parser.add_argument("--drop", action="store_true",
+                        help="drop the app's existing tables in --database-url")
+    parser.add_argument("--posts", type=int, default=100)
+    parser.add_argument("--likes", type=int, nargs="+", default=[0, 10, 100, 500])
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    if args.database_url is not None and not args.drop:
+        engine = make_engine(args.database_url)
+        existing = set(inspect(engine).get_table_names()) & set(Base.metadata.tables)
+        engine.dispose()
+        if existing:
+            sys.exit(
+                f"Refusing to benchmark: {args.database_url} already has "
+                f"{', '.join(sorted(existing))}; use a scratch database or pass --drop"
+            )
+
+    print(f"{'likes/post':>10} {'strategy':>10} {'queries':>8} {'p50 ms':>9} {'p95 ms':>9}")
+    for likes_per_post in args.likes:
+        engine = make_engine(args.database_url)
+        Base.metadata.drop_all(engine)
+        Base.metadata.create_all(engine)
+        SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+        db = SessionLocal()
+        user_id = seed(db, posts=args.posts, likes_per_post=likes_per_post)
+        db.close()
+
+        for name, fn in (("legacy", legacy_feed), ("aggregate", aggregate_feed)):
+            queries, p50, p95 = measure(
+                SessionLocal, engine, fn, user_id, args.posts, args.repeat
+            )
+            print(f"{likes_per_post:>10} {name:>10} {queries:>8} {p50:>9.2f} {p95:>9.2f}")
+        Base.metadata.drop_all(engine)
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
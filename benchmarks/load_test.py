@@ -0,0 +1,224 @@
+"""
+Concurrent load test against one or more running API instances.
+
+By default --concurrency asyncio workers run a weighted mix of scenarios
+(feeds, community listings, like toggling, post detail, login) for
+--duration seconds. With --isolated each scenario gets the workers to
+itself in turn. Requests per second and latency percentiles are reported
+per base URL and scenario, so the same load can be compared across
+deployments, or against a saved run with --baseline.
+
+Workers log in as users created by scripts/seed_data.py (--seeded-users),
+or as a single registered --email account when that is 0.
+
+    pip install -r benchmarks/requirements.txt
+    python scripts/seed_data.py --database-url sqlite:///./seed.db --create-schema
+    python benchmarks/load_test.py --seeded-users 50 --output before.json
+    python benchmarks/load_test.py --seeded-users 50 --baseline before.json
+"""
+import argparse
+import asyncio
+import json
+import random
+import statistics
+import time
+from collections import defaultdict
+
+import httpx
+
+API = "/api/v1"
+
+# Share of requests per scenario in the mixed run
+DEFAULT_MIX = {
+    "feed": 25,
+    "feed_anonymous": 10,
+    "home_feed": 15,
+    "communities": 15,
+    "like_toggle": 20,
+    "post_detail": 10,
+    "login": 5,
+}
+
+
+async def login(client, email, password):
+    response = await client.post(
+        f"{API}/auth/login", data={"username": email, "password": password}
+    )
+    response.raise_for_status()
+    return response.json()["access_token"]
+
+
+async def ensure_token(client, email, password):
+    await client.post(
+        f"{API}/auth/register",
+        json={"email": email, "name": "load test", "password": password},
+    )
+    return await login(client, email, password)
+
+
+class Account:
+    def __init__(self, email, password, token):
+        self.email = email
+        self.password = password
+        self.auth = {"Authorization": f"Bearer {token}"}
+        # post id -> liked, as last reported by the likes endpoints
+        self.liked = {}
+
+
+async def like_toggle(client, account, post_ids):
+    post_id = random.choice(post_ids)
+    if account.liked.get(post_id):
+        response = await client.delete(f"{API}/likes/post/{post_id}", headers=account.auth)
+    else:
+        response = await client.post(f"{API}/likes/post/{post_id}", headers=account.auth)
+    if response.status_code == 200:
+        account.liked[post_id] = response.json()["is_liked"]
+    return response
+
+
+def scenarios(post_ids):
+    """Scenario name -> coroutine function (client, account) -> response."""
+    return {
+        "login": lambda c, a: c.post(
+            f"{API}/auth/login", data={"username": a.email, "password": a.password}
+        ),
+        "feed": lambda c, a: c.get(f"{API}/posts/", params={"limit": 20}, headers=a.auth),
+        "feed_anonymous": lambda c, a: c.get(f"{API}/posts/", params={"limit": 20}),
+        "home_feed": lambda c, a: c.get(f"{API}/posts/feed", params={"limit": 20}, headers=a.auth),
+        "communities": lambda c, a: c.get(f"{API}/communities/", params={"limit": 20}, headers=a.auth),
+        "my_communities": lambda c, a: c.get(f"{API}/communities/my", params={"limit": 20}, headers=a.auth),
+        "post_detail": lambda c, a: c.get(f"{API}/posts/{random.choice(post_ids)}", headers=a.auth),
+        "like_toggle": lambda c, a: like_toggle(c, a, post_ids),
+    }
+
+
+async def run_load(client, accounts, requests, weights, concurrency, duration):
+    """
+    Run workers that each pick a scenario by weight per request. Returns
+    latencies and error counts per scenario and the elapsed time.
+    """
+    latencies = defaultdict(list)
+    errors = defaultdict(int)
+    names = list(weights)
+    deadline = time.perf_counter() + duration
+
+    async def worker(account):
+        while time.perf_counter() < deadline:
+            name = random.choices(names, weights=[weights[n] for n in names])[0]
+            start = time.perf_counter()
+            try:
+                response = await requests[name](client, account)
+                if response.status_code >= 400:
+                    errors[name] += 1
+            except httpx.HTTPError:
+                errors[name] += 1
+            latencies[name].append((time.perf_counter() - start) * 1000)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker(accounts[i % len(accounts)]) for i in range(concurrency)))
+    return latencies, errors, time.perf_counter() - started
+
+
+def percentile(sorted_values, p):
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(len(sorted_values) * p))]
+
+
+def summarize(latencies, errors, elapsed):
+    results = {}
+    for name, values in latencies.items():
+        values.sort()
+        results[name] = {
+            "requests": len(values),
+            "rps": len(values) / elapsed,
+            "p50": statistics.median(values),
+            "p95": percentile(values, 0.95),
+            "p99": percentile(values, 0.99),
+            "errors": errors[name],
+        }
+    return results
+
+
+def change(current, previous):
+    if not previous:
+        return ""
+    return f"{(current - previous) / previous * 100:+.0f}%"
+
+
+def print_results(base_url, results, baseline):
+    for name, row in sorted(results.items()):
+        print(
+            f"{base_url:<28} {name:<15} {row['rps']:>8.1f} {row['p50']:>8.1f} "
+            f"{row['p95']:>8.1f} {row['p99']:>8.1f} {row['errors']:>7}",
+            end="",
+        )
+        before = baseline.get(base_url, {}).get(name)
+        if before:
+            print(f"   rps {change(row['rps'], before['rps']):>6}  p95 {change(row['p95'], before['p95']):>6}", end="")
+        print()
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--base-url", nargs="+", default=["http://localhost:8000"])
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--duration", type=float, default=15.0)
+    parser.add_argument("--scenario", nargs="+", default=list(DEFAULT_MIX),
+                        help="scenarios to run; weights come from the default mix")
+    parser.add_argument("--isolated", action="store_true",
+                        help="run each scenario on its own instead of mixed")
+    parser.add_argument("--seeded-users", type=int, default=0,
+                        help="log in as seed1..N@example.com from scripts/seed_data.py")
+    parser.add_argument("--email", default="loadtest@example.com")
+    parser.add_argument("--password", default=None,
+                        help="defaults to seed-password with --seeded-users, else loadtest-password")
+    parser.add_argument("--output", help="write results as JSON")
+    parser.add_argument("--baseline", help="JSON from a previous --output run to compare against")
+    args = parser.parse_args()
+
+    baseline = {}
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+
+    print(f"{'base url':<28} {'scenario':<15} {'rps':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'errors':>7}")
+    limits = httpx.Limits(max_connections=args.concurrency)
+    all_results = {}
+    for base_url in args.base_url:
+        async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=30) as client:
+            if args.seeded_users:
+                password = args.password or "seed-password"
+                emails = [f"seed{i}@example.com" for i in range(1, args.seeded_users + 1)]
+                tokens = await asyncio.gather(*(login(client, email, password) for email in emails))
+            else:
+                password = args.password or "loadtest-password"
+                emails = [args.email]
+                tokens = [await ensure_token(client, args.email, password)]
+            accounts = [Account(email, password, token) for email, token in zip(emails, tokens)]
+
+            page = await client.get(f"{API}/posts/", params={"limit": 100}, headers=accounts[0].auth)
+            page.raise_for_status()
+            post_ids = [post["id"] for post in page.json()]
+            if not post_ids:
+                raise SystemExit(f"{base_url} has no posts; seed it with scripts/seed_data.py")
+            requests = scenarios(post_ids)
+
+            results = {}
+            groups = [[name] for name in args.scenario] if args.isolated else [args.scenario]
+            for group in groups:
+                weights = {name: DEFAULT_MIX.get(name, 1) for name in group}
+                latencies, errors, elapsed = await run_load(
+                    client, accounts, requests, weights, args.concurrency, args.duration
+                )
+                results.update(summarize(latencies, errors, elapsed))
+            print_results(base_url, results, baseline)
+            all_results[base_url] = results
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(all_results, f, indent=2)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
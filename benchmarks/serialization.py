@@ -0,0 +1,123 @@
+"""
+Serialization benchmark: response_model + jsonable_encoder vs projection + orjson.
+
+Seeds an in-memory SQLite database with pages of posts, each with an author,
+a community and a few comments, loads one page with CRUDPost.get_feed and
+reports the CPU time spent turning it into a JSON body with FastAPI's
+default path and with the FAST_JSON_RESPONSES path. Both bodies are checked
+to decode to the same document.
+
+    python benchmarks/serialization.py --posts 100 --comments 0 3 10
+"""
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+import time
+from typing import List
+
+from fastapi.responses import JSONResponse, ORJSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_response_field
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import crud, models, schemas
+from app.api.serialization import projection
+from app.db.base_class import Base
+
+
+def seed(db, *, posts, comments_per_post):
+    user = models.User(email="bench@example.com", name="bench", hashed_password="x")
+    db.add(user)
+    db.flush()
+    community = models.Community(name="bench", slug="bench", created_by_id=user.id)
+    db.add(community)
+    db.flush()
+    for n in range(posts):
+        post = models.Post(
+            title=f"post {n}",
+            content="lorem ipsum dolor sit amet " * 8,
+            author_id=user.id,
+            community_id=community.id,
+            comments_count=comments_per_post,
+        )
+        db.add(post)
+        db.flush()
+        db.add_all(
+            models.Comment(content="comment", author_id=user.id, post_id=post.id)
+            for _ in range(comments_per_post)
+        )
+    db.commit()
+    return user.id
+
+
+def response_model_body(loop, field, posts):
+    content = loop.run_until_complete(serialize_response(field=field, response_content=posts))
+    return JSONResponse(content).body
+
+
+def projection_body(posts):
+    return ORJSONResponse(projection(schemas.PostWithComments).many(posts)).body
+
+
+def measure(fn, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.process_time()
+        fn()
+        timings.append((time.process_time() - start) * 1000)
+    timings.sort()
+    p95 = timings[min(len(timings) - 1, int(len(timings) * 0.95))]
+    return statistics.median(timings), p95
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--posts", type=int, default=100)
+    parser.add_argument("--comments", type=int, nargs="+", default=[0, 3, 10])
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    loop = asyncio.new_event_loop()
+    field = create_response_field(
+        name="Response_read_posts", type_=List[schemas.PostWithComments]
+    )
+
+    print(f"{'comments/post':>13} {'path':>15} {'bytes':>8} {'p50 ms':>9} {'p95 ms':>9}")
+    for comments_per_post in args.comments:
+        engine = create_engine(
+            "sqlite://",
+            connect_args={"check_same_thread": False},
+            poolclass=StaticPool,
+        )
+        Base.metadata.create_all(engine)
+        SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+        db = SessionLocal()
+        user_id = seed(db, posts=args.posts, comments_per_post=comments_per_post)
+        db.close()
+
+        db = SessionLocal()
+        posts, _ = crud.post.get_feed(db, user_id=user_id, limit=args.posts)
+        # Load any lazy relationships up front so only serialization is timed
+        baseline = response_model_body(loop, field, posts)
+        fast = projection_body(posts)
+        assert json.loads(baseline) == json.loads(fast), "serialized bodies differ"
+
+        for name, fn, body in (
+            ("response_model", lambda: response_model_body(loop, field, posts), baseline),
+            ("orjson", lambda: projection_body(posts), fast),
+        ):
+            p50, p95 = measure(fn, args.repeat)
+            print(f"{comments_per_post:>13} {name:>15} {len(body):>8} {p50:>9.2f} {p95:>9.2f}")
+        db.close()
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,260 @@
+"""
+Run every CRUD query shape against a seeded database, EXPLAIN each
+statement it issues and report the ones that scan a whole table.
+
+By default the schema is created from the models in an in-memory SQLite
+database. Pass --database-url to check a local Postgres database migrated
+with `alembic upgrade head`; point it at a scratch database, as the
+advisor seeds it. On Postgres sequential scans are disabled for the
+EXPLAIN, so a Seq Scan in the plan means no index can serve the query,
+whatever the table sizes. The search checks always scan on SQLite, whose
+fallback matches terms with LIKE; on Postgres they use the GIN indexes.
+
+    python scripts/index_advisor.py
+    python scripts/index_advisor.py --database-url postgresql://localhost/healthspace_scratch
+
+Exits with status 1 when any statement scans a table.
+"""
+import argparse
+import json
+import os
+import sys
+from datetime import datetime, timedelta
+from typing import Any, Callable, List, NamedTuple, Set, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# app.db.session builds its engine on import; the advisor uses its own
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+from sqlalchemy import create_engine, event, insert, select, text
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app import crud, models, schemas
+from app.db.base_class import Base
+from app.db.unit_of_work import begin_unit_of_work
+from app.models.community import community_members
+
+
+class Sample(NamedTuple):
+    """Seeded rows for the checks to query by."""
+    user_id: int
+    email: str
+    community_id: int
+    slug: str
+    post_id: int
+    comment_id: int
+
+
+def seed(db: Session, *, users: int, communities: int, posts: int) -> Sample:
+    start = datetime(2026, 1, 1)
+    db.execute(insert(models.User), [
+        {"id": i, "email": f"advisor{i}@example.com", "name": f"advisor{i}",
+         "hashed_password": "x", "created_at": start + timedelta(seconds=i)}
+        for i in range(1, users + 1)
+    ])
+    db.execute(insert(models.Community), [
+        {"id": i, "name": f"community {i}", "slug": f"community-{i}",
+         "created_by_id": i % users + 1, "created_at": start + timedelta(seconds=i)}
+        for i in range(1, communities + 1)
+    ])
+    db.execute(insert(community_members), [
+        {"community_id": c, "user_id": u}
+        for c in range(1, communities + 1)
+        for u in range(c % 7 + 1, users + 1, 7)
+    ])
+    db.execute(insert(models.Post), [
+        {"id": i, "title": f"post {i}", "content": "lorem ipsum", "author_id": i % users + 1,
+         "community_id": i % communities + 1, "is_announcement": i % 50 == 0,
+         "created_at": start + timedelta(seconds=i)}
+        for i in range(1, posts + 1)
+    ])
+    db.execute(insert(models.Comment), [
+        {"id": i, "content": "comment", "author_id": i % users + 1,
+         "post_id": i % posts + 1, "created_at": start + timedelta(seconds=i)}
+        for i in range(1, posts * 2 + 1)
+    ])
+    db.execute(insert(models.Like), [
+        {"user_id": u, "post_id": p}
+        for p in range(1, posts + 1, 3)
+        for u in range(p % 5 + 1, users + 1, max(users // 10, 1))
+    ])
+    db.execute(
+        insert(models.TimelineEntry).from_select(
+            ["user_id", "post_id", "community_id", "created_at"],
+            select(
+                community_members.c.user_id,
+                models.Post.id,
+                models.Post.community_id,
+                models.Post.created_at,
+            ).join(
+                community_members,
+                community_members.c.community_id == models.Post.community_id,
+            ),
+        )
+    )
+    db.commit()
+    return Sample(
+        user_id=1,
+        email="advisor1@example.com",
+        community_id=1,
+        slug="community-1",
+        post_id=posts // 2,
+        comment_id=1,
+    )
+
+
+Check = Tuple[str, Callable[[Session, Sample], Any]]
+
+# One entry per CRUD query shape. Writes run inside a unit of work that is
+# rolled back afterwards.
+CHECKS: List[Check] = [
+    ("user.get_by_email", lambda db, s: crud.user.get_by_email(db, email=s.email)),
+    ("user.get_page", lambda db, s: crud.user.get_page(db, limit=20)),
+    ("post.get_feed", lambda db, s: crud.post.get_feed(db, user_id=s.user_id, limit=20)),
+    ("post.get_feed(community_id)", lambda db, s: crud.post.get_feed(
+        db, user_id=s.user_id, community_id=s.community_id, limit=20)),
+    ("post.get_feed(author_id)", lambda db, s: crud.post.get_feed(
+        db, user_id=s.user_id, author_id=s.user_id, limit=20)),
+    ("post.get_home_feed", lambda db, s: crud.post.get_home_feed(db, user_id=s.user_id, limit=20)),
+    ("post.get_announcements", lambda db, s: crud.post.get_announcements(db, limit=20)),
+    ("post.search", lambda db, s: crud.post.search(db, query="lorem", user_id=s.user_id, limit=20)),
+    ("post.get_by_author", lambda db, s: crud.post.get_by_author(db, author_id=s.user_id, limit=20)),
+    ("post.get_by_community", lambda db, s: crud.post.get_by_community(
+        db, community_id=s.community_id, limit=20)),
+    ("comment.get_by_post", lambda db, s: crud.comment.get_by_post(db, post_id=s.post_id, limit=20)),
+    ("comment.get_page_with_authors", lambda db, s: crud.comment.get_page_with_authors(
+        db, post_id=s.post_id, limit=20)),
+    ("comment.get_by_author", lambda db, s: crud.comment.get_by_author(
+        db, author_id=s.user_id, limit=20)),
+    ("like.get_by_user_and_post", lambda db, s: crud.like.get_by_user_and_post(
+        db, user_id=s.user_id, post_id=s.post_id)),
+    ("like.get_by_post", lambda db, s: crud.like.get_by_post(db, post_id=s.post_id, limit=20)),
+    ("like.get_by_user", lambda db, s: crud.like.get_by_user(db, user_id=s.user_id, limit=20)),
+    ("community.get_page", lambda db, s: crud.community.get_page(db, limit=20)),
+    ("community.get_by_slug", lambda db, s: crud.community.get_by_slug(db, slug=s.slug)),
+    ("community.get_multi_by_owner", lambda db, s: crud.community.get_multi_by_owner(
+        db, owner_id=s.user_id, limit=20)),
+    ("community.get_user_communities", lambda db, s: crud.community.get_user_communities(
+        db, user_id=s.user_id, limit=20)),
+    ("community.get_members", lambda db, s: crud.community.get_members(
+        db, community_id=s.community_id, limit=20)),
+    ("community.get_memberships", lambda db, s: crud.community.get_memberships(
+        db, community_ids=[s.community_id], user_id=s.user_id)),
+    ("community.search_communities", lambda db, s: crud.community.search_communities(
+        db, query="community", limit=20)),
+    ("timeline.get_page", lambda db, s: crud.timeline.get_page(db, user_id=s.user_id, limit=20)),
+    ("post.create_with_owner", lambda db, s: crud.post.create_with_owner(
+        db, obj_in=schemas.PostCreate(title="advisor", content="x", community_id=s.community_id),
+        owner_id=s.user_id)),
+    ("post.remove", lambda db, s: crud.post.remove(db, id=s.post_id)),
+    ("comment.create_with_owner", lambda db, s: crud.comment.create_with_owner(
+        db, obj_in=schemas.CommentCreate(content="x"), owner_id=s.user_id, post_id=s.post_id)),
+    ("comment.remove", lambda db, s: crud.comment.remove(db, id=s.comment_id)),
+    ("like.like_post", lambda db, s: crud.like.like_post(db, user_id=s.user_id, post_id=s.post_id)),
+    ("like.unlike_post", lambda db, s: crud.like.unlike_post(db, user_id=s.user_id, post_id=s.post_id)),
+    ("community.add_member", lambda db, s: crud.community.add_member(
+        db, community_id=s.community_id, user_id=s.user_id)),
+    ("community.remove_member", lambda db, s: crud.community.remove_member(
+        db, community_id=s.community_id, user_id=s.user_id)),
+    ("community.remove", lambda db, s: crud.community.remove(db, id=s.community_id)),
+    ("user.remove", lambda db, s: crud.user.remove(db, id=s.user_id)),
+]
+
+
+def capture(db: Session, fn: Callable[[], Any]) -> List[Tuple[str, Any]]:
+    """Run fn and return the (statement, parameters) pairs it executed."""
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if not executemany:
+            statements.append((statement, parameters))
+
+    engine = db.get_bind()
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        fn()
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+    return statements
+
+
+def sequential_scans(db: Session, statement: str, parameters: Any) -> Set[str]:
+    """Tables the statement's plan reads in full."""
+    conn = db.connection()
+    tables = set()
+    if conn.dialect.name == "postgresql":
+        plan = conn.exec_driver_sql("EXPLAIN (FORMAT JSON) " + statement, parameters).scalar()
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        nodes = [plan[0]["Plan"]]
+        while nodes:
+            node = nodes.pop()
+            if node["Node Type"] == "Seq Scan":
+                tables.add(node["Relation Name"])
+            nodes.extend(node.get("Plans", []))
+    else:
+        for row in conn.exec_driver_sql("EXPLAIN QUERY PLAN " + statement, parameters):
+            # e.g. "SCAN posts", as opposed to "SEARCH posts USING INDEX ..."
+            detail = row[-1].split()
+            if detail[0] == "SCAN" and detail[1] in Base.metadata.tables and "USING" not in detail:
+                tables.add(detail[1])
+    return tables
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--database-url", default=None)
+    parser.add_argument("--users", type=int, default=500)
+    parser.add_argument("--communities", type=int, default=50)
+    parser.add_argument("--posts", type=int, default=5000)
+    args = parser.parse_args()
+
+    if args.database_url is None:
+        engine = create_engine(
+            "sqlite://",
+            connect_args={"check_same_thread": False},
+            poolclass=StaticPool,
+        )
+        Base.metadata.create_all(engine)
+    else:
+        engine = create_engine(args.database_url)
+    SessionLocal = sessionmaker(autocommit=False, autoflush=False, expire_on_commit=False, bind=engine)
+
+    db = SessionLocal()
+    sample = seed(db, users=args.users, communities=args.communities, posts=args.posts)
+    if engine.dialect.name == "postgresql":
+        db.execute(text("ANALYZE"))
+        db.commit()
+    db.close()
+
+    findings = 0
+    for name, check in CHECKS:
+        db = SessionLocal()
+        begin_unit_of_work(db)
+        try:
+            if engine.dialect.name == "postgresql":
+                db.execute(text("SET LOCAL enable_seqscan = off"))
+            statements = capture(db, lambda: check(db, sample))
+            scans = []
+            for statement, parameters in statements:
+                tables = sequential_scans(db, statement, parameters)
+                if tables:
+                    scans.append((tables, statement))
+        finally:
+            db.rollback()
+            db.close()
+
+        status = "SCAN" if scans else "ok"
+        print(f"{status:<5} {name} ({len(statements)} statements)")
+        for tables, statement in scans:
+            findings += 1
+            print(f"      seq scan on {', '.join(sorted(tables))}: {' '.join(statement.split())[:160]}")
+
+    print(f"{findings} statements with sequential scans")
+    engine.dispose()
+    return 1 if findings else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
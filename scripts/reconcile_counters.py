@@ -0,0 +1,33 @@
+"""
+Repair drift in the denormalized counters (posts.likes_count,
+posts.comments_count, communities.members_count) by recomputing them from
+the likes, comments and community_members tables.
+
+    python scripts/reconcile_counters.py
+"""
+import logging
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import crud
+from app.db.session import SessionLocal
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def main() -> None:
+    db = SessionLocal()
+    try:
+        posts_fixed = crud.post.reconcile_counters(db)
+        communities_fixed = crud.community.reconcile_members_count(db)
+    finally:
+        db.close()
+    logger.info(f"Reconciled counters on {posts_fixed} posts")
+    logger.info(f"Reconciled members_count on {communities_fixed} communities")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,272 @@
+"""
+Fill an empty database with synthetic, skewed data for load testing.
+
+Community sizes follow a Zipf distribution, most members of the large
+communities post there, and likes and comments per post are drawn from a
+Pareto distribution, so a handful of viral posts collect a large share of
+them. Rows are written with multi-row bulk inserts, denormalized counters
+are computed up front and home timelines are fanned out as CRUDTimeline
+would. Every user is seed<N>@example.com with the same --password, which
+benchmarks/load_test.py logs in with.
+
+    python scripts/seed_data.py --database-url sqlite:///./seed.db --create-schema
+    python scripts/seed_data.py --users 100000 --posts 1000000 --likes 5000000
+
+Without --database-url the configured DATABASE_URL is used. Postgres
+databases should be migrated with `alembic upgrade head` first.
+"""
+import argparse
+import logging
+import os
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, Iterator, List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine, func, insert, select, text
+from sqlalchemy.engine import Connection, Engine
+
+from app.core.config import settings
+from app.core.security import get_password_hash
+from app.db.base_class import Base
+from app.models.comment import Comment
+from app.models.community import Community, community_members
+from app.models.like import Like
+from app.models.post import Post
+from app.models.timeline import TimelineEntry
+from app.models.user import User
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+EMAIL = "seed{}@example.com"
+
+
+def power_law_counts(rng: random.Random, n: int, *, total: int, alpha: float, cap: int) -> List[int]:
+    """
+    Split about total over n items with Pareto(alpha) weights, each at most
+    cap. What the capped items cannot take goes to the others.
+    """
+    weights = [rng.paretovariate(alpha) for _ in range(n)]
+    counts = [0] * n
+    open_items = set(range(n))
+    remaining = min(total, cap * n)
+    while remaining > 0 and open_items:
+        scale = remaining / sum(weights[i] for i in open_items)
+        for i in list(open_items):
+            counts[i] += weights[i] * scale
+            if counts[i] >= cap:
+                counts[i] = cap
+                open_items.discard(i)
+        remaining = min(total, cap * n) - sum(counts)
+        if remaining < 1:
+            break
+    # Round at random so many small counts still add up to about total
+    return [int(count + rng.random()) for count in counts]
+
+
+def insert_batches(conn: Connection, table: Any, rows: Iterable[Dict[str, Any]], batch_size: int) -> int:
+    written = 0
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= batch_size:
+            conn.execute(insert(table), batch)
+            written += len(batch)
+            batch = []
+    if batch:
+        conn.execute(insert(table), batch)
+        written += len(batch)
+    return written
+
+
+def seed(engine: Engine, args: argparse.Namespace) -> None:
+    rng = random.Random(args.seed)
+    now = datetime.utcnow()
+    start = now - timedelta(days=args.days)
+    span = (now - start).total_seconds()
+    user_ids = range(1, args.users + 1)
+
+    # Communities: Zipf sizes, the largest holding --largest-community of all users
+    sizes = [
+        max(2, min(args.users, int(args.users * args.largest_community / rank ** args.zipf)))
+        for rank in range(1, args.communities + 1)
+    ]
+    members: List[List[int]] = [rng.sample(user_ids, size) for size in sizes]
+
+    # Posts: newest last, so ids follow created_at. Most go to communities in
+    # proportion to their size, the rest are global.
+    created = sorted(start + timedelta(seconds=rng.uniform(0, span)) for _ in range(args.posts))
+    communities = rng.choices(range(args.communities), weights=sizes, k=args.posts)
+    likes = power_law_counts(rng, args.posts, total=args.likes, alpha=args.alpha, cap=args.users)
+    comments = power_law_counts(rng, args.posts, total=args.comments, alpha=args.alpha, cap=args.max_comments)
+    hashed_password = get_password_hash(args.password)
+
+    def users() -> Iterator[Dict[str, Any]]:
+        for i in user_ids:
+            yield {
+                "id": i,
+                "email": EMAIL.format(i),
+                "name": f"Seed User {i}",
+                "hashed_password": hashed_password,
+                "is_active": True,
+                "created_at": start - timedelta(seconds=args.users - i),
+            }
+
+    def community_rows() -> Iterator[Dict[str, Any]]:
+        for i, member_ids in enumerate(members):
+            yield {
+                "id": i + 1,
+                "name": f"Community {i + 1}",
+                "slug": f"community-{i + 1}",
+                "description": f"Synthetic community with {sizes[i]} members",
+                "is_private": False,
+                "members_count": sizes[i],
+                "created_at": start,
+                "created_by_id": member_ids[0],
+            }
+
+    def membership_rows() -> Iterator[Dict[str, Any]]:
+        for i, member_ids in enumerate(members):
+            for user_id in member_ids:
+                yield {
+                    "community_id": i + 1,
+                    "user_id": user_id,
+                    "created_at": start + timedelta(seconds=rng.uniform(0, span)),
+                }
+
+    def post_rows() -> Iterator[Dict[str, Any]]:
+        for i in range(args.posts):
+            is_global = rng.random() < args.global_posts
+            community = communities[i]
+            yield {
+                "id": i + 1,
+                "title": f"Post {i + 1}",
+                "content": "Synthetic post body. " * rng.randint(1, 20),
+                "author_id": rng.randint(1, args.users) if is_global else rng.choice(members[community]),
+                "community_id": None if is_global else community + 1,
+                "is_announcement": rng.random() < 0.005,
+                "likes_count": likes[i],
+                "comments_count": comments[i],
+                "created_at": created[i],
+            }
+
+    def like_rows() -> Iterator[Dict[str, Any]]:
+        for i, count in enumerate(likes):
+            for user_id in rng.sample(user_ids, count):
+                yield {"user_id": user_id, "post_id": i + 1, "created_at": created[i]}
+
+    def comment_rows() -> Iterator[Dict[str, Any]]:
+        comment_id = 0
+        for i, count in enumerate(comments):
+            for _ in range(count):
+                comment_id += 1
+                yield {
+                    "id": comment_id,
+                    "content": "Synthetic comment.",
+                    "author_id": rng.randint(1, args.users),
+                    "post_id": i + 1,
+                    # Within a day of the post, but never in the future
+                    "created_at": min(now, created[i] + timedelta(seconds=rng.uniform(0, 86400))),
+                }
+
+    steps = [
+        ("users", User.__table__, users()),
+        ("communities", Community.__table__, community_rows()),
+        ("community_members", community_members, membership_rows()),
+        ("posts", Post.__table__, post_rows()),
+        ("likes", Like.__table__, like_rows()),
+        ("comments", Comment.__table__, comment_rows()),
+    ]
+    for name, table, rows in steps:
+        started = time.perf_counter()
+        with engine.begin() as conn:
+            written = insert_batches(conn, table, rows, args.batch_size)
+        logger.info(f"Inserted {written} {name} in {time.perf_counter() - started:.1f}s")
+
+    if not args.skip_timelines:
+        fan_out_timelines(engine)
+    report(sizes, likes)
+
+
+def fan_out_timelines(engine: Engine) -> None:
+    """Home timelines, for communities small enough to be fanned out on write."""
+    started = time.perf_counter()
+    with engine.begin() as conn:
+        result = conn.execute(
+            insert(TimelineEntry).from_select(
+                ["user_id", "post_id", "community_id", "created_at"],
+                select(
+                    community_members.c.user_id, Post.id, Post.community_id, Post.created_at
+                )
+                .join(community_members, community_members.c.community_id == Post.community_id)
+                .join(Community, Community.id == Post.community_id)
+                .where(Community.members_count <= settings.TIMELINE_FANOUT_MAX_MEMBERS),
+            )
+        )
+    logger.info(f"Inserted {result.rowcount} timeline_entries in {time.perf_counter() - started:.1f}s")
+
+
+def report(sizes: List[int], likes: List[int]) -> None:
+    top = sorted(likes, reverse=True)
+    logger.info(
+        f"Largest community: {sizes[0]} members; most liked posts: {top[:5]}; "
+        f"posts without likes: {likes.count(0)}"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--database-url", default=None)
+    parser.add_argument("--create-schema", action="store_true",
+                        help="create tables from the models (SQLite / scratch databases)")
+    parser.add_argument("--users", type=int, default=10000)
+    parser.add_argument("--communities", type=int, default=200)
+    parser.add_argument("--posts", type=int, default=100000)
+    parser.add_argument("--likes", type=int, default=1000000)
+    parser.add_argument("--comments", type=int, default=300000)
+    parser.add_argument("--max-comments", type=int, default=5000, help="cap per post")
+    parser.add_argument("--largest-community", type=float, default=0.5,
+                        help="share of all users in the largest community")
+    parser.add_argument("--zipf", type=float, default=1.1, help="community size exponent")
+    parser.add_argument("--alpha", type=float, default=1.2,
+                        help="Pareto shape of likes/comments per post; lower is more viral")
+    parser.add_argument("--global-posts", type=float, default=0.1,
+                        help="share of posts outside any community")
+    parser.add_argument("--days", type=int, default=90)
+    parser.add_argument("--skip-timelines", action="store_true",
+                        help="leave timeline_entries empty (home feeds will be sparse)")
+    parser.add_argument("--password", default="seed-password")
+    parser.add_argument("--batch-size", type=int, default=10000)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    engine = create_engine(args.database_url or settings.database_url)
+    if args.create_schema:
+        Base.metadata.create_all(engine)
+    with engine.connect() as conn:
+        if conn.execute(select(func.count()).select_from(User.__table__)).scalar():
+            sys.exit("Refusing to seed: the users table is not empty")
+
+    started = time.perf_counter()
+    seed(engine, args)
+
+    if engine.dialect.name == "postgresql":
+        with engine.begin() as conn:
+            # Ids were inserted explicitly; move the sequences past them
+            for table in ("users", "communities", "posts", "likes", "comments"):
+                conn.execute(text(
+                    f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), "
+                    f"coalesce((SELECT max(id) FROM {table}), 1))"
+                ))
+        with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+            conn.execute(text("ANALYZE"))
+    logger.info(f"Seeded in {time.perf_counter() - started:.1f}s")
+    engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
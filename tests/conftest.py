@@ -0,0 +1,87 @@
+"""
+Shared fixtures. The app runs against a throwaway SQLite database whose
+tables are recreated for every test; the environment is set before app
+modules are imported, as settings are read at import time.
+
+    pip install -r requirements-dev.txt
+    python -m pytest
+"""
+import os
+import tempfile
+
+_DB_DIR = tempfile.mkdtemp(prefix="healthspace-tests-")
+os.environ["DATABASE_URL"] = f"sqlite:///{_DB_DIR}/test.db"
+os.environ["RESPONSE_CACHE_BACKEND"] = "memory"
+os.environ["LIKE_BUFFER_ENABLED"] = "false"
+# Minimum bcrypt cost, so registering test users stays fast
+os.environ["BCRYPT_ROUNDS"] = "4"
+
+from typing import Callable, ContextManager, Dict, Iterator, List, Optional
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.response_cache import MemoryBackend, response_cache
+from app.crud.crud_user import user_cache
+from app.db.base_class import Base
+from app.db.query_budget import QueryRecorder, assert_max_queries
+from app.db.session import SessionLocal, async_engine, engine
+from app.main import app
+
+API = settings.API_V1_STR
+
+@pytest.fixture(autouse=True)
+def database() -> Iterator[Engine]:
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+    user_cache.clear()
+    response_cache.backend = MemoryBackend(
+        maxsize=settings.RESPONSE_CACHE_MAX_SIZE, ttl=settings.RESPONSE_CACHE_TTL
+    )
+    yield engine
+
+@pytest.fixture
+def db_engines() -> List[Engine]:
+    """The app's engines: sync, and the one behind the async endpoints."""
+    return [engine, async_engine.sync_engine]
+
+@pytest.fixture
+def db() -> Iterator[Session]:
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+
+@pytest.fixture
+def client() -> TestClient:
+    # Not entered as a context manager: startup would start the background
+    # pool health check and like buffer
+    return TestClient(app)
+
+@pytest.fixture
+def register(client: TestClient) -> Callable[..., Dict[str, str]]:
+    """Register a user and return the Authorization header for them."""
+    def register(email: str, *, name: Optional[str] = None, password: str = "password") -> Dict[str, str]:
+        response = client.post(
+            f"{API}/auth/register",
+            json={"email": email, "name": name or email.split("@")[0], "password": password},
+        )
+        assert response.status_code == 200, response.text
+        return {"Authorization": f"Bearer {response.json()['access_token']}"}
+    return register
+
+@pytest.fixture
+def query_budget(db_engines: List[Engine]) -> Callable[..., ContextManager[QueryRecorder]]:
+    """
+    Fail the test if the block runs more statements than allowed:
+
+        with query_budget(4, label="GET /posts/"):
+            client.get("/api/v1/posts/")
+    """
+    def budget(max_queries: int, *, label: Optional[str] = None) -> ContextManager[QueryRecorder]:
+        return assert_max_queries(db_engines, max_queries, label=label or "")
+    return budget
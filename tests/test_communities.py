@@ -0,0 +1,27 @@
+"""Community creation and slug allocation."""
+from app import crud
+from app.core.config import settings
+
+API = settings.API_V1_STR
+
+def create(client, headers, name):
+    return client.post(f"{API}/communities/", json={"name": name, "description": "x"}, headers=headers)
+
+def test_duplicate_names_get_suffixed_slugs(client, register):
+    alice = register("alice@example.com")
+
+    slugs = [create(client, alice, "Heart Health").json()["slug"] for _ in range(3)]
+
+    assert slugs == ["heart-health", "heart-health-1", "heart-health-2"]
+
+def test_exhausted_slug_retries_return_409(client, register, monkeypatch):
+    alice = register("alice@example.com")
+    create(client, alice, "Heart Health")
+    # Every lookup loses the race to a concurrent create
+    monkeypatch.setattr(crud.community, "_next_free_slug", lambda db, *, base_slug: base_slug)
+
+    response = create(client, alice, "Heart Health")
+
+    assert response.status_code == 409
+    assert response.headers["retry-after"] == "1"
+    assert [c["slug"] for c in client.get(f"{API}/communities/", headers=alice).json()] == ["heart-health"]
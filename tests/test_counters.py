@@ -0,0 +1,32 @@
+"""Denormalized counters on posts."""
+from app import crud, models
+from app.core.config import settings
+
+API = settings.API_V1_STR
+
+def test_counter_updates_keep_updated_at(client, register, db):
+    alice = register("alice@example.com")
+    post_id = client.post(f"{API}/posts/", json={"title": "Steps", "content": "10k"}, headers=alice).json()["id"]
+
+    comment_id = client.post(
+        f"{API}/comments/post/{post_id}", json={"content": "Nice"}, headers=alice
+    ).json()["id"]
+    client.post(f"{API}/likes/post/{post_id}", headers=alice)
+    client.delete(f"{API}/comments/{comment_id}", headers=alice)
+    client.delete(f"{API}/likes/post/{post_id}", headers=alice)
+    db.query(models.Post).filter(models.Post.id == post_id).update(
+        {models.Post.likes_count: 5, models.Post.updated_at: models.Post.updated_at},
+        synchronize_session=False
+    )
+    db.commit()
+    assert crud.post.reconcile_counters(db) == 1
+
+    post = db.query(models.Post).get(post_id)
+    assert (post.likes_count, post.comments_count) == (0, 0)
+    assert post.updated_at is None
+
+def test_edit_sets_updated_at(client, register, db):
+    alice = register("alice@example.com")
+    post_id = client.post(f"{API}/posts/", json={"title": "Steps", "content": "10k"}, headers=alice).json()["id"]
+    client.put(f"{API}/posts/{post_id}", json={"title": "Steps today"}, headers=alice)
+    assert db.query(models.Post).get(post_id).updated_at is not None
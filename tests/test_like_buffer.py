@@ -0,0 +1,92 @@
+"""Write-behind like buffer."""
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import sessionmaker
+
+from app import models
+from app.crud.like_buffer import LikeBuffer
+from app.db.session import SessionLocal, engine
+
+def make_post(db, title="Steps") -> models.Post:
+    user = db.query(models.User).filter(models.User.email == "alice@example.com").first()
+    if user is None:
+        user = models.User(email="alice@example.com", name="alice", hashed_password="x")
+        db.add(user)
+        db.flush()
+    post = models.Post(title=title, content="10k", author_id=user.id)
+    db.add(post)
+    db.commit()
+    return post
+
+@pytest.fixture
+def fk_sessions():
+    """Sessions on the test database with foreign keys enforced, as on Postgres."""
+    fk_engine = create_engine(engine.url)
+    event.listen(fk_engine, "connect", lambda conn, _: conn.execute("PRAGMA foreign_keys=ON"))
+    yield sessionmaker(bind=fk_engine)
+    fk_engine.dispose()
+
+def likes_of(db, post_id):
+    db.expire_all()
+    return (
+        db.query(models.Post).get(post_id).likes_count,
+        db.query(models.Like).filter(models.Like.post_id == post_id).count(),
+    )
+
+def test_flush_writes_likes_and_counts(db):
+    post = make_post(db)
+    buffer = LikeBuffer(SessionLocal, enabled=True, flush_interval=60, max_pending=100)
+
+    assert buffer.like(db, user_id=post.author_id, post_id=post.id) == 1
+    assert buffer.flush() == 1
+
+    db.expire_all()
+    post = db.query(models.Post).get(post.id)
+    assert post.likes_count == 1
+    assert db.query(models.Like).filter(models.Like.post_id == post.id).count() == 1
+    # Flushed likes are not edits
+    assert post.updated_at is None
+
+def test_like_then_unlike_writes_nothing(db):
+    post = make_post(db)
+    buffer = LikeBuffer(SessionLocal, enabled=True, flush_interval=60, max_pending=100)
+
+    buffer.like(db, user_id=post.author_id, post_id=post.id)
+    assert buffer.unlike(db, user_id=post.author_id, post_id=post.id) == 0
+    assert buffer.flush() == 0
+
+def test_flush_skips_likes_on_deleted_posts(db, fk_sessions):
+    kept, deleted = make_post(db, "Kept"), make_post(db, "Deleted")
+    buffer = LikeBuffer(fk_sessions, enabled=True, flush_interval=60, max_pending=100)
+    buffer.like(db, user_id=kept.author_id, post_id=kept.id)
+    buffer.like(db, user_id=kept.author_id, post_id=deleted.id)
+    db.delete(deleted)
+    db.commit()
+
+    assert buffer.flush() == 1
+
+    assert likes_of(db, kept.id) == (1, 1)
+    stats = buffer.stats()
+    assert (stats["pending"], stats["flush_failures"]) == (0, 0)
+    assert buffer._deltas == {}
+
+def test_failed_flush_drops_events_for_deleted_posts(db, monkeypatch):
+    kept, deleted = make_post(db, "Kept"), make_post(db, "Deleted")
+    buffer = LikeBuffer(SessionLocal, enabled=True, flush_interval=60, max_pending=100)
+    buffer.like(db, user_id=kept.author_id, post_id=kept.id)
+    buffer.like(db, user_id=kept.author_id, post_id=deleted.id)
+    db.delete(deleted)
+    db.commit()
+
+    def fail(db, **kwargs):
+        raise OperationalError("INSERT", {}, Exception("connection lost"))
+
+    with monkeypatch.context() as patch:
+        patch.setattr(buffer, "_write", fail)
+        assert buffer.flush() == 0
+    assert buffer.stats()["pending"] == 1
+    assert buffer._deltas == {kept.id: 1}
+
+    assert buffer.flush() == 1
+    assert likes_of(db, kept.id) == (1, 1)
@@ -0,0 +1,78 @@
+"""Keyset pagination with X-Next-Cursor."""
+import asyncio
+
+from app import models
+from app.core.config import settings
+from app.crud.async_base import AsyncCRUDBase
+from app.crud.base import decode_cursor
+from app.db.session import AsyncSessionLocal
+
+API = settings.API_V1_STR
+
+def collect_pages(client, path, **kwargs):
+    pages, cursor = [], None
+    while len(pages) < 10:
+        params = {"limit": 2, **({"cursor": cursor} if cursor else {})}
+        response = client.get(f"{API}{path}", params=params, **kwargs)
+        assert response.status_code == 200, response.text
+        pages.append([item["id"] for item in response.json()])
+        cursor = response.headers.get("x-next-cursor")
+        if cursor is None:
+            break
+    return pages
+
+def test_posts_created_in_the_same_second_page_once(client, register):
+    # Created well within one second, so ties on created_at are broken by id
+    alice = register("alice@example.com")
+    for i in range(5):
+        client.post(f"{API}/posts/", json={"title": f"Post {i}", "content": "x"}, headers=alice)
+
+    assert collect_pages(client, "/posts/") == [[5, 4], [3, 2], [1]]
+
+def test_comments_page_oldest_first(client, register):
+    alice = register("alice@example.com")
+    post_id = client.post(f"{API}/posts/", json={"title": "Post", "content": "x"}, headers=alice).json()["id"]
+    for i in range(5):
+        client.post(f"{API}/comments/post/{post_id}", json={"content": f"Comment {i}"}, headers=alice)
+
+    pages = collect_pages(client, f"/comments/post/{post_id}", headers=alice)
+    assert [comment_id for page in pages for comment_id in page] == [1, 2, 3, 4, 5]
+
+def test_comment_thread_continues_in_the_detail_shape(client, register):
+    alice = register("alice@example.com")
+    post_id = client.post(f"{API}/posts/", json={"title": "Post", "content": "x"}, headers=alice).json()["id"]
+    for i in range(3):
+        client.post(f"{API}/comments/post/{post_id}", json={"content": f"Comment {i}"}, headers=alice)
+
+    detail = client.get(f"{API}/posts/{post_id}", params={"comments_limit": 2}, headers=alice)
+    rest = client.get(
+        f"{API}/comments/post/{post_id}",
+        params={"cursor": detail.headers["x-next-cursor"]},
+        headers=alice,
+    ).json()
+
+    first = detail.json()["comments"]
+    assert [c["id"] for c in first + rest] == [1, 2, 3]
+    assert set(rest[0]) == set(first[0])
+    assert rest[0]["author"]["email"] == "alice@example.com"
+
+def test_invalid_cursor_is_rejected(client):
+    response = client.get(f"{API}/posts/", params={"cursor": "not-a-cursor"})
+    assert response.status_code == 400
+
+def test_async_get_page_uses_the_same_keyset(client, register):
+    alice = register("alice@example.com")
+    for i in range(5):
+        client.post(f"{API}/posts/", json={"title": f"Post {i}", "content": "x"}, headers=alice)
+
+    async def collect():
+        pages, cursor = [], None
+        async with AsyncSessionLocal() as db:
+            while True:
+                posts, next_cursor = await AsyncCRUDBase(models.Post).get_page(db, cursor=cursor, limit=2)
+                pages.append([post.id for post in posts])
+                if next_cursor is None:
+                    return pages
+                cursor = decode_cursor(next_cursor)
+
+    assert asyncio.run(collect()) == [[5, 4], [3, 2], [1]]
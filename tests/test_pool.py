@@ -0,0 +1,65 @@
+"""Connection pool health checks and metrics."""
+import asyncio
+import sqlite3
+
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.db.pool import InstrumentedQueuePool, PoolHealthChecker
+
+def make_engine(tmp_path, state):
+    """An engine whose new and pooled connections fail while state["down"]."""
+
+    class Connection(sqlite3.Connection):
+        def cursor(self, *args, **kwargs):
+            if state["down"]:
+                raise sqlite3.OperationalError("database is down")
+            return super().cursor(*args, **kwargs)
+
+    def connect():
+        if state["down"]:
+            raise sqlite3.OperationalError("database is down")
+        return sqlite3.connect(str(tmp_path / "pool.db"), check_same_thread=False, factory=Connection)
+    return create_engine(
+        "sqlite://", creator=connect, poolclass=InstrumentedQueuePool, pool_size=2, max_overflow=3
+    )
+
+def test_failed_check_disposes_of_the_pool(tmp_path):
+    state = {"down": False}
+    engine = make_engine(tmp_path, state)
+    checker = PoolHealthChecker(engine, interval=30)
+    assert checker.check() is True
+    pool = engine.pool
+
+    state["down"] = True
+    assert checker.check() is False
+    assert engine.pool is not pool
+    assert "database is down" in checker.status()["last_error"]
+
+    state["down"] = False
+    assert checker.check() is True
+
+def test_async_engine_is_checked_and_disposed(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path}/sync.db")
+    async_engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path}/missing/async.db")
+    checker = PoolHealthChecker(engine, async_engine=async_engine, interval=30)
+    pool = async_engine.sync_engine.pool
+
+    assert asyncio.run(checker.check_all()) is False
+
+    assert async_engine.sync_engine.pool is not pool
+    status = checker.status()
+    assert (status["healthy"], status["engines"]["sync"]["healthy"]) == (False, True)
+    assert "unable to open database file" in status["engines"]["async"]["last_error"]
+
+    (tmp_path / "missing").mkdir()
+    assert asyncio.run(checker.check_all()) is True
+    assert checker.status()["last_error"] is None
+
+def test_capacity_survives_pool_recreation(tmp_path):
+    engine = make_engine(tmp_path, {"down": False})
+    engine.dispose()
+
+    snapshot = InstrumentedQueuePool.stats.snapshot(engine.pool)
+
+    assert (snapshot["size"], snapshot["capacity"]) == (2, 5)
@@ -0,0 +1,116 @@
+"""
+Statement budgets per endpoint. Each case runs one request against a
+small seeded dataset and fails when it executes more statements than its
+budget, so an N+1 or an extra round trip in the CRUD layer fails CI. When
+a change legitimately needs another statement, raise the budget in the
+same commit and say why.
+"""
+from types import SimpleNamespace
+
+import pytest
+
+from app.core.config import settings
+
+API = settings.API_V1_STR
+
+@pytest.fixture
+def seeded(client, register):
+    """
+    Two users in one community with five posts, three comments and a like
+    on each, so list endpoints have more than one row per relationship, and
+    a third user who has not joined.
+    """
+    alice = register("alice@example.com")
+    bob = register("bob@example.com")
+    dave = register("dave@example.com")
+    community = client.post(
+        f"{API}/communities/", json={"name": "Heart Health", "description": "Cardio"}, headers=alice
+    ).json()
+    client.post(f"{API}/communities/{community['id']}/members", headers=bob)
+    post_ids = []
+    for i in range(5):
+        post = client.post(
+            f"{API}/posts/",
+            json={"title": f"Walking post {i}", "content": "Daily steps", "community_id": community["id"]},
+            headers=alice if i % 2 else bob,
+        ).json()
+        post_ids.append(post["id"])
+        for _ in range(3):
+            client.post(f"{API}/comments/post/{post['id']}", json={"content": "Nice"}, headers=bob)
+        client.post(f"{API}/likes/post/{post['id']}", headers=bob)
+    comment_id = client.get(f"{API}/comments/post/{post_ids[0]}", headers=bob).json()[0]["id"]
+    return SimpleNamespace(
+        alice=alice,
+        bob=bob,
+        dave=dave,
+        # bob's user id; alice registered first
+        bob_id=2,
+        community_id=community["id"],
+        slug=community["slug"],
+        # post_ids[1] and [3] are alice's
+        post_ids=post_ids,
+        comment_id=comment_id,
+    )
+
+# (label, budget, request builder). Builders return (method, path, kwargs)
+# for the seeded data.
+CASES = [
+    ("POST /auth/register", 3, lambda s: ("POST", "/auth/register", {
+        "json": {"email": "carol@example.com", "name": "Carol", "password": "password"}})),
+    ("POST /auth/login", 1, lambda s: ("POST", "/auth/login", {
+        "data": {"username": "alice@example.com", "password": "password"}})),
+    ("GET /users/", 2, lambda s: ("GET", "/users/", {"headers": s.alice})),
+    ("GET /users/me", 1, lambda s: ("GET", "/users/me", {"headers": s.alice})),
+    ("PUT /users/me", 2, lambda s: ("PUT", "/users/me", {
+        "headers": s.alice, "json": {"email": "alice@example.com", "name": "Alice"}})),
+    ("GET /users/{id}", 1, lambda s: ("GET", f"/users/{s.bob_id}", {"headers": s.alice})),
+    ("GET /posts/ anonymous", 2, lambda s: ("GET", "/posts/", {})),
+    ("GET /posts/", 2, lambda s: ("GET", "/posts/", {"headers": s.alice})),
+    ("GET /posts/feed", 4, lambda s: ("GET", "/posts/feed", {"headers": s.alice})),
+    ("GET /posts/search", 2, lambda s: ("GET", "/posts/search", {
+        "headers": s.alice, "params": {"q": "walking"}})),
+    ("GET /posts/announcements", 1, lambda s: ("GET", "/posts/announcements", {"headers": s.alice})),
+    ("GET /posts/{id}", 2, lambda s: ("GET", f"/posts/{s.post_ids[0]}", {"headers": s.alice})),
+    ("GET /posts/community/{id}", 2, lambda s: ("GET", f"/posts/community/{s.community_id}", {
+        "headers": s.alice})),
+    ("GET /posts/user/{id}", 2, lambda s: ("GET", f"/posts/user/{s.bob_id}", {"headers": s.alice})),
+    ("POST /posts/", 4, lambda s: ("POST", "/posts/", {
+        "headers": s.alice, "json": {"title": "New", "content": "Body", "community_id": s.community_id}})),
+    ("PUT /posts/{id}", 3, lambda s: ("PUT", f"/posts/{s.post_ids[1]}", {
+        "headers": s.alice, "json": {"title": "Edited"}})),
+    ("DELETE /posts/{id}", 5, lambda s: ("DELETE", f"/posts/{s.post_ids[1]}", {"headers": s.alice})),
+    ("GET /comments/post/{id}", 1, lambda s: ("GET", f"/comments/post/{s.post_ids[0]}", {
+        "headers": s.alice})),
+    ("POST /comments/post/{id}", 4, lambda s: ("POST", f"/comments/post/{s.post_ids[0]}", {
+        "headers": s.alice, "json": {"content": "Agreed"}})),
+    ("PUT /comments/{id}", 3, lambda s: ("PUT", f"/comments/{s.comment_id}", {
+        "headers": s.bob, "json": {"content": "Edited"}})),
+    ("DELETE /comments/{id}", 3, lambda s: ("DELETE", f"/comments/{s.comment_id}", {"headers": s.bob})),
+    ("POST /likes/post/{id}", 3, lambda s: ("POST", f"/likes/post/{s.post_ids[0]}", {"headers": s.alice})),
+    ("DELETE /likes/post/{id}", 3, lambda s: ("DELETE", f"/likes/post/{s.post_ids[0]}", {
+        "headers": s.bob})),
+    ("GET /communities/", 2, lambda s: ("GET", "/communities/", {"headers": s.alice})),
+    ("GET /communities/?search=", 2, lambda s: ("GET", "/communities/", {
+        "headers": s.alice, "params": {"search": "heart"}})),
+    ("GET /communities/my", 2, lambda s: ("GET", "/communities/my", {"headers": s.alice})),
+    ("GET /communities/{slug}", 3, lambda s: ("GET", f"/communities/{s.slug}", {"headers": s.alice})),
+    ("GET /communities/{id}/members", 2, lambda s: ("GET", f"/communities/{s.community_id}/members", {
+        "headers": s.alice})),
+    ("POST /communities/", 7, lambda s: ("POST", "/communities/", {
+        "headers": s.bob, "json": {"name": "Sleep", "description": "Rest"}})),
+    ("PUT /communities/{id}", 3, lambda s: ("PUT", f"/communities/{s.community_id}", {
+        "headers": s.alice, "json": {"description": "Cardio and more"}})),
+    ("POST /communities/{id}/members", 9, lambda s: ("POST", f"/communities/{s.community_id}/members", {
+        "headers": s.dave})),
+    ("DELETE /communities/{id}/members", 7, lambda s: ("DELETE", f"/communities/{s.community_id}/members", {
+        "headers": s.bob})),
+    ("DELETE /communities/{id}", 7, lambda s: ("DELETE", f"/communities/{s.community_id}", {
+        "headers": s.alice})),
+]
+
+@pytest.mark.parametrize("label, budget, build", CASES, ids=[case[0] for case in CASES])
+def test_query_budget(client, seeded, query_budget, label, budget, build):
+    method, path, kwargs = build(seeded)
+    with query_budget(budget, label=label):
+        response = client.request(method, f"{API}{path}", **kwargs)
+    assert response.status_code == 200, response.text
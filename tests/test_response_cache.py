@@ -0,0 +1,138 @@
+"""Shared response cache for anonymous GET /posts/, on a local Redis stub."""
+from typing import Dict, Optional
+
+import pytest
+
+from app import crud
+from app.core.config import settings
+from app.core.response_cache import RedisBackend, response_cache
+from app.crud.like_buffer import LikeBuffer
+from app.db.session import SessionLocal
+
+API = settings.API_V1_STR
+
+class StubRedis:
+    """The redis-py get/set/incr subset RedisBackend uses, in a dict."""
+
+    def __init__(self):
+        self.data: Dict[str, bytes] = {}
+
+    def get(self, key: str) -> Optional[bytes]:
+        return self.data.get(key)
+
+    def set(self, key: str, value: bytes, ex: Optional[int] = None) -> None:
+        self.data[key] = value
+
+    def incr(self, key: str) -> int:
+        value = int(self.data.get(key, 0)) + 1
+        self.data[key] = str(value).encode()
+        return value
+
+class DownRedis:
+    """A Redis that is unreachable."""
+
+    def get(self, key, *args, **kwargs):
+        raise ConnectionError("redis is down")
+
+    set = incr = get
+
+@pytest.fixture
+def redis_stub() -> StubRedis:
+    client = StubRedis()
+    response_cache.backend = RedisBackend(client)
+    return client
+
+@pytest.fixture
+def alice(register):
+    return register("alice@example.com")
+
+def create_post(client, headers, title):
+    response = client.post(f"{API}/posts/", json={"title": title, "content": "x"}, headers=headers)
+    assert response.status_code == 200, response.text
+
+def titles(response):
+    return [post["title"] for post in response.json()]
+
+def test_hit_is_served_without_queries(client, alice, redis_stub, query_budget):
+    create_post(client, alice, "First")
+    hits = response_cache.hits
+
+    first = client.get(f"{API}/posts/")
+    with query_budget(0, label="cached GET /posts/"):
+        second = client.get(f"{API}/posts/")
+
+    assert second.status_code == 200
+    assert second.content == first.content
+    assert second.headers["etag"] == first.headers["etag"]
+    assert response_cache.hits == hits + 1
+
+def test_matching_etag_gets_304(client, alice, redis_stub):
+    create_post(client, alice, "First")
+    etag = client.get(f"{API}/posts/").headers["etag"]
+
+    response = client.get(f"{API}/posts/", headers={"If-None-Match": etag})
+
+    assert response.status_code == 304
+    assert response.content == b""
+
+def test_write_invalidates_after_commit(client, alice, redis_stub):
+    create_post(client, alice, "First")
+    assert titles(client.get(f"{API}/posts/")) == ["First"]
+
+    create_post(client, alice, "Second")
+
+    assert titles(client.get(f"{API}/posts/")) == ["Second", "First"]
+
+def test_authenticated_requests_bypass_the_cache(client, alice, redis_stub):
+    create_post(client, alice, "First")
+    client.get(f"{API}/posts/", headers=alice)
+
+    assert [key for key in redis_stub.data if ":generation:" not in key] == []
+
+def test_backend_outage_degrades_to_uncached(client, alice):
+    create_post(client, alice, "First")
+    response_cache.backend = RedisBackend(DownRedis())
+    errors = response_cache.errors
+
+    read = client.get(f"{API}/posts/")
+    # The write commits, then invalidation fails
+    create_post(client, alice, "Second")
+    reread = client.get(f"{API}/posts/")
+
+    assert read.status_code == 200
+    assert titles(reread) == ["Second", "First"]
+    # generation on each GET, bump after the POST
+    assert response_cache.errors == errors + 3
+
+def likes_counts(response):
+    return [post["likes_count"] for post in response.json()]
+
+def test_likes_invalidate_after_commit(client, alice, redis_stub):
+    create_post(client, alice, "First")
+    assert likes_counts(client.get(f"{API}/posts/")) == [0]
+
+    post_id = client.get(f"{API}/posts/").json()[0]["id"]
+    client.post(f"{API}/likes/post/{post_id}", headers=alice)
+    assert likes_counts(client.get(f"{API}/posts/")) == [1]
+
+    client.delete(f"{API}/likes/post/{post_id}", headers=alice)
+    assert likes_counts(client.get(f"{API}/posts/")) == [0]
+
+def test_like_buffer_flush_invalidates(client, alice, redis_stub, db):
+    create_post(client, alice, "First")
+    post_id = client.get(f"{API}/posts/").json()[0]["id"]
+    buffer = LikeBuffer(SessionLocal, enabled=True, flush_interval=60, max_pending=100)
+    # alice is user 1
+    buffer.like(db, user_id=1, post_id=post_id)
+
+    buffer.flush()
+
+    assert likes_counts(client.get(f"{API}/posts/")) == [1]
+
+def test_removing_a_user_invalidates(client, alice, redis_stub, db):
+    create_post(client, alice, "First")
+    assert client.get(f"{API}/posts/").json()[0]["author"] is not None
+
+    crud.user.remove(db, id=1)
+
+    assert client.get(f"{API}/posts/").json()[0]["author"] is None
@@ -0,0 +1,27 @@
+"""Relevance-ranked search, on the term-matching fallback SQLite uses."""
+from app.core.config import settings
+
+API = settings.API_V1_STR
+
+def test_title_matches_rank_first_and_page(client, register):
+    alice = register("alice@example.com")
+    for title, content in [
+        ("Morning walking", "Steps"),
+        ("Sleep", "Walking before bed"),
+        ("Walking walking", "More walking"),
+        ("Diet", "Vegetables"),
+    ]:
+        client.post(f"{API}/posts/", json={"title": title, "content": content}, headers=alice)
+
+    first = client.get(f"{API}/posts/search", params={"q": "walking", "limit": 2}, headers=alice)
+    assert first.status_code == 200, first.text
+    rest = client.get(
+        f"{API}/posts/search",
+        params={"q": "walking", "limit": 2, "cursor": first.headers["x-next-cursor"]},
+        headers=alice,
+    )
+
+    pages = [[post["title"] for post in page.json()] for page in (first, rest)]
+    assert sorted(pages[0]) == ["Morning walking", "Walking walking"]
+    assert pages[1] == ["Sleep"]
+    assert "x-next-cursor" not in rest.headers
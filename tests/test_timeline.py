@@ -0,0 +1,44 @@
+"""Home timelines across the fan-out threshold."""
+import pytest
+
+from app import crud
+from app.core.config import settings
+
+API = settings.API_V1_STR
+
+@pytest.fixture
+def large_community(client, register, monkeypatch):
+    """A community one member over a fan-out threshold of 2, with a post."""
+    monkeypatch.setattr(crud.timeline, "max_fanout_members", 2)
+    alice = register("alice@example.com")
+    bob = register("bob@example.com")
+    carol = register("carol@example.com")
+    community_id = client.post(
+        f"{API}/communities/", json={"name": "Heart Health", "description": "Cardio"}, headers=alice
+    ).json()["id"]
+    for headers in (bob, carol):
+        client.post(f"{API}/communities/{community_id}/members", headers=headers)
+    client.post(
+        f"{API}/posts/",
+        json={"title": "Read on demand", "content": "x", "community_id": community_id},
+        headers=alice,
+    )
+    return community_id, bob, carol
+
+def feed(client, headers):
+    return [post["title"] for post in client.get(f"{API}/posts/feed", headers=headers).json()]
+
+def test_leaving_to_the_threshold_backfills_members(client, large_community):
+    community_id, bob, carol = large_community
+    assert feed(client, bob) == ["Read on demand"]
+
+    client.delete(f"{API}/communities/{community_id}/members", headers=carol)
+
+    assert feed(client, bob) == ["Read on demand"]
+
+def test_removing_a_user_to_the_threshold_backfills_members(client, db, large_community):
+    community_id, bob, carol = large_community
+
+    crud.user.remove(db, id=crud.user.get_by_email(db, email="carol@example.com").id)
+
+    assert feed(client, bob) == ["Read on demand"]
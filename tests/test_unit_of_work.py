@@ -0,0 +1,32 @@
+"""Requests share one session, committed by UnitOfWorkRoute."""
+import pytest
+from fastapi import APIRouter, Depends, FastAPI
+from fastapi.routing import APIRoute
+from fastapi.testclient import TestClient
+
+from app.api.routing import UnitOfWorkRoute
+from app.db.session import get_async_db, get_db
+
+def make_client(route_class):
+    router = APIRouter(route_class=route_class)
+
+    @router.get("/sync")
+    def read_sync(db=Depends(get_db)):
+        return {}
+
+    @router.get("/async")
+    async def read_async(db=Depends(get_async_db)):
+        return {}
+
+    app = FastAPI()
+    app.include_router(router)
+    return TestClient(app)
+
+@pytest.mark.parametrize("path", ["/sync", "/async"])
+def test_session_on_a_route_that_does_not_commit_fails(path):
+    with pytest.raises(RuntimeError, match="route_class=UnitOfWorkRoute"):
+        make_client(APIRoute).get(path)
+
+@pytest.mark.parametrize("path", ["/sync", "/async"])
+def test_session_on_a_unit_of_work_route(path):
+    assert make_client(UnitOfWorkRoute).get(path).status_code == 200
@@ -0,0 +1,54 @@
+"""Deleting users."""
+from app import crud, models
+from app.core.config import settings
+from app.db.session import SessionLocal
+from app.db.unit_of_work import begin_unit_of_work
+from app.models.community import community_members
+
+API = settings.API_V1_STR
+
+def test_remove_detaches_content_in_bulk(client, register, db, query_budget):
+    alice = register("alice@example.com")
+    bob = register("bob@example.com")
+    community = client.post(
+        f"{API}/communities/", json={"name": "Heart Health", "description": "Cardio"}, headers=alice
+    ).json()
+    client.post(f"{API}/communities/{community['id']}/members", headers=bob)
+    for i in range(3):
+        post_id = client.post(
+            f"{API}/posts/",
+            json={"title": f"Post {i}", "content": "x", "community_id": community["id"]},
+            headers=bob,
+        ).json()["id"]
+        client.post(f"{API}/comments/post/{post_id}", json={"content": "Nice"}, headers=bob)
+        client.post(f"{API}/likes/post/{post_id}", headers=bob)
+    client.post(f"{API}/communities/", json={"name": "Sleep", "description": "Rest"}, headers=bob)
+    bob_id = crud.user.get_by_email(db, email="bob@example.com").id
+
+    # Statements do not grow with the user's content
+    with query_budget(10, label="user.remove"):
+        crud.user.remove(db, id=bob_id)
+
+    assert db.query(models.User).get(bob_id) is None
+    assert {p.author_id for p in db.query(models.Post)} == {None}
+    assert {c.author_id for c in db.query(models.Comment)} == {None}
+    assert {l.user_id for l in db.query(models.Like)} == {None}
+    assert {c.name: c.created_by_id for c in db.query(models.Community)}["Sleep"] is None
+    assert db.query(community_members).filter(community_members.c.user_id == bob_id).count() == 0
+    assert db.query(models.Community).get(community["id"]).members_count == 1
+    assert {p.updated_at for p in db.query(models.Post)} == {None}
+
+def test_cached_user_is_invalidated_after_commit(register, db):
+    register("alice@example.com")
+    user_id = crud.user.get_by_email(db, email="alice@example.com").id
+    request = SessionLocal()
+    begin_unit_of_work(request)
+
+    crud.user.deactivate(request, db_obj=crud.user.get(request, user_id))
+    # A concurrent request between the flush and the commit sees, and
+    # caches, the committed row
+    assert crud.user.get_cached(db, id=user_id).is_active is True
+    request.commit()
+    request.close()
+
+    assert crud.user.get_cached(db, id=user_id).is_active is False